@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for the commands that never build geometry.
+Runs each one repeatedly in a fresh interpreter and fails if its best wall
+time exceeds its budget, or if running it loads NumPy or trimesh. Keeps
+listing, planning, filtering and the plain-text catalog generators from
+quietly picking up the geometry stack again. The scripts are byte-compiled
+first, so the compiler (PYTHONDONTWRITEBYTECODE) is not what gets timed.
+
+Usage:
+    python scripts/bench_startup.py             # 10 runs per command
+    python scripts/bench_startup.py --runs 30
+"""
+
+import argparse
+import compileall
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+STARTUP_BUDGET_MS = 100
+# plan fingerprints every registered part and reads the previous manifest on top of starting up
+PLAN_BUDGET_MS = 250
+HEAVY_MODULES = ('numpy', 'trimesh')
+
+# (script, arguments, budget in ms or None for STARTUP_BUDGET_MS) for every
+# command that must run without the geometry stack
+COMMANDS = [
+    ('build_models.py', ['list', '--family', 'nuts'], None),
+    ('build_models.py', ['list', '--part', 'MS21042-*', '--shape', 'locknut'], None),
+    ('build_models.py', ['plan'], PLAN_BUDGET_MS),
+    ('generate_catalog_products.py', [], None),
+    ('generate_screw_products.py', [], None),
+    ('deploy_delta.py', ['--help'], None),
+    ('compress_assets.py', ['--help'], None),
+    ('model_packs.py', ['--help'], None),
+]
+
+
+def best_time(argv: List[str], runs: int) -> float:
+    """Fastest of runs wall-clock times (seconds) for a fresh interpreter to run argv."""
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, cwd=SCRIPTS_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def heavy_imports(script: str, arguments: List[str]) -> List[str]:
+    """Heavy modules that running script with arguments actually loads."""
+    check = (f"import contextlib, io, runpy, sys, lazy_imports\n"
+             f"sys.argv = {[script, *arguments]!r}\n"
+             f"with contextlib.redirect_stdout(io.StringIO()), contextlib.suppress(SystemExit):\n"
+             f"    runpy.run_path({script!r}, run_name='__main__')\n"
+             f"print(' '.join(m for m in {HEAVY_MODULES!r} if lazy_imports.is_loaded(m)))")
+    result = subprocess.run([sys.executable, '-c', check], cwd=SCRIPTS_DIR, capture_output=True, text=True,
+                            check=True, env={**os.environ, 'PYTHONPATH': str(SCRIPTS_DIR)})
+    return result.stdout.split()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Check that non-geometry commands start quickly.')
+    parser.add_argument('--runs', type=int, default=10, help='runs per command (the best one counts)')
+    parser.add_argument('--budget', type=float, default=STARTUP_BUDGET_MS,
+                        help='allowed startup (ms) for commands without their own budget')
+    args = parser.parse_args()
+
+    compileall.compile_dir(SCRIPTS_DIR, maxlevels=0, quiet=1)
+    baseline = best_time([sys.executable, '-c', 'pass'], args.runs)
+    print(f"{'python -c pass':60} {baseline * 1000:6.0f} ms")
+
+    failures = 0
+    for script, arguments, budget in COMMANDS:
+        budget = budget or args.budget
+        label = ' '.join([script, *arguments])
+        elapsed = best_time([sys.executable, script, *arguments], args.runs) * 1000
+        heavy = heavy_imports(script, arguments)
+        problems = []
+        if elapsed > budget:
+            problems.append(f"over {budget:.0f} ms")
+        if heavy:
+            problems.append(f"imports {', '.join(heavy)}")
+        print(f"{label:60} {elapsed:6.0f} ms{'  FAIL: ' + '; '.join(problems) if problems else ''}")
+        failures += bool(problems)
+
+    if failures:
+        print(f"\n{failures} of {len(COMMANDS)} commands failed")
+        return 1
+    print(f"\nAll {len(COMMANDS)} commands start within budget")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+Shared paths for the model build tooling.
+"""
+
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent
+
+# Generated models served by the site
+MODELS_DIR = REPO_ROOT / 'public' / 'models'
+
+# Build caches and incremental state (not deployed, not committed)
+CACHE_DIR = REPO_ROOT / '.model-cache'
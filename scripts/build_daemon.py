@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Long-lived local build daemon.
+Every build_models.py invocation pays for importing trimesh and NumPy and
+for fingerprinting the registry before the first part is built, which
+dominates small targeted rebuilds. The daemon keeps the build scripts
+imported, with the CSG memo, the registry and the fingerprint hashes warm,
+and runs build_models commands sent to it over a Unix socket. Before each
+command it checks scripts/ for edits and re-imports the scripts if any
+changed, so results always match a fresh run. `build --jobs N` runs in a
+worker pool the daemon keeps between commands (replaced when N changes),
+whose workers re-import the scripts on the next job after an edit.
+
+Usage:
+    python scripts/build_daemon.py serve &                  # start the daemon
+    python scripts/build_daemon.py build --part 'AN3-*'     # any build_models.py command
+    python scripts/build_daemon.py status
+    python scripts/build_daemon.py stop
+
+The client side imports only the standard library; commands run one at a
+time, in the daemon's process, with their output streamed back.
+"""
+
+import contextlib
+import importlib
+import json
+import os
+import socket
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import List, Optional
+
+from build_config import CACHE_DIR
+
+SOCKET_PATH = CACHE_DIR / 'build-daemon.sock'
+CONTROL_COMMANDS = ('serve', 'status', 'stop')
+
+
+def socket_path() -> Path:
+    return Path(os.environ.get('BUILD_DAEMON_SOCKET', SOCKET_PATH))
+
+
+def _send(connection: socket.socket, **message) -> None:
+    connection.sendall(json.dumps(message).encode() + b'\n')
+
+
+class _StreamWriter:
+    """File-like object that forwards printed text to the client as it is written."""
+
+    def __init__(self, connection: socket.socket, stream: str):
+        self.connection = connection
+        self.stream = stream
+
+    def write(self, text: str) -> int:
+        if text:
+            _send(self.connection, **{self.stream: text})
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+class _Daemon:
+    def __init__(self):
+        from build_watch import snapshot
+        from build_workers import reload_scripts, set_pool_provider, worker_pool
+        from lazy_imports import preload
+        self.snapshot = snapshot
+        self.reload_scripts = reload_scripts
+        self.worker_pool = worker_pool
+        self.sources = snapshot()
+        self.build_models = reload_scripts()
+        preload('numpy', 'trimesh', 'trimesh.boolean')
+        self.started = time.time()
+        self.requests = 0
+        self.reloads = 0
+        self.running = True
+        self.pool = None
+        self.pool_jobs = 0
+        set_pool_provider(self.warm_pool)
+
+    def refresh(self) -> None:
+        """Re-import the build scripts if any of them changed since the last command."""
+        sources = self.snapshot()
+        if sources != self.sources:
+            self.sources = sources
+            self.build_models = self.reload_scripts()
+            self.reloads += 1
+
+    def warm_pool(self, jobs: int):
+        """The daemon's worker pool, started or resized for jobs; reload count is the generation."""
+        if self.pool is None or self.pool_jobs != jobs:
+            self.close_pool()
+            self.pool = self.worker_pool(jobs)
+            self.pool_jobs = jobs
+        return self.pool, self.reloads
+
+    def close_pool(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+            self.pool_jobs = 0
+
+    def status(self) -> dict:
+        csg = importlib.import_module('csg')
+        return {
+            'pid': os.getpid(),
+            'uptime': round(time.time() - self.started, 1),
+            'requests': self.requests,
+            'reloads': self.reloads,
+            'workers': self.pool_jobs,
+            'csg': csg.format_stats(csg.csg_stats()),
+        }
+
+    def run(self, connection: socket.socket, argv: List[str], cwd: str) -> int:
+        """Run one build_models command with its output streamed to the client."""
+        stdout = _StreamWriter(connection, 'out')
+        stderr = _StreamWriter(connection, 'err')
+        previous = os.getcwd()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                os.chdir(cwd)
+                self.refresh()
+                return self.build_models.main(argv) or 0
+            except SystemExit as exc:
+                return exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+            except Exception:
+                traceback.print_exc()
+                return 1
+            finally:
+                os.chdir(previous)
+
+    def handle(self, connection: socket.socket) -> None:
+        with connection, connection.makefile('rb') as reader:
+            line = reader.readline()
+            if not line:
+                return  # a ping
+            try:
+                self.respond(connection, json.loads(line))
+            finally:
+                # Pool workers forked during the command inherit this socket; end it for all of them
+                with contextlib.suppress(OSError):
+                    connection.shutdown(socket.SHUT_RDWR)
+
+    def respond(self, connection: socket.socket, request: dict) -> None:
+        command = request.get('command')
+        if command == 'status':
+            _send(connection, status=self.status())
+        elif command == 'stop':
+            self.running = False
+            _send(connection, exit=0)
+        elif command == 'run':
+            self.requests += 1
+            _send(connection, exit=self.run(connection, request['argv'], request['cwd']))
+        else:
+            _send(connection, err=f"Unknown daemon command: {command}\n", exit=2)
+
+
+def serve(path: Optional[Path] = None) -> int:
+    path = path or socket_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        if ping(path):
+            print(f"A build daemon is already listening on {path}")
+            return 1
+        path.unlink()  # left behind by a daemon that did not shut down cleanly
+
+    start = time.perf_counter()
+    daemon = _Daemon()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(path))
+    server.listen()
+    print(f"Build daemon {os.getpid()} ready in {time.perf_counter() - start:.1f}s on {path}", flush=True)
+    try:
+        while daemon.running:
+            connection, _ = server.accept()
+            try:
+                daemon.handle(connection)
+            except (BrokenPipeError, ConnectionResetError):
+                # The client went away mid-command (e.g. Ctrl+C); keep serving
+                pass
+    except KeyboardInterrupt:
+        print()
+    finally:
+        daemon.close_pool()
+        server.close()
+        path.unlink(missing_ok=True)
+    print("Build daemon stopped")
+    return 0
+
+
+def request(message: dict, path: Optional[Path] = None) -> int:
+    """Send one request and relay the streamed replies; returns the command's exit code."""
+    path = path or socket_path()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(str(path))
+        _send(connection, **message)
+        code = 1
+        with connection.makefile('rb') as reader:
+            for line in reader:
+                reply = json.loads(line)
+                if 'out' in reply:
+                    sys.stdout.write(reply['out'])
+                    sys.stdout.flush()
+                if 'err' in reply:
+                    sys.stderr.write(reply['err'])
+                if 'status' in reply:
+                    for key, value in reply['status'].items():
+                        print(f"{key}: {value}")
+                    code = 0
+                if 'exit' in reply:
+                    code = reply['exit']
+        return code
+
+
+def ping(path: Optional[Path] = None) -> bool:
+    """True if a daemon answers on the socket."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(str(path or socket_path()))
+        return True
+    except OSError:
+        return False
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help'):
+        print(__doc__.strip())
+        return 0
+    if argv[0] == 'serve':
+        return serve()
+    message = {'command': argv[0]} if argv[0] in CONTROL_COMMANDS else {
+        'command': 'run', 'argv': argv, 'cwd': os.getcwd()}
+    try:
+        return request(message)
+    except BrokenPipeError:
+        # Our own output was closed (e.g. piped into head)
+        return 1
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"No build daemon on {socket_path()}; start one with: python scripts/build_daemon.py serve",
+              file=sys.stderr)
+        return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
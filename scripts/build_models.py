@@ -0,0 +1,633 @@
+#!/usr/bin/env python3
+"""
+Unified model build for every part family.
+
+Usage:
+    python scripts/build_models.py build               # build changed models, manifest and hashed copies
+    python scripts/build_models.py build --force       # rebuild every model even if its sources are unchanged
+    python scripts/build_models.py build --thumbnails  # ...plus software-rendered thumbnails
+    python scripts/build_models.py build --atlases     # ...plus thumbnail atlases per catalog page
+    python scripts/build_models.py build --turntables  # ...plus turntable frame strips for low-end devices
+    python scripts/build_models.py build --packs       # ...plus one bundle per category
+    python scripts/build_models.py build --compress    # ...then write .gz/.br siblings
+    python scripts/build_models.py build --canonical   # rotate every part so its axis runs along z
+    python scripts/build_models.py build --instancing  # ...plus GPU-instanced variants of repeated features
+    python scripts/build_models.py build --threads     # model helical threads on bolts and screws
+    python scripts/build_models.py build --thread-maps # ...or fake them with a baked normal map
+    python scripts/build_models.py build --profile draft # a few coarse parts per family, no booleans or cleanup
+    python scripts/build_models.py build --part 'MS21042-*' --shape flush_head  # only the matching parts
+    python scripts/build_models.py list --family nuts --generator create_castle_nut  # resolve filters only
+    python scripts/build_models.py plan --json plan.json  # what a build would rebuild, and how long it would take
+    python scripts/build_models.py watch               # rebuild affected models on every script edit
+    python scripts/build_models.py verify              # build each part twice and compare hashes
+
+Any of these can be sent to a warm build daemon instead (see build_daemon.py):
+    python scripts/build_daemon.py build --part 'AN3-*'
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from build_config import MODELS_DIR
+from build_profiles import DEFAULT_PROFILE, PROFILES, BuildProfile, get_profile, profile_record, sample_parts
+from build_timings import load_timings, part_seconds, record_timings
+from csg import csg_stats, format_stats, probe_engine, select_engine, set_enabled
+from fingerprints import function_hashes, function_name, part_dependencies, part_fingerprint
+from glb_export import (DetailMap, content_hash, detail_filename, geometry_hash, glb_bytes, glb_material,
+                        instanced_glb_bytes)
+from mass_properties import mass_properties, part_material
+from mesh_cleanup import clean_mesh
+from mesh_instancing import find_instances
+from mesh_metadata import normalize_orientation, viewer_metadata
+from mesh_normals import CREASE_ANGLE
+from model_manifest import (HASHED_DIR, load_manifest, manifest_entry, remove_compressed, write_detail_map,
+                            write_hashed_copies, write_manifest)
+from model_registry import FAMILIES, THREADED_FAMILIES, all_parts, part_generator, part_shape, select_parts
+from tessellation import set_quality
+from thread_maps import thread_detail, thread_regions
+
+
+class BuiltPart(NamedTuple):
+    mesh: object
+    data: bytes
+    error: Optional[str]
+    # None when the build skipped cleanup and mass properties
+    mass: Optional[dict]
+    # EXT_mesh_gpu_instancing variant, when the part has repeated sub-features
+    instanced: Optional[bytes] = None
+    # Normal map the GLB references by URI rather than embedding
+    detail: Optional[DetailMap] = None
+
+
+def build_part_bytes(part, canonical: bool = False, crease_angle: float = CREASE_ANGLE,
+                     instancing: bool = False, threaded: bool = False, thread_maps: bool = False,
+                     cleanup: bool = True) -> BuiltPart:
+    """
+    Build, clean and encode one part. Without cleanup the raw mesh is
+    encoded as built and mass properties, thread maps and instancing are
+    skipped (draft builds).
+    """
+    if threaded and part.family in THREADED_FAMILIES:
+        raw, error = part.build(part.part_number, threaded=True)
+    else:
+        raw, error = part.build(part.part_number)
+    if canonical:
+        normalize_orientation(raw)
+    if not cleanup:
+        data = glb_bytes(raw, name=part.part_number, crease_angle=crease_angle, material=part_material(part, raw))
+        return BuiltPart(raw, data, error, None)
+
+    mesh = clean_mesh(raw)
+    mass = mass_properties(part, mesh, raw)
+
+    detail = None
+    # Parts with modelled threads already (the showcase bolt and screw) get no map
+    if thread_maps and not threaded and part.family in THREADED_FAMILIES and not thread_regions(raw):
+        # The threaded build only locates the thread; the plain shaft gets the baked map
+        high, _ = part.build(part.part_number, threaded=True)
+        if canonical:
+            normalize_orientation(high)
+        mesh, detail = thread_detail(mesh, high)
+    # The material palette follows the part's classified material rather than the painted color
+    data = glb_bytes(mesh, name=part.part_number, crease_angle=crease_angle, material=mass['material'],
+                     detail=detail)
+
+    instanced = None
+    if instancing:
+        base, groups = find_instances(raw)
+        if groups:
+            instanced = instanced_glb_bytes(
+                clean_mesh(base) if base is not None else None,
+                [(clean_mesh(prototype), translations, rotations) for prototype, translations, rotations in groups],
+                name=part.part_number, crease_angle=crease_angle, material=mass['material'])
+    return BuiltPart(mesh, data, error, mass, instanced, detail)
+
+
+# Functions every part's output and manifest entry pass through, for source fingerprints.
+# manifest_entry imports its helpers inside the function, so they are listed as well.
+PIPELINE = (build_part_bytes, manifest_entry, content_hash, geometry_hash, glb_material, viewer_metadata)
+
+
+class BuildOptions(NamedTuple):
+    """Everything besides the part itself that decides a build's output."""
+    profile: BuildProfile
+    canonical: bool = False
+    crease_angle: float = CREASE_ANGLE
+    instancing: bool = False
+    threads: bool = False
+    thread_maps: bool = False
+    # The boolean engine chosen for the build, or None if none is installed
+    csg_engine: Optional[str] = None
+
+
+class PartResult(NamedTuple):
+    """One part's build, as returned by the serial loop or a worker process."""
+    part_number: str
+    data: Optional[bytes]
+    instanced: Optional[bytes]
+    entry: Optional[dict]
+    # Fallback message from the generator
+    error: Optional[str]
+    # Exception that stopped the part from building at all
+    failure: Optional[str] = None
+    # Time spent generating the part, for build_timings
+    seconds: float = 0.0
+    # PNG bytes of the entry's detailMap, written once by the main process
+    detail_image: Optional[bytes] = None
+
+
+def build_options(args, planning: bool = False) -> BuildOptions:
+    """Options for a build; planning probes for the boolean engine instead of importing trimesh to select it."""
+    engine = probe_engine(args.csg_engine) if planning else select_engine(args.csg_engine)
+    return BuildOptions(get_profile(args.profile, args.quality), args.canonical, args.crease_angle,
+                        args.instancing, args.threads, args.thread_maps, engine)
+
+
+def apply_options(options: BuildOptions) -> None:
+    """Set the process-wide tessellation and boolean settings for a build."""
+    select_engine(options.csg_engine)
+    set_enabled(options.profile.booleans)
+    set_quality(options.profile.quality)
+
+
+def build_settings(options: BuildOptions) -> dict:
+    """Settings that change build output, folded into every part fingerprint."""
+    return {
+        'profile': profile_record(options.profile),
+        'canonical': options.canonical,
+        'crease_angle': options.crease_angle,
+        'instancing': options.instancing,
+        'threads': options.threads,
+        'thread_maps': options.thread_maps,
+        'csg_engine': options.csg_engine if options.profile.booleans else None,
+    }
+
+
+def timing_group(family: str, options: BuildOptions) -> str:
+    """build_timings key for a family: threaded and thread-mapped builds take far longer, so they are kept apart."""
+    if family in THREADED_FAMILIES and options.threads:
+        return f"{family}+threads"
+    if family in THREADED_FAMILIES and options.thread_maps:
+        return f"{family}+thread-maps"
+    return family
+
+
+def build_result(part, fingerprint: str, options: BuildOptions) -> PartResult:
+    """Build one part and its manifest entry."""
+    start = time.perf_counter()
+    try:
+        built = build_part_bytes(part, options.canonical, options.crease_angle, options.instancing,
+                                 options.threads, options.thread_maps, options.profile.cleanup)
+    except Exception as e:
+        return PartResult(part.part_number, None, None, None, None, str(e))
+    detail = built.detail
+    entry = manifest_entry(part, built.mesh, built.data, options.canonical, built.mass, built.instanced, fingerprint,
+                           detail_filename(detail) if detail is not None else None)
+    return PartResult(part.part_number, built.data, built.instanced, entry, built.error,
+                      seconds=time.perf_counter() - start, detail_image=detail.image if detail is not None else None)
+
+
+_parts_by_number = None
+
+
+def part_by_number(part_number: str):
+    """Registry lookup for worker processes, which receive part numbers rather than parts."""
+    global _parts_by_number
+    if _parts_by_number is None:
+        _parts_by_number = {part.part_number: part for part in all_parts()}
+    return _parts_by_number[part_number]
+
+
+def rebuild_reason(output_dir: Path, entry: Optional[dict], fingerprint: str) -> Optional[str]:
+    """
+    Why a part must be rebuilt: 'new' without a manifest entry, 'changed'
+    when its fingerprint differs, 'missing' when its files are gone or were
+    modified. None if the entry and files can be reused as they are.
+    """
+    if entry is None:
+        return 'new'
+    if entry.get('fingerprint') != fingerprint:
+        return 'changed'
+    path = output_dir / entry['file']
+    if not path.exists() or content_hash(path.read_bytes()) != entry['sha256']:
+        return 'missing'
+    if 'instanced' in entry and not (output_dir / entry['instanced']['file']).exists():
+        return 'missing'
+    if 'detailMap' in entry and not (output_dir / HASHED_DIR / entry['detailMap']).exists():
+        return 'missing'
+    return None
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Write data unless the file already holds identical bytes; stale .gz/.br siblings are dropped."""
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.write_bytes(data)
+    remove_compressed(path)
+    return True
+
+
+def previous_models(output_dir: Path, registry, previous: Optional[dict] = None) -> dict:
+    """Entries of the existing manifest (read from output_dir unless given) for parts still in the registry."""
+    if previous is None:
+        previous = load_manifest(output_dir)
+    if not previous:
+        return {}
+    known = {part.part_number for part in registry}
+    return {pn: entry for pn, entry in previous['models'].items() if pn in known}
+
+
+def plan_parts(parts, output_dir: Path, options: BuildOptions, manifest: dict,
+               force: bool = False) -> List[Tuple[object, str, Optional[str]]]:
+    """(part, fingerprint, rebuild reason or None) for each part, without building anything."""
+    settings = build_settings(options)
+    planned = []
+    for part in parts:
+        fingerprint = part_fingerprint(part, PIPELINE, settings)
+        reason = 'forced' if force else rebuild_reason(output_dir, manifest.get(part.part_number), fingerprint)
+        planned.append((part, fingerprint, reason))
+    return planned
+
+
+def build_parts(parts, output_dir: Path, options: BuildOptions, manifest: dict, force: bool = False,
+                pool=None, generation: int = 0) -> dict:
+    """
+    Build every part whose fingerprint no longer matches its manifest entry
+    (all of them with force), write the GLBs and update manifest in place.
+    With a pool the parts are built by build_workers processes; generation
+    tells them which version of the sources the work was planned against.
+    Returns counts of built, reused, written, fallback and failed parts.
+    """
+    planned = plan_parts(parts, output_dir, options, manifest, force)
+    pending = [(part, fingerprint) for part, fingerprint, reason in planned if reason is not None]
+    reused = len(planned) - len(pending)
+
+    if pool is None:
+        apply_options(options)
+        results = (build_result(part, fingerprint, options) for part, fingerprint in pending)
+    else:
+        from build_workers import build_job
+        jobs = [(generation, part.part_number, fingerprint, options) for part, fingerprint in pending]
+        results = pool.map(build_job, jobs, chunksize=4)
+
+    counts = {'built': 0, 'reused': reused, 'written': 0, 'fallbacks': 0, 'failed': 0}
+    timings: Dict[str, List[float]] = {}
+    for i, ((part, _), result) in enumerate(zip(pending, results), 1):
+        if result.failure is not None:
+            print(f"[{i}/{len(pending)}] ✗ {part.part_number} -> ERROR: {result.failure}")
+            counts['failed'] += 1
+            continue
+
+        changed = write_if_changed(output_dir / part.filename, result.data)
+        counts['built'] += 1
+        counts['written'] += changed
+        entry = result.entry
+        if result.instanced is not None:
+            target = output_dir / entry['instanced']['file']
+            target.parent.mkdir(parents=True, exist_ok=True)
+            write_if_changed(target, result.instanced)
+        if result.detail_image is not None:
+            write_detail_map(output_dir, entry['detailMap'], result.detail_image)
+        manifest[part.part_number] = entry
+        timings.setdefault(timing_group(part.family, options), []).append(result.seconds)
+        status = 'written' if changed else 'unchanged'
+        if result.error:
+            counts['fallbacks'] += 1
+            print(f"[{i}/{len(pending)}] {part.part_number} -> {part.filename} (FALLBACK: {result.error})")
+        else:
+            print(f"[{i}/{len(pending)}] {part.part_number} -> {part.filename} ({entry['vertices']} verts, {status})")
+    record_timings(options.profile.name, timings)
+    return counts
+
+
+def write_build_manifest(output_dir: Path, manifest: dict, profile: BuildProfile, registry):
+    """Write the manifest with its profile and source hashes, then the hashed copies."""
+    functions = set().union(*(part_dependencies(part, PIPELINE) for part in registry))
+    path = write_manifest(output_dir, manifest, profile_record(profile), function_hashes(functions))
+    return path, write_hashed_copies(output_dir, manifest)
+
+
+def selected_parts(args, registry) -> list:
+    """Registry parts matching the command-line filters; a bad filter exits before any geometry is built."""
+    try:
+        return select_parts(registry, args.part, args.match, args.family, args.shape, args.generator)
+    except (ValueError, re.error) as e:
+        raise SystemExit(f"error: {e}")
+
+
+def cmd_list(args) -> int:
+    for part in selected_parts(args, all_parts()):
+        print(f"{part.part_number}\t{part.family}\t{part_shape(part)}\t{part_generator(part).__name__}")
+    return 0
+
+
+def changed_functions(previous: Dict[str, str], current: Dict[str, str]) -> Dict[str, List[str]]:
+    """Source hashes that differ from a previous build's, by function name."""
+    return {
+        'modified': sorted(name for name in current.keys() & previous.keys() if current[name] != previous[name]),
+        'added': sorted(current.keys() - previous.keys()),
+        'removed': sorted(previous.keys() - current.keys()),
+    }
+
+
+def build_plan(args) -> dict:
+    """
+    What `build` would do with these arguments: every selected part with
+    its action and reason, the source functions that changed since the
+    last build and the parts each one invalidates, and the build time
+    estimated from build_timings. Fingerprints only; no geometry is built.
+    """
+    output_dir = Path(args.out)
+    options = build_options(args, planning=True)
+    profile = options.profile
+    registry = all_parts()
+    parts = sample_parts(selected_parts(args, registry), profile.sample)
+    previous = load_manifest(output_dir) or {}
+    planned = plan_parts(parts, output_dir, options, previous_models(output_dir, registry, previous), args.force)
+
+    # Without recorded source hashes (no manifest, or one from before fingerprints) changes cannot be attributed
+    sources = None
+    changed = set()
+    if 'fingerprints' in previous:
+        functions = set().union(*(part_dependencies(part, PIPELINE) for part in registry))
+        sources = changed_functions(previous['fingerprints'], function_hashes(functions))
+        changed = set(sources['modified']) | set(sources['added'])
+    invalidated = dict.fromkeys(sorted(changed), 0)
+
+    entries = []
+    reasons: Dict[str, int] = {}
+    families: Dict[str, int] = {}
+    for part, fingerprint, reason in planned:
+        if reason == 'changed' and sources is not None:
+            names = changed & {function_name(func) for func in part_dependencies(part, PIPELINE)}
+            for name in names:
+                invalidated[name] += 1
+            # A new fingerprint with unchanged sources means the settings or toolchain moved
+            reason = 'sources' if names else 'settings'
+        if reason is not None:
+            reasons[reason] = reasons.get(reason, 0) + 1
+            families[part.family] = families.get(part.family, 0) + 1
+        entry = previous.get('models', {}).get(part.part_number, {})
+        entries.append({
+            'part_number': part.part_number,
+            'family': part.family,
+            'action': 'cached' if reason is None else 'build',
+            'reason': reason,
+            'fingerprint': fingerprint,
+            'previous_fingerprint': entry.get('fingerprint'),
+        })
+
+    timings = load_timings()
+    estimates = {}
+    for family, count in sorted(families.items()):
+        per_part = part_seconds(timings, profile.name, timing_group(family, options))
+        estimates[family] = {'parts': count, 'seconds_per_part': per_part,
+                             'seconds': None if per_part is None else round(per_part * count, 3)}
+    building = sum(families.values())
+    jobs = max(1, min(args.jobs, building or 1))
+    serial = sum(estimate['seconds'] or 0.0 for estimate in estimates.values())
+
+    return {
+        'version': 1,
+        'output': str(output_dir),
+        'profile': profile_record(profile),
+        'previous_build': bool(previous),
+        'previous_profile': previous.get('profile'),
+        'settings': build_settings(options),
+        'summary': {'parts': len(entries), 'build': building, 'cached': len(entries) - building,
+                    'reasons': reasons},
+        'sources': None if sources is None else {**sources, 'invalidated': invalidated},
+        'estimate': {'jobs': jobs, 'seconds': round(serial / jobs, 3), 'families': estimates,
+                     'complete': all(estimate['seconds'] is not None for estimate in estimates.values())},
+        'parts': entries,
+    }
+
+
+def print_plan(plan: dict) -> None:
+    summary = plan['summary']
+    print(f"Plan for {summary['parts']} parts in {plan['output']} ({plan['profile']['name']} profile)")
+    previous_profile = plan['previous_profile']
+    if previous_profile is not None and previous_profile != plan['profile']:
+        print(f"Profile changed since the last build (was {previous_profile.get('name')})")
+    print()
+    reasons = ', '.join(f"{count} {reason}" for reason, count in sorted(summary['reasons'].items()))
+    print(f"Rebuild: {summary['build']}" + (f" ({reasons})" if reasons else ''))
+    print(f"Cached:  {summary['cached']}")
+
+    sources = plan['sources']
+    if not plan['previous_build']:
+        print()
+        print("No previous build in this directory")
+    elif sources is None:
+        print()
+        print("No source hashes recorded by the previous build; changes cannot be attributed")
+    elif any(sources[kind] for kind in ('modified', 'added', 'removed')):
+        print()
+        print("Changed sources:")
+        for kind in ('modified', 'added'):
+            for name in sources[kind]:
+                print(f"  {kind:9} {name:50} {sources['invalidated'][name]} parts")
+        for name in sources['removed']:
+            print(f"  {'removed':9} {name}")
+
+    estimate = plan['estimate']
+    if summary['build']:
+        print()
+        jobs = f"{estimate['jobs']} job{'s' if estimate['jobs'] > 1 else ''}"
+        partial = '' if estimate['complete'] else ' (some families have no timing history)'
+        print(f"Estimated build time: {estimate['seconds']:.1f}s with {jobs}{partial}")
+        for family, family_estimate in estimate['families'].items():
+            if family_estimate['seconds'] is None:
+                print(f"  {family:9} {family_estimate['parts']:5} parts, no timing history")
+            else:
+                print(f"  {family:9} {family_estimate['parts']:5} parts x {family_estimate['seconds_per_part']:.3f}s"
+                      f" = {family_estimate['seconds']:.1f}s")
+
+
+def cmd_plan(args) -> int:
+    plan = build_plan(args)
+    if args.json == '-':
+        sys.stdout.write(json.dumps(plan, indent=2) + '\n')
+        return 0
+    print_plan(plan)
+    if args.json:
+        Path(args.json).write_text(json.dumps(plan, indent=2) + '\n')
+        print()
+        print(f"Plan: {args.json}")
+    return 0
+
+
+def cmd_build(args) -> int:
+    output_dir = Path(args.out)
+    options = build_options(args)
+    profile = options.profile
+    registry = all_parts()
+    parts = sample_parts(selected_parts(args, registry), profile.sample)
+    if not parts:
+        print("No parts match the filters")
+        return 1
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    def wanted(flag: bool) -> bool:
+        # The profile can force the extra outputs on or off; otherwise the flags decide
+        return flag if profile.outputs is None else profile.outputs
+
+    print(f"Building {len(parts)} models into {output_dir} ({profile.name} profile)")
+    print()
+
+    # Parts are rebuilt when their fingerprint changes; the rest keep their previous entries
+    manifest = previous_models(output_dir, registry)
+    if args.jobs > 1:
+        from build_workers import build_pool
+        with build_pool(args.jobs) as (pool, generation):
+            counts = build_parts(parts, output_dir, options, manifest, args.force, pool, generation)
+    else:
+        counts = build_parts(parts, output_dir, options, manifest, args.force)
+
+    if wanted(args.thumbnails) or wanted(args.atlases):
+        from thumbnails import render_thumbnails
+        rendered = render_thumbnails(output_dir, manifest, size=args.thumbnail_size)
+        print(f"Thumbnails: {rendered} rendered, {len(manifest) - rendered} cached")
+        if wanted(args.atlases):
+            from thumbnails import build_atlases
+            atlases = build_atlases(output_dir, manifest, page_size=args.page_size)
+            print(f"Atlases: {sum(len(a['pages']) for a in atlases.values())} pages")
+
+    if wanted(args.turntables):
+        from thumbnails import parse_frames, render_turntables
+        strips = render_turntables(output_dir, manifest, parse_frames(args.frames))
+        print(f"Turntables: {strips} strips rendered")
+
+    manifest_path, copies = write_build_manifest(output_dir, manifest, profile, registry)
+
+    print()
+    print(f"Manifest: {manifest_path} ({copies} new hashed copies)")
+    if args.jobs <= 1:
+        print(format_stats(csg_stats()))
+    print(f"Complete! {counts['built']} models built, {counts['reused']} unchanged sources skipped, "
+          f"{counts['written']} written ({counts['fallbacks']} with fallbacks, {counts['failed']} failed)")
+
+    if wanted(args.packs):
+        from model_packs import build_packs
+        print()
+        packs = build_packs(output_dir)
+        for family, index in packs.items():
+            print(f"Pack: {family} ({len(index['parts'])} parts, {index['bytes']} bytes) -> {index['file']}")
+
+    if wanted(args.compress):
+        from compress_assets import compress_models_dir, print_report
+        print()
+        print_report(compress_models_dir(output_dir))
+    return 1 if counts['failed'] else 0
+
+
+def cmd_verify(args) -> int:
+    parts = selected_parts(args, all_parts())
+    print(f"Verifying deterministic output for {len(parts)} models...")
+
+    mismatches = []
+    for part in parts:
+        first = content_hash(build_part_bytes(part, threaded=args.threads, thread_maps=args.thread_maps).data)
+        second = content_hash(build_part_bytes(part, threaded=args.threads, thread_maps=args.thread_maps).data)
+        if first != second:
+            mismatches.append(part)
+            print(f"  ✗ {part.part_number}: {first[:12]} != {second[:12]}")
+
+    if mismatches:
+        print(f"\n{len(mismatches)} of {len(parts)} models are not reproducible")
+        return 1
+    print(f"✓ All {len(parts)} models are byte-reproducible")
+    return 0
+
+
+def cmd_watch(args) -> int:
+    from build_watch import watch
+    return watch(args)
+
+
+def add_option_arguments(parser) -> None:
+    """Settings that change the models themselves, shared by build and watch."""
+    parser.add_argument('--crease-angle', type=float, default=CREASE_ANGLE,
+                        help='split normals across edges sharper than this (degrees)')
+    parser.add_argument('--instancing', action='store_true',
+                        help='also write EXT_mesh_gpu_instancing variants for parts with repeated features')
+    parser.add_argument('--canonical', action='store_true', help='normalize every part to a canonical orientation')
+    parser.add_argument('--threads', action='store_true', help='model helical threads on bolts and screws')
+    parser.add_argument('--thread-maps', action='store_true',
+                        help='give plain bolt and screw shafts a baked thread normal map')
+    parser.add_argument('--profile', choices=list(PROFILES), default=DEFAULT_PROFILE,
+                        help='draft for quick iteration, production for release builds')
+    parser.add_argument('--quality', type=float,
+                        help="tessellation quality (default: the profile's); 2 halves the allowed chord error")
+    parser.add_argument('--csg-engine', choices=('manifold', 'blender'),
+                        help='boolean engine (default: the first one installed)')
+
+
+def add_filter_arguments(parser) -> None:
+    parser.add_argument('--part', action='append', metavar='GLOB',
+                        help="part-number glob, e.g. 'MS21042-*' (repeatable)")
+    parser.add_argument('--match', metavar='REGEX', help='regular expression searched in the part number')
+    parser.add_argument('--family', action='append', choices=FAMILIES, help='part family (repeatable)')
+    parser.add_argument('--shape', action='append', help='shape type from the family classifier, e.g. flush_head')
+    parser.add_argument('--generator', action='append', help='create_* function, e.g. create_castle_nut')
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Build GLB models for every part family.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help='build all models')
+    build.add_argument('--out', default=str(MODELS_DIR), help='output directory')
+    build.add_argument('--thumbnails', action='store_true', help='render a PNG thumbnail per model')
+    build.add_argument('--thumbnail-size', type=int, default=128, help='thumbnail edge in pixels')
+    build.add_argument('--atlases', action='store_true', help='pack thumbnails into per-category atlases')
+    build.add_argument('--page-size', type=int, default=12, help='sprites per atlas (catalog page size)')
+    build.add_argument('--turntables', action='store_true', help='render turntable frame strips')
+    build.add_argument('--frames', help='per-family turntable frame counts, e.g. bolts=24,nuts=0')
+    build.add_argument('--packs', action='store_true', help='write one bundle per category with a range index')
+    build.add_argument('--compress', action='store_true', help='write precompressed .gz/.br siblings')
+    add_option_arguments(build)
+    build.add_argument('--jobs', type=int, default=1, help='worker processes (default: build in this process)')
+    build.add_argument('--force', action='store_true',
+                       help='rebuild every selected part, even if its sources are unchanged')
+    add_filter_arguments(build)
+    build.set_defaults(func=cmd_build)
+
+    watch = sub.add_parser('watch', help='rebuild the affected models whenever the build scripts change')
+    watch.add_argument('--out', default=str(MODELS_DIR), help='output directory')
+    watch.add_argument('--jobs', type=int, default=os.cpu_count(), help='worker processes (default: CPU count)')
+    add_option_arguments(watch)
+    add_filter_arguments(watch)
+    watch.set_defaults(func=cmd_watch)
+
+    verify = sub.add_parser('verify', help='build each part twice and compare hashes')
+    verify.add_argument('--threads', action='store_true', help='verify the threaded bolt and screw models')
+    verify.add_argument('--thread-maps', action='store_true', help='verify the thread-mapped bolt and screw models')
+    add_filter_arguments(verify)
+    verify.set_defaults(func=cmd_verify)
+
+    plan = sub.add_parser('plan', help='report what build would rebuild and how long it would take, without building')
+    plan.add_argument('--out', default=str(MODELS_DIR), help='output directory to compare against')
+    plan.add_argument('--jobs', type=int, default=1, help='worker processes to estimate for')
+    plan.add_argument('--force', action='store_true', help='plan a rebuild of every selected part')
+    plan.add_argument('--json', metavar='PATH', help="also write the plan as JSON ('-' for stdout only)")
+    add_option_arguments(plan)
+    add_filter_arguments(plan)
+    plan.set_defaults(func=cmd_plan)
+
+    listing = sub.add_parser('list', help='print the parts the filters select, without building')
+    add_filter_arguments(listing)
+    listing.set_defaults(func=cmd_list)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
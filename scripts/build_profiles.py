@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Named build profiles.
+A profile bundles the settings that trade build time for fidelity, so a
+quick look at a generator change does not pay for a release build:
+
+    draft       coarse tessellation, no booleans, no cleanup or mass
+                properties, no thumbnails/packs/compression, and only a
+                few parts per family
+    standard    full quality; extra outputs follow the command-line flags
+    production  full quality with every extra output enabled
+
+The chosen profile is recorded in the manifest, and deploy_delta refuses to
+stage a draft build.
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+
+
+class BuildProfile(NamedTuple):
+    name: str
+    # Tessellation quality (tessellation.set_quality)
+    quality: float
+    booleans: bool
+    # clean_mesh and mass properties
+    cleanup: bool
+    # Thumbnails, atlases, turntables, packs and compression: True forces them on,
+    # False off, None leaves them to the command-line flags
+    outputs: Optional[bool]
+    # Parts built per family, or None for every part
+    sample: Optional[int]
+
+
+PROFILES: Dict[str, BuildProfile] = {
+    'draft': BuildProfile('draft', quality=0.25, booleans=False, cleanup=False, outputs=False, sample=5),
+    'standard': BuildProfile('standard', quality=1.0, booleans=True, cleanup=True, outputs=None, sample=None),
+    'production': BuildProfile('production', quality=1.0, booleans=True, cleanup=True, outputs=True, sample=None),
+}
+DEFAULT_PROFILE = 'standard'
+
+
+def get_profile(name: str, quality: Optional[float] = None) -> BuildProfile:
+    """Profile by name, with the tessellation quality overridden if given."""
+    if name not in PROFILES:
+        raise ValueError(f"Unknown build profile: {name} (choose from {', '.join(PROFILES)})")
+    profile = PROFILES[name]
+    if quality is not None:
+        profile = profile._replace(quality=quality)
+    return profile
+
+
+def sample_parts(parts: List, per_family: Optional[int]) -> List:
+    """
+    Up to per_family parts from each family, spread evenly over the
+    registry order so the sample covers the family's range of sizes and
+    types. Registry order is kept.
+    """
+    if per_family is None:
+        return list(parts)
+    families: Dict[str, List] = {}
+    for part in parts:
+        families.setdefault(part.family, []).append(part)
+    chosen = set()
+    for members in families.values():
+        count = min(per_family, len(members))
+        if count == 1:
+            chosen.add(members[0].part_number)
+            continue
+        for i in range(count):
+            chosen.add(members[i * (len(members) - 1) // (count - 1)].part_number)
+    return [part for part in parts if part.part_number in chosen]
+
+
+def profile_record(profile: BuildProfile) -> dict:
+    """Settings as recorded in the manifest."""
+    return profile._asdict()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Historical build timings per profile and family.
+Every build records how long its parts took to generate; `build_models.py
+plan` multiplies the per-part means by the number of parts it would
+rebuild to estimate how long a build will run. Means are over the most
+recent HISTORY_PARTS parts of each family, so they follow generator and
+machine changes; threaded and thread-mapped builds of a family are
+averaged separately. Stored in the build cache, not the manifest, so
+timing noise never changes a deployed file.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from build_config import CACHE_DIR
+
+TIMINGS_PATH = CACHE_DIR / 'build-timings.json'
+# Parts a family's mean is averaged over
+HISTORY_PARTS = 200
+
+
+def load_timings(path: Path = TIMINGS_PATH) -> Dict[str, Dict[str, dict]]:
+    """{profile: {family: {'parts': n, 'seconds': mean seconds per part}}}"""
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def record_timings(profile: str, samples: Dict[str, List[float]], path: Path = TIMINGS_PATH) -> None:
+    """Fold one build's per-part seconds, by family, into the running means."""
+    if not any(samples.values()):
+        return
+    timings = load_timings(path)
+    families = timings.setdefault(profile, {})
+    for family, seconds in samples.items():
+        if not seconds:
+            continue
+        previous = families.get(family, {'parts': 0, 'seconds': 0.0})
+        # The older mean keeps whatever share of the window the new samples leave
+        weight = max(0, min(previous['parts'], HISTORY_PARTS - len(seconds)))
+        mean = (previous['seconds'] * weight + sum(seconds)) / (weight + len(seconds))
+        families[family] = {'parts': min(previous['parts'] + len(seconds), HISTORY_PARTS), 'seconds': round(mean, 6)}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(timings, indent=2, sort_keys=True) + '\n')
+
+
+def part_seconds(timings: Dict[str, Dict[str, dict]], profile: str, family: str) -> Optional[float]:
+    """Mean seconds per part for a family under a profile, or None with no history."""
+    record = timings.get(profile, {}).get(family)
+    return None if record is None else record['seconds']
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Watch mode: rebuild the models affected by each edit to the build scripts.
+The part lists that make up the registry live in the generate_*.py
+scripts themselves, so watching scripts/ covers both generator code and
+registry data. Files are polled (no inotify or external services needed);
+after a change settles, the scripts are re-imported, source fingerprints
+pick out the parts whose output can have changed, and only those are
+rebuilt in a warm build_workers pool straight into the models directory,
+where the Vite dev server picks them up.
+"""
+
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from build_workers import PERSISTENT_MODULES, SCRIPTS_DIR, reload_scripts, worker_pool
+
+WATCH_PATTERNS = ('*.py', '*.json', '*.csv')
+POLL_INTERVAL = 0.5
+# Wait this long after a change for editors to finish writing
+SETTLE_TIME = 0.2
+
+
+def snapshot(directories: Iterable[Path] = (SCRIPTS_DIR,)) -> Dict[Path, Tuple[int, int]]:
+    """(mtime, size) of every watched file."""
+    files = {}
+    for directory in directories:
+        for pattern in WATCH_PATTERNS:
+            for path in Path(directory).glob(pattern):
+                stat = path.stat()
+                files[path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+def changed_files(before: Dict[Path, Tuple[int, int]], after: Dict[Path, Tuple[int, int]]) -> List[Path]:
+    return sorted(path for path in before.keys() | after.keys() if before.get(path) != after.get(path))
+
+
+def rebuild(args, pool, generation: int) -> None:
+    """Re-import the scripts and rebuild whatever their fingerprints say changed."""
+    build_models = reload_scripts()
+    options = build_models.build_options(args)
+    registry = build_models.all_parts()
+    parts = build_models.sample_parts(build_models.selected_parts(args, registry), options.profile.sample)
+    output_dir = Path(args.out)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    previous = build_models.previous_models(output_dir, registry)
+    manifest = dict(previous)
+    counts = build_models.build_parts(parts, output_dir, options, manifest, pool=pool, generation=generation)
+    if manifest != previous:
+        build_models.write_build_manifest(output_dir, manifest, options.profile, registry)
+    print(f"Rebuilt {counts['built']} of {len(parts)} parts in {time.perf_counter() - start:.1f}s "
+          f"({counts['written']} written, {counts['failed']} failed)")
+
+
+def watch(args) -> int:
+    print(f"Watching {SCRIPTS_DIR} for changes; building into {args.out} (Ctrl+C to stop)")
+    generation = 0
+    with worker_pool(args.jobs) as pool:
+        # Snapshot first so edits made during the initial build are picked up
+        before = snapshot()
+        try:
+            rebuild(args, pool, generation)
+        except Exception:
+            traceback.print_exc()
+        try:
+            while True:
+                time.sleep(POLL_INTERVAL)
+                after = snapshot()
+                if after == before:
+                    continue
+                time.sleep(SETTLE_TIME)
+                after = snapshot()
+                changed = changed_files(before, after)
+                before = after
+                print()
+                print(f"Changed: {', '.join(path.name for path in changed)}")
+                if any(path.stem in PERSISTENT_MODULES for path in changed):
+                    print("  (restart watch to pick up changes to the watcher itself)")
+                generation += 1
+                try:
+                    rebuild(args, pool, generation)
+                except Exception:
+                    # A half-written or broken script: report it and wait for the next save
+                    traceback.print_exc()
+        except KeyboardInterrupt:
+            print()
+    return 0
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Warm worker processes for parallel, watch-mode and daemon builds.
+Workers import the build scripts once, so trimesh, NumPy and the registry
+are already loaded when a part arrives. Every job carries the generation
+of the sources it was planned against; a worker still on an older
+generation drops the build-script modules from sys.modules and imports
+them again, which takes a fraction of a second because the third-party
+imports stay loaded. This module and the long-running loops that own a
+pool (PERSISTENT_MODULES) are never reloaded; restart them to pick up
+changes to their own code. A long-lived owner can also register its pool
+with set_pool_provider, and `build --jobs N` then builds in that warm pool
+instead of starting a fresh one.
+"""
+
+import contextlib
+import importlib
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from lazy_imports import preload
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PERSISTENT_MODULES = {'build_workers', 'build_watch', 'build_daemon'}
+
+_generation = 0
+# Returns (pool, generation) for a number of workers; set by the build daemon
+_pool_provider: Optional[Callable[[int], Tuple[ProcessPoolExecutor, int]]] = None
+
+
+def script_modules() -> List[str]:
+    """Names of the loaded build-script modules that a reload replaces."""
+    names = []
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, '__file__', None)
+        if name in PERSISTENT_MODULES or name == '__main__' or path is None:
+            continue
+        if Path(path).resolve().parent == SCRIPTS_DIR:
+            names.append(name)
+    return names
+
+
+def reload_scripts():
+    """Import the build scripts afresh and return the new build_models module."""
+    for name in script_modules():
+        del sys.modules[name]
+    importlib.invalidate_caches()
+    return importlib.import_module('build_models')
+
+
+def _init_worker() -> None:
+    # Workers may be forked while the daemon is streaming a command's output to its client
+    sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+    importlib.import_module('build_models')
+    preload('numpy', 'trimesh')
+
+
+def worker_pool(jobs: int) -> ProcessPoolExecutor:
+    """Process pool whose workers have the build scripts imported before the first job."""
+    return ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker)
+
+
+def set_pool_provider(provider: Optional[Callable[[int], Tuple[ProcessPoolExecutor, int]]]) -> None:
+    """Register (or with None, drop) the function build_pool asks for a warm pool."""
+    global _pool_provider
+    _pool_provider = provider
+
+
+@contextlib.contextmanager
+def build_pool(jobs: int) -> Iterator[Tuple[ProcessPoolExecutor, int]]:
+    """
+    (pool, generation) to build with: the registered warm pool, which stays
+    up afterwards, or else a fresh pool that is shut down when the block ends.
+    """
+    if _pool_provider is not None:
+        yield _pool_provider(jobs)
+        return
+    with worker_pool(jobs) as pool:
+        yield pool, 0
+
+
+def build_job(job):
+    """Build one part in a worker: job is (generation, part number, fingerprint, BuildOptions)."""
+    global _generation
+    generation, part_number, fingerprint, options = job
+    if generation != _generation:
+        reload_scripts()
+        _generation = generation
+    build_models = importlib.import_module('build_models')
+    build_models.apply_options(options)
+    return build_models.build_result(build_models.part_by_number(part_number), fingerprint, options)
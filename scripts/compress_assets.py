@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Precompress model assets.
+Writes .gz and .br siblings for every GLB and the manifest at maximum
+compression, in parallel, skipping files whose content hash has not changed
+since the last run. Pack bundles stay uncompressed: their index offsets are
+byte ranges of the raw file, which a Content-Encoding would shift. Brotli
+output needs the optional `brotli` package.
+
+Usage:
+    python scripts/compress_assets.py [models_dir] [--jobs N]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from build_config import CACHE_DIR, MODELS_DIR
+from model_manifest import HASHED_DIR, MANIFEST_NAME, load_manifest
+from model_packs import PACK_PREFIX, PACKS_DIR
+
+STATE_FILE = 'compress-state.json'
+
+
+def compressed_variants(data: bytes) -> Dict[str, bytes]:
+    """Gzip (and brotli when available) encodings of data at maximum compression."""
+    # mtime=0 keeps the gzip header free of timestamps
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data, quality=11, mode=brotli.MODE_GENERIC)
+    return variants
+
+
+def _compress_file(path: str) -> Dict[str, int]:
+    data = Path(path).read_bytes()
+    sizes = {'raw': len(data)}
+    for suffix, encoded in compressed_variants(data).items():
+        Path(path + suffix).write_bytes(encoded)
+        sizes[suffix] = len(encoded)
+    return sizes
+
+
+def asset_paths(models_dir: Path) -> List[Path]:
+    """Every GLB (plain and hashed) and pack index, plus the manifest; not the range-served pack bundles."""
+    paths = sorted(models_dir.glob('*.glb')) + sorted(models_dir.glob(f'{HASHED_DIR}/*.glb'))
+    paths += sorted(models_dir.glob(f'{PACKS_DIR}/*.json'))
+    manifest = models_dir / MANIFEST_NAME
+    if manifest.exists():
+        paths.append(manifest)
+    return paths
+
+
+def asset_families(models_dir: Path) -> Dict[str, str]:
+    """Map relative asset paths to their family for reporting."""
+    families = {MANIFEST_NAME: 'manifest'}
+    manifest = load_manifest(models_dir) or {'models': {}}
+    for entry in manifest['models'].values():
+        families[entry['file']] = entry['family']
+        families[entry['hashed']] = entry['family']
+        if 'instanced' in entry:
+            families[entry['instanced']['file']] = entry['family']
+    for index_path in sorted(models_dir.glob(f'{PACKS_DIR}/*.json')):
+        families[index_path.relative_to(models_dir).as_posix()] = 'packs'
+    return families
+
+
+def remove_orphans(models_dir: Path) -> int:
+    """Delete .gz/.br siblings whose source asset no longer exists, and any of pack bundles."""
+    removed = 0
+    for pattern in ('*.gz', '*.br', 'hashed/*.gz', 'hashed/*.br', 'packs/*.gz', 'packs/*.br'):
+        for sibling in models_dir.glob(pattern):
+            source = sibling.with_suffix('')
+            if not source.exists() or (source.parent.name == HASHED_DIR and source.name.startswith(PACK_PREFIX)):
+                sibling.unlink()
+                removed += 1
+    return removed
+
+
+def compress_models_dir(models_dir: Path, jobs: Optional[int] = None,
+                        cache_dir: Path = CACHE_DIR) -> Dict[str, Dict[str, int]]:
+    """
+    Compress every changed asset in models_dir.
+    Returns byte totals per family: {'bolts': {'raw': .., '.gz': .., '.br': ..}}.
+    """
+    models_dir = Path(models_dir)
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    state_path = cache_dir / STATE_FILE
+    state = json.loads(state_path.read_text()) if state_path.exists() else {}
+    # State is kept per models directory so scratch builds don't evict each other
+    dir_key = str(models_dir.resolve())
+    previous = state.get(dir_key, {})
+    suffixes = ['.gz'] + (['.br'] if brotli is not None else [])
+
+    pending = []
+    digests = {}
+    for path in asset_paths(models_dir):
+        relative = path.relative_to(models_dir).as_posix()
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        digests[relative] = digest
+        siblings_exist = all(Path(str(path) + s).exists() for s in suffixes)
+        if previous.get(relative) != digest or not siblings_exist:
+            pending.append(path)
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        list(pool.map(_compress_file, [str(p) for p in pending], chunksize=16))
+
+    remove_orphans(models_dir)
+    state[dir_key] = digests
+    state_path.write_text(json.dumps(state, indent=2, sort_keys=True) + '\n')
+
+    families = asset_families(models_dir)
+    totals: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    for relative in digests:
+        family = families.get(relative, 'other')
+        path = models_dir / relative
+        totals[family]['raw'] += path.stat().st_size
+        totals[family]['files'] += 1
+        for suffix in suffixes:
+            totals[family][suffix] += os.path.getsize(str(path) + suffix)
+    totals['_summary'] = {'compressed': len(pending), 'skipped': len(digests) - len(pending)}
+    return totals
+
+
+def print_report(totals: Dict[str, Dict[str, int]]) -> None:
+    summary = totals.pop('_summary')
+    print(f"{'Family':10s} {'Files':>6s} {'Raw':>10s} {'Gzip':>10s} {'Ratio':>6s} {'Brotli':>10s} {'Ratio':>6s}")
+    for family in sorted(totals):
+        t = totals[family]
+        raw = t['raw'] or 1
+        gz = f"{t['.gz'] / 1024:8.1f}KB {t['.gz'] / raw:6.2f}"
+        br = f"{t['.br'] / 1024:8.1f}KB {t['.br'] / raw:6.2f}" if '.br' in t else f"{'-':>10s} {'-':>6s}"
+        print(f"{family:10s} {t['files']:6d} {t['raw'] / 1024:8.1f}KB {gz} {br}")
+    print(f"\n{summary['compressed']} compressed, {summary['skipped']} unchanged")
+    if brotli is None:
+        print("Note: `brotli` is not installed; only .gz variants were written")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Write .gz and .br siblings for model assets.')
+    parser.add_argument('models_dir', nargs='?', default=str(MODELS_DIR))
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    print_report(compress_models_dir(Path(args.models_dir), jobs=args.jobs))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Boolean operations for the model generators.
+Uses one explicitly selected engine and memoizes each operation on its operands, in memory and in CACHE_DIR/csg.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import shutil
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from build_config import CACHE_DIR
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+trimesh = lazy_import('trimesh')
+
+CSG_CACHE_DIR = CACHE_DIR / 'csg'
+# Bump when cached results would change (engine upgrade, different options)
+CSG_VERSION = 1
+# In order of preference
+ENGINES = ('manifold', 'blender')
+OPERATIONS = ('difference', 'union', 'intersection')
+# Results kept in memory, least recently used dropped first; the disk cache holds the rest
+MEMO_ENTRIES = 256
+
+_engine: Optional[str] = None
+_engine_chosen = False
+_enabled = True
+_memo: OrderedDict[str, object] = OrderedDict()
+_stats = {'computed': 0, 'memory': 0, 'disk': 0, 'failed': 0, 'skipped': 0, 'seconds': 0.0}
+
+
+class BooleanUnavailable(RuntimeError):
+    """No boolean engine is installed, or booleans are disabled."""
+
+
+def select_engine(name: Optional[str] = None) -> Optional[str]:
+    """
+    Choose the engine for this process: name if given (it must be
+    installed), otherwise the first installed one in ENGINES. Returns the
+    engine, or None when nothing is installed.
+    """
+    global _engine, _engine_chosen
+    # Probing the engines imports trimesh, so it waits until a build needs it
+    from trimesh.boolean import engines_available
+    if name is not None and name not in engines_available:
+        raise ValueError(f"Boolean engine {name!r} is not installed "
+                         f"(available: {', '.join(sorted(engines_available)) or 'none'})")
+    if name is None:
+        name = next((engine for engine in ENGINES if engine in engines_available), None)
+    _engine, _engine_chosen = name, True
+    return name
+
+
+def probe_engine(name: Optional[str] = None) -> Optional[str]:
+    """
+    The engine select_engine would choose, found without importing trimesh
+    so that planning stays free of NumPy: manifold3d on the import path or
+    blender on PATH.
+    """
+    if name is not None:
+        return name
+    installed = {'manifold': importlib.util.find_spec('manifold3d') is not None,
+                 'blender': shutil.which('blender') is not None}
+    return next((engine for engine in ENGINES if installed[engine]), None)
+
+
+def set_enabled(enabled: bool) -> None:
+    """Turn booleans off (draft builds) or back on; disabled operations raise BooleanUnavailable."""
+    global _enabled
+    _enabled = enabled
+
+
+def current_engine() -> Optional[str]:
+    if not _engine_chosen:
+        select_engine()
+    return _engine
+
+
+def operand_key(operation: str, engine: str, a, b) -> str:
+    """Cache key over the operation, the engine and both operands' exact geometry."""
+    digest = hashlib.sha256(f"{CSG_VERSION}:{engine}:{operation}".encode())
+    for mesh in (a, b):
+        vertices = np.ascontiguousarray(mesh.vertices, dtype=np.float64)
+        faces = np.ascontiguousarray(mesh.faces, dtype=np.int64)
+        digest.update(np.array(vertices.shape + faces.shape, dtype=np.int64).tobytes())
+        digest.update(vertices.tobytes())
+        digest.update(faces.tobytes())
+    return digest.hexdigest()
+
+
+def _load(path: Path):
+    with np.load(path, allow_pickle=False) as cached:
+        if 'error' in cached:
+            return str(cached['error'])
+        return cached['vertices'], cached['faces']
+
+
+def _store(path: Path, result) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(path.name + '.tmp.npz')
+    if isinstance(result, str):
+        np.savez(temporary, error=np.array(result))
+    else:
+        np.savez(temporary, vertices=result[0], faces=result[1])
+    temporary.replace(path)
+
+
+def boolean(operation: str, a, b, cache_dir: Path = CSG_CACHE_DIR) -> trimesh.Trimesh:
+    """
+    a <operation> b with the selected engine, e.g. boolean('difference', body, hole).
+    Raises BooleanUnavailable without an engine and RuntimeError when the
+    engine rejects the operands; callers fall back as they did before.
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown boolean operation: {operation}")
+    if not _enabled:
+        _stats['skipped'] += 1
+        raise BooleanUnavailable('booleans are disabled')
+    engine = current_engine()
+    if engine is None:
+        _stats['skipped'] += 1
+        raise BooleanUnavailable('no boolean engine installed: pip install manifold3d or install blender')
+
+    key = operand_key(operation, engine, a, b)
+    result = _memo.get(key)
+    if result is not None:
+        _memo.move_to_end(key)
+        _stats['memory'] += 1
+    else:
+        path = Path(cache_dir) / f"{key}.npz"
+        if path.exists():
+            result = _load(path)
+            _stats['disk'] += 1
+        else:
+            start = time.perf_counter()
+            try:
+                mesh = getattr(trimesh.boolean, operation)([a, b], engine=engine)
+                result = (np.asarray(mesh.vertices, dtype=np.float64), np.asarray(mesh.faces, dtype=np.int64))
+            except ImportError:
+                # A broken install is not a property of the operands; never memoize it
+                raise
+            except Exception as e:
+                result = f"{type(e).__name__}: {e}"
+            _stats['seconds'] += time.perf_counter() - start
+            _stats['computed'] += 1
+            _store(path, result)
+        _memo[key] = result
+        if len(_memo) > MEMO_ENTRIES:
+            _memo.popitem(last=False)
+
+    if isinstance(result, str):
+        _stats['failed'] += 1
+        raise RuntimeError(f"{operation} failed: {result}")
+    vertices, faces = result
+    return trimesh.Trimesh(vertices=vertices.copy(), faces=faces.copy(), process=False)
+
+
+def difference(a, b) -> trimesh.Trimesh:
+    return boolean('difference', a, b)
+
+
+def union(a, b) -> trimesh.Trimesh:
+    return boolean('union', a, b)
+
+
+def intersection(a, b) -> trimesh.Trimesh:
+    return boolean('intersection', a, b)
+
+
+def csg_stats() -> dict:
+    """Counts and engine time for the operations run so far in this process."""
+    return {'engine': current_engine(), 'enabled': _enabled, **_stats, 'seconds': round(_stats['seconds'], 3)}
+
+
+def format_stats(stats: dict) -> str:
+    if not stats['enabled']:
+        return f"Booleans: disabled, {stats['skipped']} operations skipped"
+    if stats['engine'] is None:
+        return f"Booleans: no engine installed, {stats['skipped']} operations skipped"
+    return (f"Booleans ({stats['engine']}): {stats['computed']} computed in {stats['seconds']:.2f}s, "
+            f"{stats['memory']} from memory, {stats['disk']} from disk, {stats['failed']} rejected")
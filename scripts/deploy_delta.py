@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Compute the deploy delta between two model builds.
+Compares a previous and current models-manifest.json, lists added, changed
+and removed assets with byte totals, and stages only the delta into a
+deploy directory: each new or changed part's GLBs, thumbnail and turntable,
+plus the pack and atlas of every family with a part added, changed or
+removed.
+
+Usage:
+    python scripts/deploy_delta.py previous-manifest.json public/models
+    python scripts/deploy_delta.py previous-manifest.json public/models --stage deploy/models
+"""
+
+import argparse
+import json
+import shutil
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from model_manifest import HASHED_DIR, MANIFEST_NAME, load_manifest
+from model_packs import PACKS_DIR
+from thumbnails import ATLAS_INDEX_DIR
+
+
+# Entry fields that describe how a part was built rather than anything deployed
+BUILD_ONLY_FIELDS = ('fingerprint',)
+
+
+def deployed_record(entry: dict) -> dict:
+    """The parts of a manifest entry the site sees: every file reference, hash and metadata field."""
+    return {key: value for key, value in entry.items() if key not in BUILD_ONLY_FIELDS}
+
+
+def compute_delta(previous: dict, current: dict) -> Dict[str, List[str]]:
+    """
+    Part numbers added, changed, removed and unchanged between two manifests.
+    A part has changed when anything deployed about it differs, not just the
+    GLB: its instanced variant, mass, viewer metadata, thumbnail or turntable.
+    """
+    old = previous.get('models', {}) if previous else {}
+    new = current.get('models', {})
+
+    delta = {'added': [], 'changed': [], 'removed': [], 'unchanged': []}
+    for part_number in sorted(new):
+        if part_number not in old:
+            delta['added'].append(part_number)
+        elif deployed_record(old[part_number]) != deployed_record(new[part_number]):
+            delta['changed'].append(part_number)
+        else:
+            delta['unchanged'].append(part_number)
+    delta['removed'] = sorted(pn for pn in old if pn not in new)
+    return delta
+
+
+def delta_bytes(delta: Dict[str, List[str]], previous: dict, current: dict) -> Dict[str, int]:
+    """Byte totals for each delta category."""
+    old = previous.get('models', {}) if previous else {}
+    new = current.get('models', {})
+    return {
+        'added': sum(new[pn]['bytes'] for pn in delta['added']),
+        'changed': sum(new[pn]['bytes'] for pn in delta['changed']),
+        'removed': sum(old[pn]['bytes'] for pn in delta['removed']),
+        'unchanged': sum(new[pn]['bytes'] for pn in delta['unchanged']),
+    }
+
+
+def touched_families(delta: Dict[str, List[str]], previous: dict, current: dict) -> Set[str]:
+    """Families with a part added, changed or removed, whose packs and atlases are rewritten."""
+    old = previous.get('models', {}) if previous else {}
+    new = current.get('models', {})
+    families = {new[pn]['family'] for pn in delta['added'] + delta['changed']}
+    return families | {old[pn]['family'] for pn in delta['removed']}
+
+
+def entry_files(entry: dict) -> List[str]:
+    """Every asset a manifest entry references."""
+    files = [entry['file'], entry['hashed']]
+    if 'instanced' in entry:
+        files.append(entry['instanced']['file'])
+    if 'thumbnail' in entry:
+        files.append(entry['thumbnail'])
+    if 'turntable' in entry:
+        files.append(entry['turntable']['file'])
+    if 'detailMap' in entry:
+        # Shared by every part with the same thread, next to both the plain and the hashed GLB
+        files += [entry['detailMap'], f"{HASHED_DIR}/{entry['detailMap']}"]
+    return files
+
+
+def family_index_files(models_dir: Path, family: str) -> List[str]:
+    """A family's pack and atlas indexes that exist, each followed by the hashed files it references."""
+    files = []
+    for index_dir in (PACKS_DIR, ATLAS_INDEX_DIR):
+        relative = f"{index_dir}/{family}.json"
+        path = Path(models_dir) / relative
+        if not path.exists():
+            continue
+        index = json.loads(path.read_text())
+        files.append(relative)
+        if 'file' in index:
+            files.append(index['file'])
+        files += [page['file'] for page in index.get('pages', [])]
+    return files
+
+
+def invalidation_paths(delta: Dict[str, List[str]], previous: dict, current: dict,
+                       models_dir: Optional[Path] = None) -> List[str]:
+    """
+    Mutable paths the CDN must invalidate.
+    Hashed filenames never change content, so only the plain model files,
+    the pack and atlas indexes of touched families (when models_dir is
+    given) and the manifest itself need invalidating.
+    """
+    old = previous.get('models', {}) if previous else {}
+    new = current.get('models', {})
+    paths = [new[pn]['file'] for pn in delta['changed']]
+    paths += [old[pn]['file'] for pn in delta['removed']]
+    if models_dir is not None:
+        for family in touched_families(delta, previous, current):
+            paths += [f for f in family_index_files(models_dir, family) if f.endswith('.json')]
+    return sorted(paths) + [MANIFEST_NAME]
+
+
+def stage_delta(delta: Dict[str, List[str]], current: dict, models_dir: Path, stage_dir: Path,
+                previous: Optional[dict] = None) -> int:
+    """
+    Copy added and changed assets, the packs and atlases of touched
+    families (with any .gz/.br siblings) and the manifest into the deploy
+    directory.
+    """
+    models_dir = Path(models_dir)
+    stage_dir = Path(stage_dir)
+    if stage_dir.exists():
+        shutil.rmtree(stage_dir)
+    stage_dir.mkdir(parents=True)
+
+    relatives = []
+    for part_number in delta['added'] + delta['changed']:
+        relatives += entry_files(current['models'][part_number])
+    for family in sorted(touched_families(delta, previous, current)):
+        relatives += family_index_files(models_dir, family)
+
+    staged = 0
+    for relative in dict.fromkeys(relatives):
+        staged += _stage_file(models_dir, stage_dir, relative)
+    _stage_file(models_dir, stage_dir, MANIFEST_NAME)
+    return staged
+
+
+def _stage_file(models_dir: Path, stage_dir: Path, relative: str) -> int:
+    """Copy one asset and any precompressed .gz/.br siblings, returning bytes staged."""
+    staged = 0
+    for suffix in ('', '.gz', '.br'):
+        source = models_dir / (relative + suffix)
+        if suffix and not source.exists():
+            continue
+        target = stage_dir / (relative + suffix)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, target)
+        staged += target.stat().st_size
+    return staged
+
+
+def format_bytes(size: int) -> str:
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    if size >= 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size} B"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Compare two model builds and stage the delta.')
+    parser.add_argument('previous', help='previous models-manifest.json (or directory containing it)')
+    parser.add_argument('current', help='current models directory')
+    parser.add_argument('--stage', help='directory to stage added and changed assets into')
+    parser.add_argument('--json', dest='json_path', help='write the delta as JSON to this path')
+    args = parser.parse_args(argv)
+
+    previous = load_manifest(args.previous) or {}
+    current = load_manifest(args.current)
+    if current is None:
+        print(f"No {MANIFEST_NAME} in {args.current}; run build_models.py build first")
+        return 1
+
+    delta = compute_delta(previous, current)
+    totals = delta_bytes(delta, previous, current)
+
+    print(f"{'Added':10s} {len(delta['added']):5d} models  {format_bytes(totals['added']):>10s}")
+    print(f"{'Changed':10s} {len(delta['changed']):5d} models  {format_bytes(totals['changed']):>10s}")
+    print(f"{'Removed':10s} {len(delta['removed']):5d} models  {format_bytes(totals['removed']):>10s}")
+    print(f"{'Unchanged':10s} {len(delta['unchanged']):5d} models  {format_bytes(totals['unchanged']):>10s}")
+    for label in ('added', 'changed', 'removed'):
+        for part_number in delta[label]:
+            print(f"  {label[0].upper()} {part_number}")
+
+    if args.json_path:
+        report = {
+            'delta': {k: v for k, v in delta.items() if k != 'unchanged'},
+            'bytes': totals,
+            'invalidate': invalidation_paths(delta, previous, current, Path(args.current)),
+        }
+        Path(args.json_path).write_text(json.dumps(report, indent=2, sort_keys=True) + '\n')
+
+    if args.stage:
+        profile = current.get('profile', {}).get('name')
+        if profile == 'draft':
+            print(f"\nRefusing to stage a draft build; rebuild {args.current} with a full profile first")
+            return 1
+        staged = stage_delta(delta, current, Path(args.current), Path(args.stage), previous)
+        print(f"\nStaged {format_bytes(staged)} into {args.stage}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Source fingerprints for incremental builds.
+Each function in the build scripts is hashed from its bytecode, constants,
+default arguments and the public module-level data it reads; docstrings
+and line numbers are left out, so moving or documenting code does not
+invalidate anything. A part depends on its family build function, the
+create_* generator that builds its shape and the shared pipeline
+(cleanup, export, mass properties), each followed transitively through the
+script functions and classes it calls; a class counts its class-level data,
+its methods and its script base classes. A build function dispatches to every generator
+in its family, so when it is followed the sibling generators are skipped:
+editing create_hex_nut invalidates the castle, lock, wing, jam, slotted,
+acorn and coupling nuts that call it, but not square nuts or pins.
+Code outside scripts/ (trimesh, NumPy) is covered by a toolchain token of
+the Python, trimesh and NumPy versions.
+"""
+
+import hashlib
+import importlib.machinery
+import sys
+import types
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, Set
+
+import model_registry
+from model_registry import Part, part_generator
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+# Bump when the fingerprint scheme changes
+FINGERPRINT_VERSION = 2
+
+_function_hashes: Dict[Callable, str] = {}
+_function_names: Dict[Callable, str] = {}
+_closures: Dict[tuple, FrozenSet[Callable]] = {}
+# Hashed "name=hash" listing per dependency set; most parts share a handful of sets
+_listings: Dict[FrozenSet[Callable], bytes] = {}
+_part_closures: Dict[tuple, FrozenSet[Callable]] = {}
+# Settings token by repr; every part of a build shares the same settings
+_settings_tokens: Dict[str, str] = {}
+# Whether each source file lives in scripts/; resolving paths is the slow part of following code
+_script_files: Dict[str, bool] = {}
+_toolchain: Optional[str] = None
+
+
+def _class_file(cls: type) -> Optional[str]:
+    return getattr(sys.modules.get(cls.__module__), '__file__', None)
+
+
+def _is_a(value, kinds) -> bool:
+    """isinstance without touching value: isinstance reads __class__, which loads a pending lazy_import module."""
+    return issubclass(type(value), kinds)
+
+
+def _is_script(obj) -> bool:
+    """True for functions, classes and modules that live in scripts/."""
+    if _is_a(obj, types.FunctionType):
+        path = obj.__code__.co_filename
+    elif _is_a(obj, type):
+        path = _class_file(obj)
+    elif type(obj) is types.ModuleType:
+        # Exact type: a pending lazy_import module is never a script
+        path = getattr(obj, '__file__', None)
+    else:
+        return False
+    if path is None:
+        return False
+    inside = _script_files.get(path)
+    if inside is None:
+        inside = _script_files[path] = Path(path).resolve().parent == SCRIPTS_DIR
+    return inside
+
+
+def function_name(func: Callable) -> str:
+    """module.function, named after the script file so __main__ and imported copies agree."""
+    name = _function_names.get(func)
+    if name is None:
+        path = _class_file(func) if isinstance(func, type) else func.__code__.co_filename
+        name = _function_names[func] = f"{Path(path).stem}.{func.__qualname__}"
+    return name
+
+
+def _token(value, depth: int = 0) -> str:
+    """Stable text for a data value; functions and classes are named, not followed."""
+    if depth > 4:
+        return type(value).__name__
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return repr(value)
+    if isinstance(value, types.FunctionType):
+        return f"function:{function_name(value)}"
+    if isinstance(value, type):
+        path = _class_file(value)
+        module = Path(path).stem if value.__module__ == '__main__' and path else value.__module__
+        return f"class:{module}.{value.__qualname__}"
+    if isinstance(value, types.CodeType):
+        return _code_token(value)
+    if isinstance(value, (tuple, list)):
+        return '[' + ','.join(_token(item, depth + 1) for item in value) + ']'
+    if isinstance(value, (set, frozenset)):
+        return '{' + ','.join(sorted(_token(item, depth + 1) for item in value)) + '}'
+    if isinstance(value, dict):
+        items = sorted((_token(k, depth + 1), _token(v, depth + 1)) for k, v in value.items())
+        return '{' + ','.join(f"{k}:{v}" for k, v in items) + '}'
+    return type(value).__name__
+
+
+def _code_token(code: types.CodeType, skip_first: bool = False) -> str:
+    consts = code.co_consts[1:] if skip_first else code.co_consts
+    return '|'.join([code.co_code.hex(), ','.join(code.co_names), ','.join(code.co_varnames),
+                     _token(consts)])
+
+
+def _methods(cls: type) -> Iterable[types.FunctionType]:
+    """Functions defined in a class body, including static, class and property methods."""
+    for value in vars(cls).values():
+        if isinstance(value, (staticmethod, classmethod)):
+            value = value.__func__
+        if isinstance(value, property):
+            yield from (f for f in (value.fget, value.fset, value.fdel) if isinstance(f, types.FunctionType))
+        elif isinstance(value, types.FunctionType):
+            yield value
+
+
+def _class_hash(cls: type) -> str:
+    """Hash of a class's bases and class-level data (fields, defaults, constants), not its methods."""
+    parts = [_token(cls.__bases__)]
+    for name, value in sorted(vars(cls).items()):
+        if name in ('__doc__', '__module__', '__qualname__'):
+            continue
+        if isinstance(value, (types.FunctionType, staticmethod, classmethod, property)):
+            continue
+        parts.append(f"{name}={_token(value)}")
+    return hashlib.sha256('\n'.join(parts).encode()).hexdigest()
+
+
+def function_hash(func: Callable) -> str:
+    """
+    Hash of one function's own code and the module data it reads (not its
+    callees); for a class, of its class-level data.
+    """
+    cached = _function_hashes.get(func)
+    if cached is not None:
+        return cached
+    if isinstance(func, type):
+        _function_hashes[func] = _class_hash(func)
+        return _function_hashes[func]
+    code = func.__code__
+    has_docstring = bool(code.co_consts) and func.__doc__ is not None and code.co_consts[0] == func.__doc__
+    parts = [_code_token(code, skip_first=has_docstring), _token(func.__defaults__), _token(func.__kwdefaults__)]
+    for name in code.co_names:
+        if name not in func.__globals__ or name.startswith('_'):
+            # Attribute names, builtins, and private runtime state (memo tables, counters)
+            continue
+        value = func.__globals__[name]
+        if not _is_a(value, (types.FunctionType, types.ModuleType)):
+            parts.append(f"{name}={_token(value)}")
+    digest = hashlib.sha256('\n'.join(parts).encode()).hexdigest()
+    _function_hashes[func] = digest
+    return digest
+
+
+def _callees(func: Callable) -> Iterable[Callable]:
+    """
+    Script functions and classes func refers to, directly or as attributes
+    of script modules; for a class, its methods and script base classes.
+    """
+    if isinstance(func, type):
+        yield from (method for method in _methods(func) if _is_script(method))
+        yield from (base for base in func.__bases__ if _is_script(base))
+        return
+    yield from _code_callees(func.__code__, func.__globals__)
+
+
+def _code_callees(code: types.CodeType, namespace: dict) -> Iterable[Callable]:
+    names = code.co_names
+    for name in names:
+        value = namespace.get(name)
+        if _is_a(value, (types.FunctionType, type)) and _is_script(value):
+            yield value
+        elif type(value) is types.ModuleType and _is_script(value):
+            for attribute in names:
+                member = getattr(value, attribute, None)
+                if _is_a(member, (types.FunctionType, type)) and _is_script(member):
+                    yield member
+    # Functions and comprehensions defined inside share the same globals
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            yield from _code_callees(const, namespace)
+
+
+def dependencies(func: Callable, exclude: FrozenSet[Callable] = frozenset()) -> FrozenSet[Callable]:
+    """func and every script function it reaches, not following anything in exclude."""
+    key = (func, exclude)
+    cached = _closures.get(key)
+    if cached is not None:
+        return cached
+    seen: Set[Callable] = set()
+    pending = [func]
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        pending.extend(callee for callee in _callees(current) if callee not in exclude and callee not in seen)
+    closure = frozenset(seen)
+    _closures[key] = closure
+    return closure
+
+
+def _family_generators(family: str) -> FrozenSet[Callable]:
+    return frozenset(model_registry.SHAPE_GENERATORS.get(family, {}).values())
+
+
+def part_dependencies(part: Part, pipeline: Iterable[Callable] = ()) -> FrozenSet[Callable]:
+    """Every script function whose code can change a part's output."""
+    pipeline = tuple(pipeline)
+    generator = part_generator(part)
+    key = (part.build, part.family, generator, pipeline)
+    cached = _part_closures.get(key)
+    if cached is not None:
+        return cached
+    functions = set(dependencies(part.build, _family_generators(part.family)))
+    functions |= dependencies(generator)
+    for root in pipeline:
+        functions |= dependencies(root)
+    closure = _part_closures[key] = frozenset(functions)
+    return closure
+
+
+def _installed_version(name: str) -> str:
+    """A package's version from its dist-info directory name; importlib.metadata alone takes ~70 ms to import."""
+    # PathFinder skips sys.modules: reading a pending lazy_import module's __spec__ would load it
+    spec = importlib.machinery.PathFinder.find_spec(name)
+    if spec is not None and spec.origin is not None:
+        for info in Path(spec.origin).parent.parent.glob(f"{name}-*.dist-info"):
+            return info.name[len(name) + 1:-len('.dist-info')]
+    from importlib.metadata import version
+    return version(name)
+
+
+def toolchain() -> str:
+    """Python, trimesh and NumPy versions, read from package metadata so neither gets imported."""
+    global _toolchain
+    if _toolchain is None:
+        python = f"{sys.version_info[0]}.{sys.version_info[1]}"
+        _toolchain = (f"python {python}, trimesh {_installed_version('trimesh')}, "
+                      f"numpy {_installed_version('numpy')}")
+    return _toolchain
+
+
+def part_fingerprint(part: Part, pipeline: Iterable[Callable] = (), settings: Optional[dict] = None) -> str:
+    """
+    Fingerprint of everything that determines a part's output: the part
+    number, the hashes of the functions it depends on, the build settings
+    and the toolchain.
+    """
+    functions = part_dependencies(part, pipeline)
+    listing = _listings.get(functions)
+    if listing is None:
+        named = sorted((function_name(func), function_hash(func)) for func in functions)
+        listing = _listings[functions] = ''.join(f"{name}={digest}\n" for name, digest in named).encode()
+    digest = hashlib.sha256(f"{FINGERPRINT_VERSION}|{toolchain()}|{part.part_number}|{part.family}".encode())
+    key = repr(settings)
+    settings_token = _settings_tokens.get(key)
+    if settings_token is None:
+        settings_token = _settings_tokens[key] = _token(settings or {})
+    digest.update(settings_token.encode())
+    digest.update(listing)
+    return digest.hexdigest()
+
+
+def function_hashes(functions: Iterable[Callable]) -> Dict[str, str]:
+    """Named hashes of functions, as recorded in the manifest for change reports."""
+    return {function_name(func): function_hash(func) for func in functions}
@@ -4,17 +4,30 @@ Generate 3D GLB models for all bolt part numbers.
 Creates unique parametric models for different bolt types.
 """
 
-import trimesh
-import numpy as np
+from __future__ import annotations
+
 from pathlib import Path
 
-def create_hex_head_bolt(diameter, length, head_height):
+from glb_export import export_glb
+from mesh_cleanup import clean_mesh
+from threads import shaft_cylinder
+from tessellation import circle_sections
+from lazy_imports import lazy_import
+
+trimesh = lazy_import('trimesh')
+np = lazy_import('numpy')
+
+# AN, MS and NAS bolts are fine-thread (UNF/UNJF)
+THREAD_SERIES = 'UNF'
+
+def create_hex_head_bolt(diameter, length, head_height, thread_series=None):
     """Standard hexagon head bolt"""
     # Threaded shaft
-    shaft = trimesh.creation.cylinder(
+    shaft = shaft_cylinder(
         radius=diameter/2,
         height=length,
-        sections=6
+        sections=circle_sections(diameter/2),
+        thread_series=thread_series
     )
     shaft.apply_translation([0, 0, -length/2])
     
@@ -30,13 +43,14 @@ def create_hex_head_bolt(diameter, length, head_height):
     bolt = trimesh.util.concatenate([shaft, head])
     return bolt
 
-def create_twelve_point_bolt(diameter, length, head_height):
+def create_twelve_point_bolt(diameter, length, head_height, thread_series=None):
     """12-point head bolt for high torque applications"""
     # Threaded shaft
-    shaft = trimesh.creation.cylinder(
+    shaft = shaft_cylinder(
         radius=diameter/2,
         height=length,
-        sections=12
+        sections=circle_sections(diameter/2),
+        thread_series=thread_series
     )
     shaft.apply_translation([0, 0, -length/2])
     
@@ -52,13 +66,14 @@ def create_twelve_point_bolt(diameter, length, head_height):
     bolt = trimesh.util.concatenate([shaft, head])
     return bolt
 
-def create_flush_head_bolt(diameter, length, head_height):
+def create_flush_head_bolt(diameter, length, head_height, thread_series=None):
     """100° flush/countersunk head bolt"""
     # Threaded shaft
-    shaft = trimesh.creation.cylinder(
+    shaft = shaft_cylinder(
         radius=diameter/2,
         height=length,
-        sections=12
+        sections=circle_sections(diameter/2),
+        thread_series=thread_series
     )
     shaft.apply_translation([0, 0, -length/2])
     
@@ -66,7 +81,7 @@ def create_flush_head_bolt(diameter, length, head_height):
     head = trimesh.creation.cone(
         radius=diameter * 1.2,
         height=head_height,
-        sections=16
+        sections=circle_sections(diameter * 1.2)
     )
     head.apply_translation([0, 0, head_height/2])
     
@@ -74,13 +89,14 @@ def create_flush_head_bolt(diameter, length, head_height):
     bolt = trimesh.util.concatenate([shaft, head])
     return bolt
 
-def create_pan_head_bolt(diameter, length, head_height):
+def create_pan_head_bolt(diameter, length, head_height, thread_series=None):
     """Pan head bolt with rounded top"""
     # Threaded shaft
-    shaft = trimesh.creation.cylinder(
+    shaft = shaft_cylinder(
         radius=diameter/2,
         height=length,
-        sections=12
+        sections=circle_sections(diameter/2),
+        thread_series=thread_series
     )
     shaft.apply_translation([0, 0, -length/2])
     
@@ -88,7 +104,7 @@ def create_pan_head_bolt(diameter, length, head_height):
     head = trimesh.creation.cylinder(
         radius=diameter * 1.0,
         height=head_height,
-        sections=16
+        sections=circle_sections(diameter * 1.0)
     )
     head.apply_translation([0, 0, head_height/2])
     
@@ -96,13 +112,14 @@ def create_pan_head_bolt(diameter, length, head_height):
     bolt = trimesh.util.concatenate([shaft, head])
     return bolt
 
-def create_carriage_bolt(diameter, length, head_height):
+def create_carriage_bolt(diameter, length, head_height, thread_series=None):
     """Carriage bolt with round head and square neck"""
     # Threaded shaft
-    shaft = trimesh.creation.cylinder(
+    shaft = shaft_cylinder(
         radius=diameter/2,
         height=length,
-        sections=12
+        sections=circle_sections(diameter/2),
+        thread_series=thread_series
     )
     shaft.apply_translation([0, 0, -length/2])
     
@@ -110,7 +127,7 @@ def create_carriage_bolt(diameter, length, head_height):
     head = trimesh.creation.cylinder(
         radius=diameter * 1.1,
         height=head_height,
-        sections=16
+        sections=circle_sections(diameter * 1.1)
     )
     head.apply_translation([0, 0, head_height/2])
     
@@ -122,13 +139,14 @@ def create_carriage_bolt(diameter, length, head_height):
     bolt = trimesh.util.concatenate([shaft, head, neck])
     return bolt
 
-def create_flange_bolt(diameter, length, head_height):
+def create_flange_bolt(diameter, length, head_height, thread_series=None):
     """Flange bolt with integrated washer"""
     # Threaded shaft
-    shaft = trimesh.creation.cylinder(
+    shaft = shaft_cylinder(
         radius=diameter/2,
         height=length,
-        sections=12
+        sections=circle_sections(diameter/2),
+        thread_series=thread_series
     )
     shaft.apply_translation([0, 0, -length/2])
     
@@ -144,7 +162,7 @@ def create_flange_bolt(diameter, length, head_height):
     flange = trimesh.creation.cylinder(
         radius=diameter * 1.3,
         height=head_height * 0.3,
-        sections=16
+        sections=circle_sections(diameter * 1.3)
     )
     flange.apply_translation([0, 0, -head_height * 0.15])
     
@@ -152,13 +170,14 @@ def create_flange_bolt(diameter, length, head_height):
     bolt = trimesh.util.concatenate([shaft, head, flange])
     return bolt
 
-def create_eye_bolt(diameter, length, head_height):
+def create_eye_bolt(diameter, length, head_height, thread_series=None):
     """Eye bolt with loop head"""
     # Threaded shaft
-    shaft = trimesh.creation.cylinder(
+    shaft = shaft_cylinder(
         radius=diameter/2,
         height=length,
-        sections=12
+        sections=circle_sections(diameter/2),
+        thread_series=thread_series
     )
     shaft.apply_translation([0, 0, -length/2])
     
@@ -166,8 +185,8 @@ def create_eye_bolt(diameter, length, head_height):
     eye = trimesh.creation.torus(
         major_radius=diameter * 1.2,
         minor_radius=diameter * 0.4,
-        sections=16,
-        minor_sections=12
+        major_sections=circle_sections(diameter * 1.2),
+        minor_sections=circle_sections(diameter * 0.4)
     )
     eye.apply_transform(trimesh.transformations.rotation_matrix(np.pi/2, [1, 0, 0]))
     eye.apply_translation([0, diameter * 1.2, head_height])
@@ -176,13 +195,14 @@ def create_eye_bolt(diameter, length, head_height):
     bolt = trimesh.util.concatenate([shaft, eye])
     return bolt
 
-def create_clevis_bolt(diameter, length, head_height):
+def create_clevis_bolt(diameter, length, head_height, thread_series=None):
     """Clevis bolt with head and hole for cotter pin"""
     # Threaded shaft
-    shaft = trimesh.creation.cylinder(
+    shaft = shaft_cylinder(
         radius=diameter/2,
         height=length,
-        sections=12
+        sections=circle_sections(diameter/2),
+        thread_series=thread_series
     )
     shaft.apply_translation([0, 0, -length/2])
     
@@ -190,7 +210,7 @@ def create_clevis_bolt(diameter, length, head_height):
     head = trimesh.creation.cylinder(
         radius=diameter * 1.0,
         height=head_height,
-        sections=16
+        sections=circle_sections(diameter * 1.0)
     )
     head.apply_translation([0, 0, head_height/2])
     
@@ -198,13 +218,14 @@ def create_clevis_bolt(diameter, length, head_height):
     bolt = trimesh.util.concatenate([shaft, head])
     return bolt
 
-def create_anchor_bolt(diameter, length, head_height):
+def create_anchor_bolt(diameter, length, head_height, thread_series=None):
     """Anchor bolt with hooked or bent end"""
     # Main shaft
-    shaft = trimesh.creation.cylinder(
+    shaft = shaft_cylinder(
         radius=diameter/2,
         height=length,
-        sections=12
+        sections=circle_sections(diameter/2),
+        thread_series=thread_series
     )
     shaft.apply_translation([0, 0, -length/2])
     
@@ -220,7 +241,7 @@ def create_anchor_bolt(diameter, length, head_height):
     hook = trimesh.creation.cylinder(
         radius=diameter/2,
         height=length * 0.3,
-        sections=12
+        sections=circle_sections(diameter/2)
     )
     hook.apply_translation([diameter * 0.5, 0, -length * 0.85])
     
@@ -228,13 +249,15 @@ def create_anchor_bolt(diameter, length, head_height):
     bolt = trimesh.util.concatenate([shaft, head, hook])
     return bolt
 
-def create_hanger_bolt(diameter, length, head_height):
+def create_hanger_bolt(diameter, length, head_height, thread_series=None):
     """Hanger bolt with wood screw thread on one end"""
     # Machine thread section
-    machine_thread = trimesh.creation.cylinder(
+    machine_thread = shaft_cylinder(
         radius=diameter/2,
         height=length * 0.5,
-        sections=12
+        sections=circle_sections(diameter/2),
+        thread_series=thread_series,
+        thread_length=length * 0.5
     )
     machine_thread.apply_translation([0, 0, -length * 0.25])
     
@@ -242,7 +265,7 @@ def create_hanger_bolt(diameter, length, head_height):
     wood_thread = trimesh.creation.cone(
         radius=diameter * 0.45,
         height=length * 0.5,
-        sections=12
+        sections=circle_sections(diameter * 0.45)
     )
     wood_thread.apply_translation([0, 0, -length * 0.75])
     
@@ -330,8 +353,9 @@ def classify_bolt_type(part_number):
     # Default: hex head bolt
     return 'hex_head'
 
-def generate_bolt_model(part_number, output_path):
-    """Generate a single bolt 3D model"""
+def build_bolt_model(part_number, threaded=False):
+    """Build a single bolt 3D model, returning (mesh, error); threaded adds helical threads"""
+    thread_series = THREAD_SERIES if threaded else None
     try:
         # Determine bolt type
         bolt_type = classify_bolt_type(part_number)
@@ -375,48 +399,51 @@ def generate_bolt_model(part_number, output_path):
         
         # Create bolt based on type
         if bolt_type == 'hex_head':
-            mesh = create_hex_head_bolt(diameter, length, head_height)
+            mesh = create_hex_head_bolt(diameter, length, head_height, thread_series)
         elif bolt_type == 'twelve_point':
-            mesh = create_twelve_point_bolt(diameter, length, head_height)
+            mesh = create_twelve_point_bolt(diameter, length, head_height, thread_series)
         elif bolt_type == 'flush_head':
-            mesh = create_flush_head_bolt(diameter, length, head_height)
+            mesh = create_flush_head_bolt(diameter, length, head_height, thread_series)
         elif bolt_type == 'pan_head':
-            mesh = create_pan_head_bolt(diameter, length, head_height)
+            mesh = create_pan_head_bolt(diameter, length, head_height, thread_series)
         elif bolt_type == 'carriage':
-            mesh = create_carriage_bolt(diameter, length, head_height)
+            mesh = create_carriage_bolt(diameter, length, head_height, thread_series)
         elif bolt_type == 'flange':
-            mesh = create_flange_bolt(diameter, length, head_height)
+            mesh = create_flange_bolt(diameter, length, head_height, thread_series)
         elif bolt_type == 'eye':
-            mesh = create_eye_bolt(diameter, length, head_height)
+            mesh = create_eye_bolt(diameter, length, head_height, thread_series)
         elif bolt_type == 'clevis':
-            mesh = create_clevis_bolt(diameter, length, head_height)
+            mesh = create_clevis_bolt(diameter, length, head_height, thread_series)
         elif bolt_type == 'anchor':
-            mesh = create_anchor_bolt(diameter, length, head_height)
+            mesh = create_anchor_bolt(diameter, length, head_height, thread_series)
         elif bolt_type == 'hanger':
-            mesh = create_hanger_bolt(diameter, length, head_height)
+            mesh = create_hanger_bolt(diameter, length, head_height, thread_series)
         else:
-            mesh = create_hex_head_bolt(diameter, length, head_height)
+            mesh = create_hex_head_bolt(diameter, length, head_height, thread_series)
         
         # Apply material color
         color = get_bolt_material_color(part_number)
         mesh.visual.vertex_colors = color
         
-        # Export to GLB
-        mesh.export(output_path)
-        
         return mesh, None
     
     except Exception as e:
         # Create simple fallback model
-        shaft = trimesh.creation.cylinder(radius=0.125, height=1.0, sections=12)
+        shaft = trimesh.creation.cylinder(radius=0.125, height=1.0, sections=circle_sections(0.125))
         shaft.apply_translation([0, 0, -0.5])
         head = trimesh.creation.cylinder(radius=0.2, height=0.15, sections=6)
         head.apply_translation([0, 0, 0.075])
         mesh = trimesh.util.concatenate([shaft, head])
         mesh.visual.vertex_colors = [0.35, 0.35, 0.40, 1.0]
-        mesh.export(output_path)
         return mesh, str(e)
 
+def generate_bolt_model(part_number, output_path):
+    """Generate a single bolt 3D model and export it to GLB"""
+    mesh, error = build_bolt_model(part_number)
+    mesh = clean_mesh(mesh)
+    export_glb(mesh, output_path)
+    return mesh, error
+
 # Generate all bolt part numbers
 bolt_part_numbers = []
 
@@ -4,11 +4,19 @@ Generate Complete Aerospace Fitting Models
 Creates unique 3D models for all AN/MS/AS fitting part numbers
 """
 
-import trimesh
-import numpy as np
+from __future__ import annotations
+
 from pathlib import Path
 import re
 
+from glb_export import export_glb
+from lazy_imports import lazy_import
+from mesh_cleanup import clean_mesh
+from tessellation import circle_sections
+
+trimesh = lazy_import('trimesh')
+np = lazy_import('numpy')
+
 # Fitting part numbers from specifications
 FITTING_PART_NUMBERS = [
     "AN774", "AN775", "AN776", "AN777", "AN778", "AN779", "AN780", "AN783", "AN784", "AN785", 
@@ -95,13 +103,13 @@ def create_straight_fitting(part_number, scale=1.0):
     size_factor = 0.8 + (last_digit % 10) * 0.03
     scale *= size_factor
     
-    body = trimesh.creation.cylinder(radius=0.18*scale, height=0.9*scale, sections=32)
+    body = trimesh.creation.cylinder(radius=0.18*scale, height=0.9*scale, sections=circle_sections(0.18*scale))
     hex_grip = trimesh.creation.cylinder(radius=0.24*scale, height=0.3*scale, sections=6)
     
-    sleeve1 = trimesh.creation.cylinder(radius=0.14*scale, height=0.25*scale, sections=32)
+    sleeve1 = trimesh.creation.cylinder(radius=0.14*scale, height=0.25*scale, sections=circle_sections(0.14*scale))
     sleeve1.apply_translation([0, 0, 0.575*scale])
     
-    sleeve2 = trimesh.creation.cylinder(radius=0.14*scale, height=0.25*scale, sections=32)
+    sleeve2 = trimesh.creation.cylinder(radius=0.14*scale, height=0.25*scale, sections=circle_sections(0.14*scale))
     sleeve2.apply_translation([0, 0, -0.575*scale])
     
     fitting = trimesh.util.concatenate([body, hex_grip, sleeve1, sleeve2])
@@ -122,18 +130,19 @@ def create_elbow_fitting(part_number, angle=90, scale=1.0):
     
     for i in range(num_segments):
         ang = (i * angle_rad) / (num_segments - 1)
-        seg = trimesh.creation.cylinder(radius=radius, height=bend_radius/num_segments, sections=24)
+        seg = trimesh.creation.cylinder(radius=radius, height=bend_radius/num_segments,
+                                        sections=circle_sections(radius))
         x = bend_radius * np.cos(ang)
         z = bend_radius * np.sin(ang)
         seg.apply_transform(trimesh.transformations.rotation_matrix(ang, [0, 1, 0]))
         seg.apply_translation([x, 0, z])
         segments.append(seg)
     
-    straight1 = trimesh.creation.cylinder(radius=radius, height=0.4*scale, sections=24)
+    straight1 = trimesh.creation.cylinder(radius=radius, height=0.4*scale, sections=circle_sections(radius))
     straight1.apply_transform(trimesh.transformations.rotation_matrix(np.pi/2, [0, 1, 0]))
     straight1.apply_translation([-0.5*scale, 0, 0])
     
-    straight2 = trimesh.creation.cylinder(radius=radius, height=0.4*scale, sections=24)
+    straight2 = trimesh.creation.cylinder(radius=radius, height=0.4*scale, sections=circle_sections(radius))
     straight2.apply_translation([0, 0, 0.5*scale])
     
     hex_grip = trimesh.creation.cylinder(radius=0.18*scale, height=0.25*scale, sections=6)
@@ -153,15 +162,15 @@ def create_tee_fitting(part_number, scale=1.0):
     body = trimesh.creation.box(extents=[0.6*scale, 0.6*scale, 0.8*scale])
     
     # Three outlets
-    outlet1 = trimesh.creation.cylinder(radius=0.11*scale, height=0.4*scale, sections=24)
+    outlet1 = trimesh.creation.cylinder(radius=0.11*scale, height=0.4*scale, sections=circle_sections(0.11*scale))
     outlet1.apply_transform(trimesh.transformations.rotation_matrix(np.pi/2, [0, 1, 0]))
     outlet1.apply_translation([0.5*scale, 0, 0])
     
-    outlet2 = trimesh.creation.cylinder(radius=0.11*scale, height=0.4*scale, sections=24)
+    outlet2 = trimesh.creation.cylinder(radius=0.11*scale, height=0.4*scale, sections=circle_sections(0.11*scale))
     outlet2.apply_transform(trimesh.transformations.rotation_matrix(-np.pi/2, [0, 1, 0]))
     outlet2.apply_translation([-0.5*scale, 0, 0])
     
-    outlet3 = trimesh.creation.cylinder(radius=0.11*scale, height=0.4*scale, sections=24)
+    outlet3 = trimesh.creation.cylinder(radius=0.11*scale, height=0.4*scale, sections=circle_sections(0.11*scale))
     outlet3.apply_translation([0, 0, 0.6*scale])
     
     hex_grip = trimesh.creation.cylinder(radius=0.20*scale, height=0.25*scale, sections=6)
@@ -182,7 +191,7 @@ def create_cross_fitting(part_number, scale=1.0):
     # Four outlets
     outlets = []
     for angle in [0, 90, 180, 270]:
-        outlet = trimesh.creation.cylinder(radius=0.10*scale, height=0.35*scale, sections=24)
+        outlet = trimesh.creation.cylinder(radius=0.10*scale, height=0.35*scale, sections=circle_sections(0.10*scale))
         outlet.apply_transform(trimesh.transformations.rotation_matrix(np.radians(angle), [0, 0, 1]))
         outlet.apply_transform(trimesh.transformations.rotation_matrix(np.pi/2, [0, 1, 0]))
         outlet.apply_translation([0.525*scale * np.cos(np.radians(angle)), 
@@ -200,15 +209,15 @@ def create_reducer_fitting(part_number, scale=1.0):
     scale *= size_factor
     
     # Large end
-    large_body = trimesh.creation.cylinder(radius=0.18*scale, height=0.35*scale, sections=32)
+    large_body = trimesh.creation.cylinder(radius=0.18*scale, height=0.35*scale, sections=circle_sections(0.18*scale))
     large_body.apply_translation([0, 0, 0.175*scale])
     
     # Transition cone
-    transition = trimesh.creation.cone(radius=0.18*scale, height=0.3*scale, sections=32)
+    transition = trimesh.creation.cone(radius=0.18*scale, height=0.3*scale, sections=circle_sections(0.18*scale))
     transition.apply_transform(trimesh.transformations.rotation_matrix(np.pi, [1, 0, 0]))
     
     # Small end
-    small_body = trimesh.creation.cylinder(radius=0.12*scale, height=0.35*scale, sections=32)
+    small_body = trimesh.creation.cylinder(radius=0.12*scale, height=0.35*scale, sections=circle_sections(0.12*scale))
     small_body.apply_translation([0, 0, -0.325*scale])
     
     # Hex grip
@@ -226,16 +235,16 @@ def create_bulkhead_fitting(part_number, scale=1.0):
     scale *= size_factor
     
     # Main body through-hole
-    body = trimesh.creation.cylinder(radius=0.15*scale, height=0.6*scale, sections=32)
+    body = trimesh.creation.cylinder(radius=0.15*scale, height=0.6*scale, sections=circle_sections(0.15*scale))
     
     # Mounting flange
     flange = trimesh.creation.cylinder(radius=0.35*scale, height=0.08*scale, sections=6)
     
     # Threaded ends
-    thread1 = trimesh.creation.cylinder(radius=0.13*scale, height=0.25*scale, sections=32)
+    thread1 = trimesh.creation.cylinder(radius=0.13*scale, height=0.25*scale, sections=circle_sections(0.13*scale))
     thread1.apply_translation([0, 0, 0.425*scale])
     
-    thread2 = trimesh.creation.cylinder(radius=0.13*scale, height=0.25*scale, sections=32)
+    thread2 = trimesh.creation.cylinder(radius=0.13*scale, height=0.25*scale, sections=circle_sections(0.13*scale))
     thread2.apply_translation([0, 0, -0.425*scale])
     
     fitting = trimesh.util.concatenate([body, flange, thread1, thread2])
@@ -249,11 +258,11 @@ def create_cap_fitting(part_number, scale=1.0):
     scale *= size_factor
     
     # Cap body
-    cap = trimesh.creation.cylinder(radius=0.16*scale, height=0.15*scale, sections=32)
+    cap = trimesh.creation.cylinder(radius=0.16*scale, height=0.15*scale, sections=circle_sections(0.16*scale))
     cap.apply_translation([0, 0, 0.075*scale])
     
     # Threaded shaft
-    shaft = trimesh.creation.cylinder(radius=0.12*scale, height=0.35*scale, sections=32)
+    shaft = trimesh.creation.cylinder(radius=0.12*scale, height=0.35*scale, sections=circle_sections(0.12*scale))
     shaft.apply_translation([0, 0, -0.175*scale])
     
     # Hex grip
@@ -271,7 +280,7 @@ def create_adapter_fitting(part_number, scale=1.0):
     scale *= size_factor
     
     # Main body
-    body = trimesh.creation.cylinder(radius=0.15*scale, height=1.0*scale, sections=32)
+    body = trimesh.creation.cylinder(radius=0.15*scale, height=1.0*scale, sections=circle_sections(0.15*scale))
     
     # Hex grips
     hex1 = trimesh.creation.cylinder(radius=0.20*scale, height=0.24*scale, sections=6)
@@ -281,10 +290,10 @@ def create_adapter_fitting(part_number, scale=1.0):
     hex2.apply_translation([0, 0, -0.28*scale])
     
     # Flared ends (37 degree cone)
-    flare1 = trimesh.creation.cone(radius=0.19*scale, height=0.18*scale, sections=32)
+    flare1 = trimesh.creation.cone(radius=0.19*scale, height=0.18*scale, sections=circle_sections(0.19*scale))
     flare1.apply_translation([0, 0, 0.59*scale])
     
-    flare2 = trimesh.creation.cone(radius=0.19*scale, height=0.18*scale, sections=32)
+    flare2 = trimesh.creation.cone(radius=0.19*scale, height=0.18*scale, sections=circle_sections(0.19*scale))
     flare2.apply_transform(trimesh.transformations.rotation_matrix(np.pi, [1, 0, 0]))
     flare2.apply_translation([0, 0, -0.59*scale])
     
@@ -338,8 +347,8 @@ def main():
     for i, part_number in enumerate(FITTING_PART_NUMBERS, 1):
         filename = f"{part_number.lower()}.glb"
         try:
-            model = generate_fitting_model(part_number)
-            model.export(output_dir / filename)
+            model = clean_mesh(generate_fitting_model(part_number))
+            export_glb(model, output_dir / filename)
             print(f"[{i:3d}/{len(FITTING_PART_NUMBERS)}] ✓ {part_number:12s} → {filename:20s} ({model.vertices.shape[0]:5d} verts)")
             successful += 1
         except Exception as e:
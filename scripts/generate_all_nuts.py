@@ -4,11 +4,20 @@ Generate parametric 3D models for various aerospace nut types.
 Supports Castle, Lock, Hex, Wing, Flange, and other specialty nuts.
 """
 
-import trimesh
-import numpy as np
+from __future__ import annotations
+
 from pathlib import Path
 from typing import Tuple, Optional
 
+import csg
+from glb_export import export_glb
+from lazy_imports import lazy_import
+from mesh_cleanup import clean_mesh
+from tessellation import circle_sections, sphere_subdivisions
+
+trimesh = lazy_import('trimesh')
+np = lazy_import('numpy')
+
 def get_nut_type(part_number: str) -> str:
     """Determine nut type from part number."""
     pn_upper = part_number.upper()
@@ -159,12 +168,12 @@ def create_hex_nut(diameter: float, height: float) -> trimesh.Trimesh:
     nut = trimesh.Trimesh(vertices=vertices, faces=faces)
     
     # Create threaded hole
-    hole = trimesh.creation.cylinder(radius=diameter/2, height=height*1.1, sections=16)
+    hole = trimesh.creation.cylinder(radius=diameter/2, height=height*1.1, sections=circle_sections(diameter/2))
     hole.apply_translation([0, 0, 0])
     
     # Subtract hole
     try:
-        nut = nut.difference(hole)
+        nut = csg.difference(nut, hole)
     except:
         pass
     
@@ -180,7 +189,7 @@ def create_castle_nut(diameter: float, height: float) -> trimesh.Trimesh:
     castle = trimesh.creation.cylinder(
         radius=diameter * 0.85,
         height=castle_height,
-        sections=24
+        sections=circle_sections(diameter * 0.85)
     )
     castle.apply_translation([0, 0, height * 0.35 + castle_height/2])
     
@@ -195,7 +204,7 @@ def create_castle_nut(diameter: float, height: float) -> trimesh.Trimesh:
         slot.apply_translation([diameter * 0.6 * np.cos(angle), diameter * 0.6 * np.sin(angle), height * 0.35 + castle_height/2])
         
         try:
-            castle = castle.difference(slot)
+            castle = csg.difference(castle, slot)
         except:
             pass
     
@@ -210,7 +219,7 @@ def create_locknut(diameter: float, height: float) -> trimesh.Trimesh:
     insert = trimesh.creation.cylinder(
         radius=diameter * 0.55,
         height=height * 0.3,
-        sections=16
+        sections=circle_sections(diameter * 0.55)
     )
     insert.apply_translation([0, 0, -height * 0.15])
     
@@ -249,17 +258,17 @@ def create_flange_nut(diameter: float, height: float) -> trimesh.Trimesh:
     flange = trimesh.creation.cylinder(
         radius=diameter * 1.5,
         height=height * 0.2,
-        sections=24
+        sections=circle_sections(diameter * 1.5)
     )
     flange.apply_translation([0, 0, -height * 0.4])
     
     # Create center hole in flange
-    hole = trimesh.creation.cylinder(radius=diameter/2, height=height*1.2, sections=16)
+    hole = trimesh.creation.cylinder(radius=diameter/2, height=height*1.2, sections=circle_sections(diameter/2))
     
     flange_nut = trimesh.util.concatenate([nut, flange])
     
     try:
-        flange_nut = flange_nut.difference(hole)
+        flange_nut = csg.difference(flange_nut, hole)
     except:
         pass
     
@@ -273,10 +282,10 @@ def create_square_nut(diameter: float, height: float) -> trimesh.Trimesh:
     nut = trimesh.creation.box([side_length, side_length, height])
     
     # Create threaded hole
-    hole = trimesh.creation.cylinder(radius=diameter/2, height=height*1.1, sections=16)
+    hole = trimesh.creation.cylinder(radius=diameter/2, height=height*1.1, sections=circle_sections(diameter/2))
     
     try:
-        nut = nut.difference(hole)
+        nut = csg.difference(nut, hole)
     except:
         pass
     
@@ -301,7 +310,7 @@ def create_slotted_nut(diameter: float, height: float) -> trimesh.Trimesh:
         slot.apply_translation([x, y, 0])
         
         try:
-            nut = nut.difference(slot)
+            nut = csg.difference(nut, slot)
         except:
             pass
     
@@ -318,11 +327,11 @@ def create_acorn_nut(diameter: float, height: float) -> trimesh.Trimesh:
     cap = trimesh.creation.cylinder(
         radius=diameter * 0.75,
         height=height * 0.4,
-        sections=16
+        sections=circle_sections(diameter * 0.75)
     )
     
     # Create dome using sphere intersection
-    dome = trimesh.creation.icosphere(radius=diameter * 0.6)
+    dome = trimesh.creation.icosphere(radius=diameter * 0.6, subdivisions=sphere_subdivisions(diameter * 0.6))
     dome.apply_translation([0, 0, height * 0.2])
     
     # Trim dome
@@ -330,7 +339,7 @@ def create_acorn_nut(diameter: float, height: float) -> trimesh.Trimesh:
     cutter.apply_translation([0, 0, height * 0.7])
     
     try:
-        dome = dome.difference(cutter)
+        dome = csg.difference(dome, cutter)
         cap = trimesh.util.concatenate([cap, dome])
     except:
         pass
@@ -343,8 +352,8 @@ def create_coupling_nut(diameter: float, height: float) -> trimesh.Trimesh:
     """Create a coupling nut (long hex nut)."""
     return create_hex_nut(diameter, height * 2.0)
 
-def generate_nut_model(part_number: str, output_path: str) -> Tuple[Optional[trimesh.Trimesh], Optional[str]]:
-    """Generate a 3D model for a nut part number."""
+def build_nut_model(part_number: str) -> Tuple[trimesh.Trimesh, Optional[str]]:
+    """Build a 3D model for a nut part number, returning (mesh, error)."""
     try:
         # Determine nut type and size
         nut_type = get_nut_type(part_number)
@@ -376,23 +385,26 @@ def generate_nut_model(part_number: str, output_path: str) -> Tuple[Optional[tri
         color = get_nut_material_color(part_number)
         mesh.visual.vertex_colors = color
         
-        # Export to GLB
-        mesh.export(output_path)
-        
         return mesh, None
     
     except Exception as e:
         # Create simple fallback model
         fallback = trimesh.creation.cylinder(radius=0.2, height=0.15, sections=6)
-        hole = trimesh.creation.cylinder(radius=0.125, height=0.2, sections=12)
+        hole = trimesh.creation.cylinder(radius=0.125, height=0.2, sections=circle_sections(0.125))
         try:
-            fallback = fallback.difference(hole)
+            fallback = csg.difference(fallback, hole)
         except:
             pass
         fallback.visual.vertex_colors = [0.40, 0.40, 0.45, 1.0]
-        fallback.export(output_path)
         return fallback, str(e)
 
+def generate_nut_model(part_number: str, output_path: str) -> Tuple[Optional[trimesh.Trimesh], Optional[str]]:
+    """Generate a 3D model for a nut part number and export it to GLB."""
+    mesh, error = build_nut_model(part_number)
+    mesh = clean_mesh(mesh)
+    export_glb(mesh, output_path)
+    return mesh, error
+
 # Generate all nut part numbers
 nut_part_numbers = []
 
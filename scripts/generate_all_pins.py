@@ -4,11 +4,20 @@ Generate parametric 3D models for various aerospace pin types.
 Supports Cotter Pins, Dowel Pins, Hitch Pins, and Spring Pins.
 """
 
-import trimesh
-import numpy as np
+from __future__ import annotations
+
 from pathlib import Path
 from typing import Tuple, Optional
 
+import csg
+from glb_export import export_glb
+from lazy_imports import lazy_import
+from mesh_cleanup import clean_mesh
+from tessellation import circle_sections
+
+trimesh = lazy_import('trimesh')
+np = lazy_import('numpy')
+
 def get_pin_type(part_number: str) -> str:
     """Determine pin type from part number."""
     pn_upper = part_number.upper()
@@ -109,7 +118,7 @@ def create_cotter_pin(diameter: float, length: float) -> trimesh.Trimesh:
     shaft = trimesh.creation.cylinder(
         radius=shaft_radius,
         height=length * 0.7,
-        sections=16
+        sections=circle_sections(shaft_radius)
     )
     shaft.apply_translation([0, 0, length * 0.35])
     
@@ -121,7 +130,7 @@ def create_cotter_pin(diameter: float, length: float) -> trimesh.Trimesh:
     left_leg = trimesh.creation.cylinder(
         radius=shaft_radius * 0.7,
         height=leg_length,
-        sections=12
+        sections=circle_sections(shaft_radius * 0.7)
     )
     left_leg.apply_translation([-leg_offset, 0, -leg_length / 2])
     
@@ -129,7 +138,7 @@ def create_cotter_pin(diameter: float, length: float) -> trimesh.Trimesh:
     right_leg = trimesh.creation.cylinder(
         radius=shaft_radius * 0.7,
         height=leg_length,
-        sections=12
+        sections=circle_sections(shaft_radius * 0.7)
     )
     right_leg.apply_translation([leg_offset, 0, -leg_length / 2])
     
@@ -137,7 +146,7 @@ def create_cotter_pin(diameter: float, length: float) -> trimesh.Trimesh:
     eye = trimesh.creation.cylinder(
         radius=shaft_radius * 1.5,
         height=shaft_radius * 0.5,
-        sections=16
+        sections=circle_sections(shaft_radius * 1.5)
     )
     eye.apply_translation([0, 0, length * 0.7 + shaft_radius * 0.25])
     
@@ -148,7 +157,7 @@ def create_dowel_pin(diameter: float, length: float) -> trimesh.Trimesh:
     pin = trimesh.creation.cylinder(
         radius=diameter / 2,
         height=length,
-        sections=24
+        sections=circle_sections(diameter / 2)
     )
     # Center at origin
     pin.apply_translation([0, 0, 0])
@@ -163,7 +172,7 @@ def create_spring_pin(diameter: float, length: float) -> trimesh.Trimesh:
     body = trimesh.creation.cylinder(
         radius=main_radius,
         height=length * 0.9,
-        sections=24
+        sections=circle_sections(main_radius)
     )
     body.apply_translation([0, 0, 0])
     
@@ -171,7 +180,7 @@ def create_spring_pin(diameter: float, length: float) -> trimesh.Trimesh:
     chamfer_top = trimesh.creation.cone(
         radius=main_radius,
         height=length * 0.05,
-        sections=24
+        sections=circle_sections(main_radius)
     )
     chamfer_top.apply_translation([0, 0, length * 0.475])
     
@@ -179,7 +188,7 @@ def create_spring_pin(diameter: float, length: float) -> trimesh.Trimesh:
     chamfer_bottom = trimesh.creation.cone(
         radius=main_radius,
         height=length * 0.05,
-        sections=24
+        sections=circle_sections(main_radius)
     )
     chamfer_bottom.apply_transform(trimesh.transformations.rotation_matrix(
         np.pi, [1, 0, 0]
@@ -195,7 +204,7 @@ def create_spring_pin(diameter: float, length: float) -> trimesh.Trimesh:
     
     # Subtract slot (boolean operation)
     try:
-        pin = pin.difference(slot)
+        pin = csg.difference(pin, slot)
     except:
         pass  # If boolean fails, just use pin without slot
     
@@ -209,7 +218,7 @@ def create_clevis_pin(diameter: float, length: float) -> trimesh.Trimesh:
     shaft = trimesh.creation.cylinder(
         radius=shaft_radius,
         height=length,
-        sections=24
+        sections=circle_sections(shaft_radius)
     )
     shaft.apply_translation([0, 0, 0])
     
@@ -219,7 +228,7 @@ def create_clevis_pin(diameter: float, length: float) -> trimesh.Trimesh:
     head = trimesh.creation.cylinder(
         radius=head_radius,
         height=head_height,
-        sections=24
+        sections=circle_sections(head_radius)
     )
     head.apply_translation([0, 0, length / 2 + head_height / 2])
     
@@ -230,7 +239,7 @@ def create_clevis_pin(diameter: float, length: float) -> trimesh.Trimesh:
     hole = trimesh.creation.cylinder(
         radius=hole_radius,
         height=shaft_radius * 2.5,
-        sections=12
+        sections=circle_sections(hole_radius)
     )
     hole.apply_transform(trimesh.transformations.rotation_matrix(
         np.pi / 2, [0, 1, 0]
@@ -241,14 +250,14 @@ def create_clevis_pin(diameter: float, length: float) -> trimesh.Trimesh:
     
     # Try to subtract hole
     try:
-        pin = pin.difference(hole)
+        pin = csg.difference(pin, hole)
     except:
         pass
     
     return pin
 
-def generate_pin_model(part_number: str, output_path: str) -> Tuple[Optional[trimesh.Trimesh], Optional[str]]:
-    """Generate a 3D model for a pin part number."""
+def build_pin_model(part_number: str) -> Tuple[trimesh.Trimesh, Optional[str]]:
+    """Build a 3D model for a pin part number, returning (mesh, error)."""
     try:
         # Determine pin type and size
         pin_type = get_pin_type(part_number)
@@ -268,18 +277,21 @@ def generate_pin_model(part_number: str, output_path: str) -> Tuple[Optional[tri
         color = get_pin_material_color(part_number)
         mesh.visual.vertex_colors = color
         
-        # Export to GLB
-        mesh.export(output_path)
-        
         return mesh, None
     
     except Exception as e:
         # Create simple fallback model
-        fallback = trimesh.creation.cylinder(radius=0.125, height=1.0, sections=16)
+        fallback = trimesh.creation.cylinder(radius=0.125, height=1.0, sections=circle_sections(0.125))
         fallback.visual.vertex_colors = [0.40, 0.40, 0.45, 1.0]
-        fallback.export(output_path)
         return fallback, str(e)
 
+def generate_pin_model(part_number: str, output_path: str) -> Tuple[Optional[trimesh.Trimesh], Optional[str]]:
+    """Generate a 3D model for a pin part number and export it to GLB."""
+    mesh, error = build_pin_model(part_number)
+    mesh = clean_mesh(mesh)
+    export_glb(mesh, output_path)
+    return mesh, error
+
 # Generate all pin part numbers
 pin_part_numbers = []
 
@@ -5,10 +5,19 @@ Creates geometrically accurate screw models with different head types, lengths,
 Uses only basic trimesh primitives - no scipy or blender dependencies.
 """
 
-import trimesh
-import numpy as np
+from __future__ import annotations
+
 from pathlib import Path
 
+from glb_export import export_glb
+from mesh_cleanup import clean_mesh
+from threads import shaft_cylinder
+from tessellation import circle_sections
+from lazy_imports import lazy_import
+
+trimesh = lazy_import('trimesh')
+np = lazy_import('numpy')
+
 # All screw part numbers from specifications
 SCREW_PART_NUMBERS = [
     # AN Series - Fillister Head Screws
@@ -218,7 +227,7 @@ def classify_screw_type(part_number):
     
     return "machine"  # Default
 
-def create_socket_cap_screw(length_scale=1.0):
+def create_socket_cap_screw(length_scale=1.0, thread_series=None):
     """Create socket head cap screw"""
     shaft_radius = 0.15 * length_scale
     shaft_length = 1.0 * length_scale
@@ -226,17 +235,17 @@ def create_socket_cap_screw(length_scale=1.0):
     head_height = 0.2 * length_scale
     
     # Shaft
-    shaft = trimesh.creation.cylinder(radius=shaft_radius, height=shaft_length, sections=16)
+    shaft = shaft_cylinder(shaft_radius, shaft_length, circle_sections(shaft_radius), thread_series)
     shaft.apply_translation([0, 0, shaft_length/2])
     
     # Head
-    head = trimesh.creation.cylinder(radius=head_radius, height=head_height, sections=16)
+    head = trimesh.creation.cylinder(radius=head_radius, height=head_height, sections=circle_sections(head_radius))
     head.apply_translation([0, 0, shaft_length + head_height/2])
     
     # Combine (no socket depression to avoid blender dependency)
     return trimesh.util.concatenate([shaft, head])
 
-def create_fillister_head_screw(length_scale=1.0):
+def create_fillister_head_screw(length_scale=1.0, thread_series=None):
     """Create fillister head screw"""
     shaft_radius = 0.12 * length_scale
     shaft_length = 0.9 * length_scale
@@ -244,16 +253,16 @@ def create_fillister_head_screw(length_scale=1.0):
     head_height = 0.15 * length_scale
     
     # Shaft
-    shaft = trimesh.creation.cylinder(radius=shaft_radius, height=shaft_length, sections=16)
+    shaft = shaft_cylinder(shaft_radius, shaft_length, circle_sections(shaft_radius), thread_series)
     shaft.apply_translation([0, 0, shaft_length/2])
     
     # Fillister head (wider cylinder)
-    head = trimesh.creation.cylinder(radius=head_radius, height=head_height, sections=16)
+    head = trimesh.creation.cylinder(radius=head_radius, height=head_height, sections=circle_sections(head_radius))
     head.apply_translation([0, 0, shaft_length + head_height/2])
     
     return trimesh.util.concatenate([shaft, head])
 
-def create_pan_head_screw(length_scale=1.0):
+def create_pan_head_screw(length_scale=1.0, thread_series=None):
     """Create pan head screw"""
     shaft_radius = 0.13 * length_scale
     shaft_length = 0.95 * length_scale
@@ -261,16 +270,16 @@ def create_pan_head_screw(length_scale=1.0):
     head_height = 0.14 * length_scale
     
     # Shaft
-    shaft = trimesh.creation.cylinder(radius=shaft_radius, height=shaft_length, sections=16)
+    shaft = shaft_cylinder(shaft_radius, shaft_length, circle_sections(shaft_radius), thread_series)
     shaft.apply_translation([0, 0, shaft_length/2])
     
     # Pan head (cylinder with slightly larger radius)
-    head = trimesh.creation.cylinder(radius=head_radius, height=head_height, sections=16)
+    head = trimesh.creation.cylinder(radius=head_radius, height=head_height, sections=circle_sections(head_radius))
     head.apply_translation([0, 0, shaft_length + head_height/2])
     
     return trimesh.util.concatenate([shaft, head])
 
-def create_flush_head_screw(length_scale=1.0):
+def create_flush_head_screw(length_scale=1.0, thread_series=None):
     """Create countersunk/flush head screw (100 degree)"""
     shaft_radius = 0.12 * length_scale
     shaft_length = 1.0 * length_scale
@@ -278,16 +287,16 @@ def create_flush_head_screw(length_scale=1.0):
     head_height = 0.14 * length_scale
     
     # Shaft
-    shaft = trimesh.creation.cylinder(radius=shaft_radius, height=shaft_length, sections=16)
+    shaft = shaft_cylinder(shaft_radius, shaft_length, circle_sections(shaft_radius), thread_series)
     shaft.apply_translation([0, 0, shaft_length/2])
     
     # Countersunk head (cone)
-    head = trimesh.creation.cone(radius=head_radius, height=head_height, sections=16)
+    head = trimesh.creation.cone(radius=head_radius, height=head_height, sections=circle_sections(head_radius))
     head.apply_translation([0, 0, shaft_length])
     
     return trimesh.util.concatenate([shaft, head])
 
-def create_hex_head_screw(length_scale=1.0):
+def create_hex_head_screw(length_scale=1.0, thread_series=None):
     """Create hex head screw"""
     shaft_radius = 0.14 * length_scale
     shaft_length = 1.0 * length_scale
@@ -295,7 +304,7 @@ def create_hex_head_screw(length_scale=1.0):
     head_height = 0.16 * length_scale
     
     # Shaft
-    shaft = trimesh.creation.cylinder(radius=shaft_radius, height=shaft_length, sections=16)
+    shaft = shaft_cylinder(shaft_radius, shaft_length, circle_sections(shaft_radius), thread_series)
     shaft.apply_translation([0, 0, shaft_length/2])
     
     # Hex head (6 sides)
@@ -304,7 +313,7 @@ def create_hex_head_screw(length_scale=1.0):
     
     return trimesh.util.concatenate([shaft, head])
 
-def create_shoulder_screw(length_scale=1.0):
+def create_shoulder_screw(length_scale=1.0, thread_series=None):
     """Create shoulder screw"""
     shoulder_radius = 0.18 * length_scale
     shoulder_length = 0.6 * length_scale
@@ -314,31 +323,33 @@ def create_shoulder_screw(length_scale=1.0):
     head_height = 0.18 * length_scale
     
     # Socket head
-    head = trimesh.creation.cylinder(radius=head_radius, height=head_height, sections=16)
+    head = trimesh.creation.cylinder(radius=head_radius, height=head_height, sections=circle_sections(head_radius))
     head.apply_translation([0, 0, head_height/2])
     
     # Shoulder (smooth unthreaded portion)
-    shoulder = trimesh.creation.cylinder(radius=shoulder_radius, height=shoulder_length, sections=16)
+    shoulder = trimesh.creation.cylinder(radius=shoulder_radius, height=shoulder_length,
+                                         sections=circle_sections(shoulder_radius))
     shoulder.apply_translation([0, 0, head_height + shoulder_length/2])
     
     # Threaded portion
-    thread = trimesh.creation.cylinder(radius=thread_radius, height=thread_length, sections=16)
+    thread = shaft_cylinder(thread_radius, thread_length, circle_sections(thread_radius), thread_series, thread_length,
+                            tip_down=False)
     thread.apply_translation([0, 0, head_height + shoulder_length + thread_length/2])
     
     return trimesh.util.concatenate([head, shoulder, thread])
 
-def create_stud(length_scale=1.0):
+def create_stud(length_scale=1.0, thread_series=None):
     """Create threaded stud (no head, threaded both ends)"""
     radius = 0.13 * length_scale
     length = 1.2 * length_scale
     
-    # Threaded rod - simple cylinder
-    stud = trimesh.creation.cylinder(radius=radius, height=length, sections=16)
+    # Threaded rod
+    stud = shaft_cylinder(radius, length, circle_sections(radius), thread_series, length)
     stud.apply_translation([0, 0, length/2])
     
     return stud
 
-def create_twelve_point_screw(length_scale=1.0):
+def create_twelve_point_screw(length_scale=1.0, thread_series=None):
     """Create 12-point head screw"""
     shaft_radius = 0.14 * length_scale
     shaft_length = 1.0 * length_scale
@@ -346,7 +357,7 @@ def create_twelve_point_screw(length_scale=1.0):
     head_height = 0.17 * length_scale
     
     # Shaft
-    shaft = trimesh.creation.cylinder(radius=shaft_radius, height=shaft_length, sections=16)
+    shaft = shaft_cylinder(shaft_radius, shaft_length, circle_sections(shaft_radius), thread_series)
     shaft.apply_translation([0, 0, shaft_length/2])
     
     # 12-point head (12 sides)
@@ -355,7 +366,7 @@ def create_twelve_point_screw(length_scale=1.0):
     
     return trimesh.util.concatenate([shaft, head])
 
-def create_captive_screw(length_scale=1.0):
+def create_captive_screw(length_scale=1.0, thread_series=None):
     """Create captive screw with retention feature"""
     shaft_radius = 0.13 * length_scale
     shaft_length = 0.8 * length_scale
@@ -364,20 +375,21 @@ def create_captive_screw(length_scale=1.0):
     retention_radius = 0.20 * length_scale
     
     # Shaft
-    shaft = trimesh.creation.cylinder(radius=shaft_radius, height=shaft_length, sections=16)
+    shaft = shaft_cylinder(shaft_radius, shaft_length, circle_sections(shaft_radius), thread_series, tip_down=False)
     shaft.apply_translation([0, 0, shaft_length/2])
     
     # Retention ring (wider section)
-    retention = trimesh.creation.cylinder(radius=retention_radius, height=0.1 * length_scale, sections=16)
+    retention = trimesh.creation.cylinder(radius=retention_radius, height=0.1 * length_scale,
+                                          sections=circle_sections(retention_radius))
     retention.apply_translation([0, 0, shaft_length * 0.3])
     
     # Head
-    head = trimesh.creation.cylinder(radius=head_radius, height=head_height, sections=16)
+    head = trimesh.creation.cylinder(radius=head_radius, height=head_height, sections=circle_sections(head_radius))
     head.apply_translation([0, 0, -head_height/2])
     
     return trimesh.util.concatenate([head, retention, shaft])
 
-def create_relieved_body_screw(length_scale=1.0):
+def create_relieved_body_screw(length_scale=1.0, thread_series=None):
     """Create externally relieved body screw"""
     shaft_radius = 0.13 * length_scale
     relieved_radius = 0.10 * length_scale
@@ -386,15 +398,17 @@ def create_relieved_body_screw(length_scale=1.0):
     head_height = 0.15 * length_scale
     
     # Upper shaft (normal)
-    upper_shaft = trimesh.creation.cylinder(radius=shaft_radius, height=shaft_length * 0.4, sections=16)
+    upper_shaft = trimesh.creation.cylinder(radius=shaft_radius, height=shaft_length * 0.4,
+                                            sections=circle_sections(shaft_radius))
     upper_shaft.apply_translation([0, 0, shaft_length * 0.2])
     
     # Relieved section (thinner)
-    relieved = trimesh.creation.cylinder(radius=relieved_radius, height=shaft_length * 0.6, sections=16)
+    relieved = shaft_cylinder(relieved_radius, shaft_length * 0.6, circle_sections(relieved_radius), thread_series,
+                              shaft_length * 0.6, tip_down=False)
     relieved.apply_translation([0, 0, shaft_length * 0.7])
     
     # Socket head
-    head = trimesh.creation.cylinder(radius=head_radius, height=head_height, sections=16)
+    head = trimesh.creation.cylinder(radius=head_radius, height=head_height, sections=circle_sections(head_radius))
     head.apply_translation([0, 0, -head_height/2])
     
     return trimesh.util.concatenate([head, upper_shaft, relieved])
@@ -418,9 +432,16 @@ def get_material_color(part_number):
     # Steel (dark gray)
     return [0.35, 0.35, 0.40, 1.0]  # Steel gray
 
-def generate_screw_model(part_number):
+def get_thread_series(part_number):
+    """Thread table for a screw: NA series are metric, AN/MS/NAS are fine-thread inch"""
+    if part_number.upper().startswith('NA0'):
+        return 'M'
+    return 'UNF'
+
+def generate_screw_model(part_number, threaded=False):
     """Generate a unique 3D model for a screw based on its part number"""
     screw_type = classify_screw_type(part_number)
+    thread_series = get_thread_series(part_number) if threaded else None
     
     # Extract size indicator from part number (last digit/character)
     size_char = part_number[-1]
@@ -433,27 +454,27 @@ def generate_screw_model(part_number):
     # Create geometry based on type
     try:
         if screw_type == "socket_cap":
-            model = create_socket_cap_screw(length_scale)
+            model = create_socket_cap_screw(length_scale, thread_series)
         elif screw_type == "fillister":
-            model = create_fillister_head_screw(length_scale)
+            model = create_fillister_head_screw(length_scale, thread_series)
         elif screw_type == "pan_head":
-            model = create_pan_head_screw(length_scale)
+            model = create_pan_head_screw(length_scale, thread_series)
         elif screw_type == "flush_head":
-            model = create_flush_head_screw(length_scale)
+            model = create_flush_head_screw(length_scale, thread_series)
         elif screw_type == "hex_head":
-            model = create_hex_head_screw(length_scale)
+            model = create_hex_head_screw(length_scale, thread_series)
         elif screw_type == "shoulder":
-            model = create_shoulder_screw(length_scale)
+            model = create_shoulder_screw(length_scale, thread_series)
         elif screw_type == "twelve_point":
-            model = create_twelve_point_screw(length_scale)
+            model = create_twelve_point_screw(length_scale, thread_series)
         elif screw_type == "captive":
-            model = create_captive_screw(length_scale)
+            model = create_captive_screw(length_scale, thread_series)
         elif screw_type == "relieved":
-            model = create_relieved_body_screw(length_scale)
+            model = create_relieved_body_screw(length_scale, thread_series)
         elif screw_type == "stud":
-            model = create_stud(length_scale)
+            model = create_stud(length_scale, thread_series)
         else:
-            model = create_socket_cap_screw(length_scale)
+            model = create_socket_cap_screw(length_scale, thread_series)
         
         # Apply material color
         color = get_material_color(part_number)
@@ -464,9 +485,9 @@ def generate_screw_model(part_number):
     except Exception as e:
         # If model creation fails, create a simple default screw
         print(f"  Warning: Using simplified model for {part_number}: {str(e)}")
-        shaft = trimesh.creation.cylinder(radius=0.15, height=1.0 * length_scale, sections=16)
+        shaft = trimesh.creation.cylinder(radius=0.15, height=1.0 * length_scale, sections=circle_sections(0.15))
         shaft.apply_translation([0, 0, 0.5 * length_scale])
-        head = trimesh.creation.cylinder(radius=0.25, height=0.2, sections=16)
+        head = trimesh.creation.cylinder(radius=0.25, height=0.2, sections=circle_sections(0.25))
         head.apply_translation([0, 0, 1.0 * length_scale + 0.1])
         model = trimesh.util.concatenate([shaft, head])
         color = get_material_color(part_number)
@@ -485,12 +506,12 @@ def main():
     
     for i, part_number in enumerate(SCREW_PART_NUMBERS, 1):
         try:
-            model = generate_screw_model(part_number)
+            model = clean_mesh(generate_screw_model(part_number))
             
             # Save as GLB
             filename = f"{part_number.lower().replace(' ', '-')}.glb"
             filepath = output_dir / filename
-            model.export(str(filepath))
+            export_glb(model, filepath)
             
             print(f"[{i:3d}/{len(SCREW_PART_NUMBERS)}] {part_number:15s} -> {filename:25s} ({model.vertices.shape[0]:5d} verts)")
             successful += 1
@@ -3,6 +3,9 @@
 Generate TypeScript product list for all fitting models
 """
 
+from build_config import MODELS_DIR
+from model_manifest import load_manifest
+
 # All fitting part numbers
 FITTING_PART_NUMBERS = [
     "AN774", "AN775", "AN776", "AN777", "AN778", "AN779", "AN780", "AN783", "AN784", "AN785", 
@@ -87,10 +90,25 @@ def get_material(part_number):
     else:  # AN
         return "Brass"
 
-def generate_product_entry(part_number, index):
+def load_model_files(manifest):
+    """Map part numbers to content-hashed model files from the build manifest, if one exists"""
+    if not manifest:
+        return {}
+    return {pn: entry["hashed"] for pn, entry in manifest["models"].items()}
+
+def load_masses(manifest):
+    """Map part numbers to estimated mass in grams from the build manifest, if one exists"""
+    if not manifest:
+        return {}
+    return {pn: entry["mass"]["grams"] for pn, entry in manifest["models"].items() if "mass" in entry}
+
+def generate_product_entry(part_number, index, model_files=None, masses=None):
     """Generate TypeScript product object"""
     fitting_type, description = get_fitting_type_description(part_number)
     material = get_material(part_number)
+    model_file = (model_files or {}).get(part_number, f"{part_number.lower()}.glb")
+    mass = (masses or {}).get(part_number)
+    mass_line = f"\n    massGrams: {mass}," if mass is not None else ""
     
     # Create slug
     slug = part_number.lower().replace('/', '-')
@@ -102,9 +120,9 @@ def generate_product_entry(part_number, index):
     title: "{title}",
     category: "Fittings",
     partNumber: "{part_number}",
-    modelFile: "{part_number.lower()}.glb",
+    modelFile: "{model_file}",
     slug: "{slug}",
-    material: "{material}",
+    material: "{material}",{mass_line}
     threadType: "NPT",
     specification: "{part_number} - Aerospace Fitting",
     description: "{description}"
@@ -115,9 +133,12 @@ def main():
     print("// AUTO-GENERATED FITTING PRODUCTS - DO NOT EDIT MANUALLY")
     print("// Generated from generate_catalog_products.py\n")
     
+    manifest = load_manifest(MODELS_DIR)
+    model_files = load_model_files(manifest)
+    masses = load_masses(manifest)
     products = []
     for i, part_number in enumerate(FITTING_PART_NUMBERS):
-        products.append(generate_product_entry(part_number, i))
+        products.append(generate_product_entry(part_number, i, model_files, masses))
     
     print(",\n".join(products))
     print(f"\n// Total: {len(products)} fitting products")
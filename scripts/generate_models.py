@@ -4,12 +4,22 @@ Generate Simple GLTF Models for Aerospace Components
 Creates basic but realistic 3D models for bolts, nuts, fittings, and pins
 """
 
-import trimesh
-import numpy as np
+from __future__ import annotations
+
 from pathlib import Path
 
-def create_hex_bolt():
-    """Create a titanium hex bolt (NAS6204 style)"""
+import csg
+from glb_export import export_glb
+from mesh_cleanup import clean_mesh
+from threads import shaft_cylinder
+from tessellation import circle_sections
+from lazy_imports import lazy_import
+
+trimesh = lazy_import('trimesh')
+np = lazy_import('numpy')
+
+def create_hex_bolt(threaded=True):
+    """Create a titanium hex bolt (NAS6204 style) with a 1/4-28 UNF helical thread"""
     # Hex head
     hex_radius = 0.22
     hex_height = 0.19
@@ -23,28 +33,15 @@ def create_hex_bolt():
     # Shaft
     shaft_radius = 0.125
     shaft_length = 1.2
-    shaft = trimesh.creation.cylinder(
+    shaft = shaft_cylinder(
         radius=shaft_radius,
         height=shaft_length,
-        sections=32
+        sections=circle_sections(shaft_radius),
+        thread_series='UNF' if threaded else None
     )
     
-    # Thread ridges
-    threads = []
-    num_threads = 25
-    for i in range(num_threads):
-        z_pos = -0.6 + (i * 0.048)
-        thread = trimesh.creation.torus(
-            major_radius=shaft_radius,
-            minor_radius=0.012,
-            major_sections=32,
-            minor_sections=8
-        )
-        thread.apply_translation([0, 0, z_pos])
-        threads.append(thread)
-    
     # Combine all parts
-    meshes = [hex_head, shaft] + threads
+    meshes = [hex_head, shaft]
     bolt = trimesh.util.concatenate(meshes)
     
     # Apply titanium-like color
@@ -68,12 +65,12 @@ def create_self_locking_nut():
     hole = trimesh.creation.cylinder(
         radius=inner_radius,
         height=nut_height + 0.1,
-        sections=32
+        sections=circle_sections(inner_radius)
     )
     
     # Subtract hole from body (boolean difference)
     try:
-        nut = nut_body.difference(hole)
+        nut = csg.difference(nut_body, hole)
     except:
         nut = nut_body  # Fallback if boolean fails
     
@@ -85,7 +82,7 @@ def create_self_locking_nut():
         thread = trimesh.creation.torus(
             major_radius=inner_radius,
             minor_radius=0.01,
-            major_sections=32,
+            major_sections=circle_sections(inner_radius),
             minor_sections=6
         )
         thread.apply_translation([0, 0, z_pos])
@@ -121,7 +118,7 @@ def create_hydraulic_fitting():
     body_top = trimesh.creation.cylinder(
         radius=0.16,
         height=0.5,
-        sections=32
+        sections=circle_sections(0.16)
     )
     body_top.apply_translation([0, 0, 0.36])
 
@@ -129,7 +126,7 @@ def create_hydraulic_fitting():
     body_bottom = trimesh.creation.cylinder(
         radius=0.16,
         height=0.5,
-        sections=32
+        sections=circle_sections(0.16)
     )
     body_bottom.apply_translation([0, 0, -0.36])
     
@@ -137,14 +134,14 @@ def create_hydraulic_fitting():
     flare1 = trimesh.creation.cone(
         radius=0.2,
         height=0.2,
-        sections=32
+        sections=circle_sections(0.2)
     )
     flare1.apply_translation([0, 0, 0.61])
     
     flare2 = trimesh.creation.cone(
         radius=0.2,
         height=0.2,
-        sections=32
+        sections=circle_sections(0.2)
     )
     flare2.apply_transform(trimesh.transformations.rotation_matrix(np.pi, [1, 0, 0]))
     flare2.apply_translation([0, 0, -0.61])
@@ -165,7 +162,7 @@ def create_precision_pin():
     shaft = trimesh.creation.cylinder(
         radius=shaft_radius,
         height=shaft_length,
-        sections=32
+        sections=circle_sections(shaft_radius)
     )
     shaft.apply_transform(trimesh.transformations.rotation_matrix(np.pi/2, [0, 1, 0]))
     
@@ -173,7 +170,7 @@ def create_precision_pin():
     chamfer1 = trimesh.creation.cone(
         radius=shaft_radius,
         height=0.1,
-        sections=32
+        sections=circle_sections(shaft_radius)
     )
     chamfer1.apply_transform(trimesh.transformations.rotation_matrix(-np.pi/2, [0, 1, 0]))
     chamfer1.apply_translation([-0.85, 0, 0])
@@ -182,7 +179,7 @@ def create_precision_pin():
     chamfer2 = trimesh.creation.cone(
         radius=shaft_radius,
         height=0.1,
-        sections=32
+        sections=circle_sections(shaft_radius)
     )
     chamfer2.apply_transform(trimesh.transformations.rotation_matrix(np.pi/2, [0, 1, 0]))
     chamfer2.apply_translation([0.85, 0, 0])
@@ -207,7 +204,7 @@ def create_tube_coupling():
     body = trimesh.creation.cylinder(
         radius=0.18,
         height=0.9,
-        sections=32
+        sections=circle_sections(0.18)
     )
     
     # Hex grip in center
@@ -221,12 +218,12 @@ def create_tube_coupling():
     passage = trimesh.creation.cylinder(
         radius=0.13,
         height=1.0,
-        sections=32
+        sections=circle_sections(0.13)
     )
     
     # Create the coupling by subtracting the passage
     try:
-        coupling = body.difference(passage)
+        coupling = csg.difference(body, passage)
     except:
         coupling = body
     
@@ -238,15 +235,15 @@ def create_tube_coupling():
     
     return coupling
 
-def create_socket_head_screw():
-    """Create a socket head cap screw (NAS1351/1352 style)"""
+def create_socket_head_screw(threaded=True):
+    """Create a socket head cap screw (NAS1351/1352 style) with a 1/4-28 UNF helical thread"""
     # Socket head (low profile)
     head_radius = 0.21
     head_height = 0.17
     head = trimesh.creation.cylinder(
         radius=head_radius,
         height=head_height,
-        sections=32
+        sections=circle_sections(head_radius)
     )
     head.apply_translation([0, 0, 0.5])
     
@@ -261,28 +258,15 @@ def create_socket_head_screw():
     # Shaft
     shaft_radius = 0.125
     shaft_length = 1.0
-    shaft = trimesh.creation.cylinder(
+    shaft = shaft_cylinder(
         radius=shaft_radius,
         height=shaft_length,
-        sections=32
+        sections=circle_sections(shaft_radius),
+        thread_series='UNF' if threaded else None
     )
     
-    # Threads
-    threads = []
-    num_threads = 20
-    for i in range(num_threads):
-        z_pos = -0.5 + (i * 0.048)
-        thread = trimesh.creation.torus(
-            major_radius=shaft_radius,
-            minor_radius=0.010,
-            major_sections=32,
-            minor_sections=8
-        )
-        thread.apply_translation([0, 0, z_pos])
-        threads.append(thread)
-    
     # Combine
-    meshes = [head, shaft] + threads
+    meshes = [head, shaft]
     screw = trimesh.util.concatenate(meshes)
     
     # Titanium color
@@ -315,13 +299,13 @@ def create_castle_nut():
     hole = trimesh.creation.cylinder(
         radius=inner_radius,
         height=nut_height + castle_height + 0.1,
-        sections=32
+        sections=circle_sections(inner_radius)
     )
     
     # Combine
     try:
-        nut = nut_body.union(castle)
-        nut = nut.difference(hole)
+        nut = csg.union(nut_body, castle)
+        nut = csg.difference(nut, hole)
     except:
         nut = trimesh.util.concatenate([nut_body, castle])
     
@@ -343,7 +327,7 @@ def create_elbow_fitting():
         seg = trimesh.creation.cylinder(
             radius=radius,
             height=bend_radius / num_segments,
-            sections=24
+            sections=circle_sections(radius)
         )
         # Position and rotate each segment
         x = bend_radius * np.cos(angle)
@@ -356,7 +340,7 @@ def create_elbow_fitting():
     straight1 = trimesh.creation.cylinder(
         radius=radius,
         height=0.4,
-        sections=24
+        sections=circle_sections(radius)
     )
     straight1.apply_transform(trimesh.transformations.rotation_matrix(np.pi/2, [0, 1, 0]))
     straight1.apply_translation([-0.5, 0, 0])
@@ -364,7 +348,7 @@ def create_elbow_fitting():
     straight2 = trimesh.creation.cylinder(
         radius=radius,
         height=0.4,
-        sections=24
+        sections=circle_sections(radius)
     )
     straight2.apply_translation([0, 0, 0.5])
     
@@ -384,7 +368,7 @@ def create_dowel_pin():
     shaft = trimesh.creation.cylinder(
         radius=shaft_radius,
         height=shaft_length,
-        sections=32
+        sections=circle_sections(shaft_radius)
     )
     shaft.apply_transform(trimesh.transformations.rotation_matrix(np.pi/2, [0, 1, 0]))
     
@@ -392,7 +376,7 @@ def create_dowel_pin():
     end1 = trimesh.creation.cone(
         radius=shaft_radius,
         height=0.05,
-        sections=32
+        sections=circle_sections(shaft_radius)
     )
     end1.apply_transform(trimesh.transformations.rotation_matrix(-np.pi/2, [0, 1, 0]))
     end1.apply_translation([-0.275, 0, 0])
@@ -400,7 +384,7 @@ def create_dowel_pin():
     end2 = trimesh.creation.cone(
         radius=shaft_radius,
         height=0.05,
-        sections=32
+        sections=circle_sections(shaft_radius)
     )
     end2.apply_transform(trimesh.transformations.rotation_matrix(np.pi/2, [0, 1, 0]))
     end2.apply_translation([0.275, 0, 0])
@@ -422,7 +406,7 @@ def create_clevis_pin():
     shaft = trimesh.creation.cylinder(
         radius=shaft_radius,
         height=shaft_length,
-        sections=32
+        sections=circle_sections(shaft_radius)
     )
     shaft.apply_transform(trimesh.transformations.rotation_matrix(np.pi/2, [0, 1, 0]))
     
@@ -430,7 +414,7 @@ def create_clevis_pin():
     head = trimesh.creation.cylinder(
         radius=0.28,
         height=0.15,
-        sections=32
+        sections=circle_sections(0.28)
     )
     head.apply_transform(trimesh.transformations.rotation_matrix(np.pi/2, [0, 1, 0]))
     head.apply_translation([0.675, 0, 0])
@@ -439,14 +423,14 @@ def create_clevis_pin():
     hole = trimesh.creation.cylinder(
         radius=0.04,
         height=0.4,
-        sections=16
+        sections=circle_sections(0.04)
     )
     hole.apply_translation([-0.5, 0, 0])
     
     # Combine
     try:
         pin = trimesh.util.concatenate([shaft, head])
-        pin = pin.difference(hole)
+        pin = csg.difference(pin, hole)
     except:
         pin = trimesh.util.concatenate([shaft, head])
     
@@ -465,7 +449,7 @@ def create_taper_pin():
     shaft = trimesh.creation.cone(
         radius=large_radius,
         height=length,
-        sections=32
+        sections=circle_sections(large_radius)
     )
     shaft.apply_transform(trimesh.transformations.rotation_matrix(-np.pi/2, [0, 1, 0]))
     
@@ -473,7 +457,7 @@ def create_taper_pin():
     small_end = trimesh.creation.cylinder(
         radius=small_radius,
         height=0.05,
-        sections=32
+        sections=circle_sections(small_radius)
     )
     small_end.apply_transform(trimesh.transformations.rotation_matrix(np.pi/2, [0, 1, 0]))
     small_end.apply_translation([-0.425, 0, 0])
@@ -492,7 +476,7 @@ def create_straight_union():
     body = trimesh.creation.cylinder(
         radius=0.20,
         height=0.8,
-        sections=32
+        sections=circle_sections(0.20)
     )
     
     # Hex grip in center
@@ -506,14 +490,14 @@ def create_straight_union():
     sleeve1 = trimesh.creation.cylinder(
         radius=0.15,
         height=0.25,
-        sections=32
+        sections=circle_sections(0.15)
     )
     sleeve1.apply_translation([0, 0, 0.525])
     
     sleeve2 = trimesh.creation.cylinder(
         radius=0.15,
         height=0.25,
-        sections=32
+        sections=circle_sections(0.15)
     )
     sleeve2.apply_translation([0, 0, -0.525])
     
@@ -525,6 +509,26 @@ def create_straight_union():
     
     return union
 
+# Hand-tuned showcase models: (filename, create function, description)
+SHOWCASE_MODELS = [
+    ("nas6204-12.glb", create_hex_bolt, "NAS6204-12 Hex Bolt"),
+    ("nas6204-16.glb", create_hex_bolt, "NAS6204-16 Hex Bolt (same design)"),
+    ("ms21042-4.glb", create_self_locking_nut, "MS21042-4 Self-Locking Nut"),
+    ("ms21042-6.glb", create_self_locking_nut, "MS21042-6 Self-Locking Nut (same design)"),
+    ("an818-4.glb", create_hydraulic_fitting, "AN818-4 Hydraulic Fitting"),
+    ("an819-4.glb", create_tube_coupling, "AN819-4 Tube Coupling (unique)"),
+    ("ms16555-2.glb", create_precision_pin, "MS16555-2 Precision Pin"),
+    ("ms16555-4.glb", create_dowel_pin, "MS16555-4 Dowel Pin (larger)"),
+    ("nas1351-4.glb", create_socket_head_screw, "NAS1351-4 Socket Head Screw"),
+    ("nas1352-5.glb", create_socket_head_screw, "NAS1352-5 Socket Head Screw (same design)"),
+    ("ms21044-4.glb", create_self_locking_nut, "MS21044-4 Nylon Insert Lock Nut"),
+    ("an392-12.glb", create_clevis_pin, "AN392-12 Clevis Pin"),
+    ("an310-4.glb", create_castle_nut, "AN310-4 Castle Nut"),
+    ("ms21904-4.glb", create_elbow_fitting, "MS21904-4 Elbow Fitting 90°"),
+    ("an815-6.glb", create_straight_union, "AN815-6 Straight Union"),
+    ("an385-3.glb", create_taper_pin, "AN385-3 Taper Pin"),
+]
+
 def main():
     """Generate all models and save as GLB files"""
     output_dir = Path(__file__).parent.parent / "public" / "models"
@@ -532,30 +536,11 @@ def main():
     
     print("Generating 3D models...")
     
-    models = [
-        ("nas6204-12.glb", create_hex_bolt, "NAS6204-12 Hex Bolt"),
-        ("nas6204-16.glb", create_hex_bolt, "NAS6204-16 Hex Bolt (same design)"),
-        ("ms21042-4.glb", create_self_locking_nut, "MS21042-4 Self-Locking Nut"),
-        ("ms21042-6.glb", create_self_locking_nut, "MS21042-6 Self-Locking Nut (same design)"),
-        ("an818-4.glb", create_hydraulic_fitting, "AN818-4 Hydraulic Fitting"),
-        ("an819-4.glb", create_tube_coupling, "AN819-4 Tube Coupling (unique)"),
-        ("ms16555-2.glb", create_precision_pin, "MS16555-2 Precision Pin"),
-        ("ms16555-4.glb", create_dowel_pin, "MS16555-4 Dowel Pin (larger)"),
-        ("nas1351-4.glb", create_socket_head_screw, "NAS1351-4 Socket Head Screw"),
-        ("nas1352-5.glb", create_socket_head_screw, "NAS1352-5 Socket Head Screw (same design)"),
-        ("ms21044-4.glb", create_self_locking_nut, "MS21044-4 Nylon Insert Lock Nut"),
-        ("an392-12.glb", create_clevis_pin, "AN392-12 Clevis Pin"),
-        ("an310-4.glb", create_castle_nut, "AN310-4 Castle Nut"),
-        ("ms21904-4.glb", create_elbow_fitting, "MS21904-4 Elbow Fitting 90°"),
-        ("an815-6.glb", create_straight_union, "AN815-6 Straight Union"),
-        ("an385-3.glb", create_taper_pin, "AN385-3 Taper Pin"),
-    ]
-    
-    for filename, create_func, description in models:
+    for filename, create_func, description in SHOWCASE_MODELS:
         print(f"  Creating {description}...")
         try:
-            model = create_func()
-            model.export(output_dir / filename)
+            model = clean_mesh(create_func())
+            export_glb(model, output_dir / filename)
             print(f"    ✓ Saved: {filename} ({model.vertices.shape[0]} vertices)")
         except Exception as e:
             print(f"    ✗ Error: {e}")
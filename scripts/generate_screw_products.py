@@ -3,6 +3,10 @@
 Generate screw product catalog entries for TypeScript with manufacturer and type information.
 """
 
+from build_config import MODELS_DIR
+from generate_catalog_products import load_masses, load_model_files
+from model_manifest import load_manifest
+
 # Screw manufacturers
 SCREW_MANUFACTURERS = [
     "B & B Specialties",
@@ -110,10 +114,12 @@ SCREWS = [
     ("NAS184-2", "Stud, Coarse or Fine Thread", "Stud", "Drilled or Undrilled"),
 ]
 
-def generate_product_entry(part_number, title, screw_type, thread_spec):
+def generate_product_entry(part_number, title, screw_type, thread_spec, model_files=None, masses=None):
     """Generate a TypeScript product entry"""
     slug = part_number.lower().replace(' ', '-')
-    model_file = f"{slug}.glb"
+    model_file = (model_files or {}).get(part_number, f"{slug}.glb")
+    mass = (masses or {}).get(part_number)
+    mass_line = f"\n    massGrams: {mass}," if mass is not None else ""
     
     # Determine screw category
     if "Stud" in screw_type:
@@ -168,7 +174,7 @@ def generate_product_entry(part_number, title, screw_type, thread_spec):
     modelType: "screw",
     modelFile: "{model_file}",
     screwType: "{screw_category}",
-    threadSpec: "{thread_spec}",
+    threadSpec: "{thread_spec}",{mass_line}
     description: "{description}",
     specifications: [
       {{ label: "Part Number", value: "{part_number}" }},
@@ -186,8 +192,11 @@ def main():
     print("// Generated Screw Product Entries")
     print("// Total:", len(SCREWS), "screws\n")
     
+    manifest = load_manifest(MODELS_DIR)
+    model_files = load_model_files(manifest)
+    masses = load_masses(manifest)
     for i, (part_number, title, screw_type, thread_spec) in enumerate(SCREWS):
-        entry = generate_product_entry(part_number, title, screw_type, thread_spec)
+        entry = generate_product_entry(part_number, title, screw_type, thread_spec, model_files, masses)
         print(entry, end="")
         if i < len(SCREWS) - 1:
             print(",")
@@ -0,0 +1,533 @@
+#!/usr/bin/env python3
+"""
+Deterministic GLB export for generated models.
+Identical geometry always produces identical bytes: vertices and faces are
+written in a canonical order, positions are snapped to a fixed grid, the JSON
+chunk uses sorted keys and no timestamps or generator stamps are embedded.
+Vertex normals are generated with a crease angle, so vertices are only split
+where shading needs a hard edge. Single-colored meshes get one material from
+the shared palette in materials.py instead of a per-vertex color array.
+Faces covered by a detail map (a baked tangent-space normal map, such as a
+thread tile) go into a second primitive with texture coordinates and
+tangents; the image is a shared file referenced by URI (detail_filename),
+so each thread's tile is downloaded once rather than once per model.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import struct
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
+
+from lazy_imports import lazy_import
+from materials import gltf_material, material_for_color, uniform_color
+from mesh_normals import CREASE_ANGLE, crease_normals
+from model_manifest import HASH_LENGTH
+
+np = lazy_import('numpy')
+
+# Positions are snapped to this grid (inches) before being stored as float32
+POSITION_QUANTUM = 1e-6
+# Normal components are snapped to this grid so tiny float noise never changes the bytes
+NORMAL_QUANTUM = 1e-6
+# Texture coordinates are snapped to this grid
+UV_QUANTUM = 1e-6
+
+GLB_MAGIC = 0x46546C67      # b'glTF'
+GLB_VERSION = 2
+CHUNK_JSON = 0x4E4F534A     # b'JSON'
+CHUNK_BIN = 0x004E4942      # b'BIN\0'
+
+# glTF enums
+FLOAT = 5126
+UNSIGNED_BYTE = 5121
+UNSIGNED_INT = 5125
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+TRIANGLES = 4
+LINEAR = 9729
+LINEAR_MIPMAP_LINEAR = 9987
+REPEAT = 10497
+
+
+class DetailMap(NamedTuple):
+    """A tangent-space normal map laid over some of a mesh's faces."""
+    # Boolean mask over the mesh's faces
+    faces: np.ndarray
+    # (masked faces, 3, 2) texture coordinates per corner; the image repeats
+    uvs: np.ndarray
+    # PNG bytes
+    image: bytes
+    name: str
+
+
+def detail_filename(detail: DetailMap) -> str:
+    """Content-hashed image file a detail map is referenced by, e.g. thread-0.250000-0.0357143-64-v1.3f2a9c1b0d4e.png"""
+    return f"{detail.name}.{content_hash(detail.image)[:HASH_LENGTH]}.png"
+
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 hex digest of exported bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def quantize_positions(vertices: np.ndarray) -> np.ndarray:
+    """Snap positions to the export grid and return float32 without negative zeros."""
+    snapped = np.round(np.asarray(vertices, dtype=np.float64) / POSITION_QUANTUM) * POSITION_QUANTUM
+    # Adding 0.0 turns -0.0 into 0.0 so sign noise never reaches the bytes
+    return snapped.astype(np.float32) + np.float32(0.0)
+
+
+def mesh_vertex_colors(mesh) -> Optional[np.ndarray]:
+    """Per-vertex RGBA uint8 colors of a trimesh mesh, or None if uncolored."""
+    visual = getattr(mesh, 'visual', None)
+    kind = getattr(visual, 'kind', None)
+    if kind == 'vertex':
+        return np.asarray(visual.vertex_colors, dtype=np.uint8)
+    if kind == 'face':
+        # Average face colors onto vertices without trimesh's scipy path
+        face_colors = np.asarray(visual.face_colors, dtype=np.float64)
+        totals = np.zeros((len(mesh.vertices), face_colors.shape[1]))
+        counts = np.zeros(len(mesh.vertices))
+        for corner in range(3):
+            np.add.at(totals, mesh.faces[:, corner], face_colors)
+            np.add.at(counts, mesh.faces[:, corner], 1)
+        return np.round(totals / np.maximum(counts, 1)[:, None]).astype(np.uint8)
+    return None
+
+
+def quantize_normals(normals: np.ndarray) -> np.ndarray:
+    """Snap unit normals to the normal grid and return float32 without negative zeros."""
+    snapped = np.round(np.asarray(normals, dtype=np.float64) / NORMAL_QUANTUM) * NORMAL_QUANTUM
+    return snapped.astype(np.float32) + np.float32(0.0)
+
+
+def _canonical_order(positions: np.ndarray, colors: Optional[np.ndarray] = None,
+                     normals: Optional[np.ndarray] = None, texcoords: Optional[np.ndarray] = None) -> np.ndarray:
+    """Vertex order by quantized position, then normal, color and texture coordinate."""
+    grid = np.round(positions.astype(np.float64) / POSITION_QUANTUM).astype(np.int64)
+    keys = [grid[:, 2], grid[:, 1], grid[:, 0]]
+    if normals is not None:
+        normal_grid = np.round(normals.astype(np.float64) / NORMAL_QUANTUM).astype(np.int64)
+        keys = [normal_grid[:, 2], normal_grid[:, 1], normal_grid[:, 0]] + keys
+    if colors is not None:
+        keys = [colors[:, i] for i in range(colors.shape[1] - 1, -1, -1)] + keys
+    if texcoords is not None:
+        uv_grid = np.round(texcoords.astype(np.float64) / UV_QUANTUM).astype(np.int64)
+        keys = [uv_grid[:, 1], uv_grid[:, 0]] + keys
+    # np.lexsort sorts by the last key first and is stable
+    return np.lexsort(keys)
+
+
+def _canonical_faces(faces: np.ndarray, order: np.ndarray) -> np.ndarray:
+    """Reindex faces into a vertex order, rotate each to start at its smallest index and sort them."""
+    inverse = np.empty(len(order), dtype=np.int64)
+    inverse[order] = np.arange(len(order))
+    faces = inverse[faces]
+    shift = np.argmin(faces, axis=1)
+    roll = (np.arange(3)[None, :] + shift[:, None]) % 3
+    faces = np.take_along_axis(faces, roll, axis=1)
+    return faces[np.lexsort((faces[:, 2], faces[:, 1], faces[:, 0]))]
+
+
+def canonicalize(vertices: np.ndarray, faces: np.ndarray, colors: Optional[np.ndarray] = None,
+                 normals: Optional[np.ndarray] = None):
+    """
+    Reorder vertices and faces into a canonical order.
+    Vertices are sorted by quantized position (then normal, then color), each
+    face is rotated so its smallest index comes first (winding is preserved)
+    and faces are sorted lexicographically.
+    Returns (positions, faces, colors, normals).
+    """
+    positions = quantize_positions(vertices)
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    if normals is not None:
+        normals = quantize_normals(normals)
+    order = _canonical_order(positions, colors, normals)
+
+    positions = positions[order]
+    if colors is not None:
+        colors = colors[order]
+    if normals is not None:
+        normals = normals[order]
+    return positions, _canonical_faces(faces, order), colors, normals
+
+
+def uv_tangents(positions: np.ndarray, faces: np.ndarray, normals: np.ndarray,
+                texcoords: np.ndarray) -> np.ndarray:
+    """
+    glTF TANGENT attribute (xyz, w) per vertex from texture coordinate gradients.
+    The tangent follows increasing u; w makes cross(normal, tangent) * w point
+    toward decreasing v, which is +Y (up) in a glTF normal map.
+    """
+    positions = positions.astype(np.float64)
+    normals = normals.astype(np.float64)
+    corners = positions[faces]
+    uv = texcoords.astype(np.float64)[faces]
+    edge1, edge2 = corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]
+    duv1, duv2 = uv[:, 1] - uv[:, 0], uv[:, 2] - uv[:, 0]
+    det = duv1[:, 0] * duv2[:, 1] - duv2[:, 0] * duv1[:, 1]
+    scale = np.where(np.abs(det) > 1e-20, 1.0 / np.where(det == 0, 1.0, det), 0.0)[:, None]
+    face_u = (edge1 * duv2[:, 1:2] - edge2 * duv1[:, 1:2]) * scale
+    face_v = (edge2 * duv1[:, 0:1] - edge1 * duv2[:, 0:1]) * scale
+
+    along_u = np.zeros_like(positions)
+    along_v = np.zeros_like(positions)
+    for corner in range(3):
+        np.add.at(along_u, faces[:, corner], face_u)
+        np.add.at(along_v, faces[:, corner], face_v)
+
+    # Gram-Schmidt against the vertex normal
+    tangent = along_u - normals * np.einsum('ij,ij->i', normals, along_u)[:, None]
+    length = np.linalg.norm(tangent, axis=1)
+    tangent = tangent / np.maximum(length, 1e-20)[:, None]
+    handedness = np.where(np.einsum('ij,ij->i', np.cross(normals, tangent), -along_v) < 0, -1.0, 1.0)
+    return np.concatenate([quantize_normals(tangent), handedness[:, None].astype(np.float32)], axis=1)
+
+
+def _json_float(value) -> float:
+    """Exact float32 value as a Python float so JSON formatting is stable."""
+    return float(np.float32(value))
+
+
+def _pad4(data: bytes, fill: bytes = b'\x00') -> bytes:
+    return data + fill * (-len(data) % 4)
+
+
+def pack_glb(gltf: dict, binary: bytes) -> bytes:
+    """Assemble a GLB container from a glTF JSON dict and its binary buffer."""
+    json_chunk = _pad4(
+        json.dumps(gltf, sort_keys=True, separators=(',', ':'), ensure_ascii=True).encode('ascii'),
+        b' ',
+    )
+    bin_chunk = _pad4(binary)
+
+    length = 12 + 8 + len(json_chunk)
+    if bin_chunk:
+        length += 8 + len(bin_chunk)
+
+    out = [struct.pack('<III', GLB_MAGIC, GLB_VERSION, length),
+           struct.pack('<II', len(json_chunk), CHUNK_JSON), json_chunk]
+    if bin_chunk:
+        out += [struct.pack('<II', len(bin_chunk), CHUNK_BIN), bin_chunk]
+    return b''.join(out)
+
+
+def _primitive_arrays(mesh, crease_angle: Optional[float], material: Optional[str]):
+    """Canonical (positions, faces, normals, colors, material) for one mesh."""
+    face_kind = getattr(mesh.visual, 'kind', None) == 'face'
+    colors = np.asarray(mesh.visual.face_colors, dtype=np.uint8) if face_kind else mesh_vertex_colors(mesh)
+    # One color for the whole mesh becomes a palette material; mixed colors stay per vertex
+    color = uniform_color(colors)
+    if material is None and color is not None:
+        material = material_for_color(color)
+    if material is not None:
+        colors = None
+
+    if crease_angle is None:
+        if face_kind and colors is not None:
+            colors = mesh_vertex_colors(mesh)
+        positions, faces, colors, normals = canonicalize(mesh.vertices, mesh.faces, colors)
+    else:
+        vertices, faces, normals, colors = crease_normals(mesh.vertices, mesh.faces, colors,
+                                                          crease_angle, face_colors=face_kind)
+        positions, faces, colors, normals = canonicalize(vertices, faces, colors, normals)
+    return positions, faces, normals, colors, material
+
+
+def _detail_arrays(mesh, crease_angle: Optional[float], detail: DetailMap):
+    """
+    Canonical arrays for the plain faces and for the faces under a detail map:
+    ((positions, faces, normals) or None, (positions, faces, normals, texcoords, tangents)).
+    Mapped vertices are split wherever corners disagree on texture coordinates.
+    """
+    vertices, faces, normals, _ = crease_normals(mesh.vertices, mesh.faces, None,
+                                                 CREASE_ANGLE if crease_angle is None else crease_angle)
+
+    plain = None
+    plain_faces = faces[~detail.faces]
+    if len(plain_faces):
+        used, local = np.unique(plain_faces, return_inverse=True)
+        positions, local, _, plain_normals = canonicalize(vertices[used], local.reshape(-1, 3), None, normals[used])
+        plain = (positions, local, plain_normals)
+
+    mapped_faces = faces[detail.faces]
+    corner_uvs = np.round(np.asarray(detail.uvs, dtype=np.float64).reshape(-1, 2) / UV_QUANTUM) * UV_QUANTUM
+    keys = np.concatenate([mapped_faces.reshape(-1, 1),
+                           np.round(corner_uvs / UV_QUANTUM).astype(np.int64)], axis=1)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    corner_vertex = mapped_faces.ravel()[first]
+    positions = quantize_positions(vertices[corner_vertex])
+    mapped_normals = quantize_normals(normals[corner_vertex])
+    texcoords = corner_uvs[first].astype(np.float32) + np.float32(0.0)
+    order = _canonical_order(positions, None, mapped_normals, texcoords)
+    positions, mapped_normals, texcoords = positions[order], mapped_normals[order], texcoords[order]
+    local = _canonical_faces(inverse.reshape(-1, 3), order)
+    tangents = uv_tangents(positions, local, mapped_normals, texcoords)
+    return plain, (positions, local, mapped_normals, texcoords, tangents)
+
+
+class _BufferBuilder:
+    """Accumulates buffer views and accessors for one binary chunk."""
+
+    def __init__(self):
+        self.chunks = []
+        self.buffer_views = []
+        self.accessors = []
+        self.offset = 0
+
+    def add_view(self, data: bytes, target: Optional[int] = None) -> int:
+        view = {'buffer': 0, 'byteOffset': self.offset, 'byteLength': len(data)}
+        if target is not None:
+            view['target'] = target
+        self.buffer_views.append(view)
+        padded = _pad4(data)
+        self.chunks.append(padded)
+        self.offset += len(padded)
+        return len(self.buffer_views) - 1
+
+    def add_accessor(self, accessor: dict) -> int:
+        self.accessors.append(accessor)
+        return len(self.accessors) - 1
+
+    def add_float_accessor(self, values: np.ndarray, kind: str, target: Optional[int] = ARRAY_BUFFER,
+                           bounds: bool = False) -> int:
+        accessor = {
+            'bufferView': self.add_view(values.astype('<f4').tobytes(), target),
+            'componentType': FLOAT,
+            'count': int(len(values)),
+            'type': kind,
+        }
+        if bounds:
+            accessor['max'] = [_json_float(v) for v in values.max(axis=0)]
+            accessor['min'] = [_json_float(v) for v in values.min(axis=0)]
+        return self.add_accessor(accessor)
+
+    def add_primitive(self, positions, faces, normals, colors, texcoords=None, tangents=None) -> dict:
+        indices = faces.astype('<u4').ravel()
+        index_accessor = self.add_accessor({
+            'bufferView': self.add_view(indices.tobytes(), ELEMENT_ARRAY_BUFFER),
+            'componentType': UNSIGNED_INT,
+            'count': int(indices.size),
+            'type': 'SCALAR',
+            'max': [int(indices.max())],
+            'min': [int(indices.min())],
+        })
+        attributes = {'POSITION': self.add_float_accessor(positions, 'VEC3', bounds=True)}
+        if normals is not None:
+            attributes['NORMAL'] = self.add_float_accessor(normals, 'VEC3')
+        if colors is not None:
+            attributes['COLOR_0'] = self.add_accessor({
+                'bufferView': self.add_view(colors.astype(np.uint8).tobytes(), ARRAY_BUFFER),
+                'componentType': UNSIGNED_BYTE,
+                'normalized': True,
+                'count': int(len(colors)),
+                'type': 'VEC4',
+            })
+        if texcoords is not None:
+            attributes['TEXCOORD_0'] = self.add_float_accessor(texcoords, 'VEC2')
+        if tangents is not None:
+            attributes['TANGENT'] = self.add_float_accessor(tangents, 'VEC4')
+        return {'attributes': attributes, 'indices': index_accessor, 'mode': TRIANGLES}
+
+    def binary(self) -> bytes:
+        return b''.join(self.chunks)
+
+
+def _material_index(materials: list, material: Optional[str]) -> Optional[int]:
+    if material is None:
+        return None
+    if material not in materials:
+        materials.append(material)
+    return materials.index(material)
+
+
+def glb_bytes(mesh, name: str = 'geometry_0', crease_angle: Optional[float] = CREASE_ANGLE,
+              material: Optional[str] = None, detail: Optional[DetailMap] = None) -> bytes:
+    """
+    Encode a trimesh mesh as deterministic GLB bytes.
+    Normals are split across edges sharper than crease_angle degrees;
+    pass None to export positions (and colors) only. material names a
+    palette entry and defaults to the one matching a single-colored mesh.
+    detail lays a normal map over some faces; it needs a palette material.
+    """
+    if len(mesh.faces) == 0:
+        raise ValueError(f"Cannot export empty mesh '{name}'")
+    if detail is not None and not np.any(detail.faces):
+        detail = None
+
+    builder = _BufferBuilder()
+    primitives = []
+    if detail is None:
+        positions, faces, normals, colors, material = _primitive_arrays(mesh, crease_angle, material)
+        primitives.append(builder.add_primitive(positions, faces, normals, colors))
+    else:
+        if material is None:
+            raise ValueError(f"Detail maps need a palette material ('{name}')")
+        plain, mapped = _detail_arrays(mesh, crease_angle, detail)
+        if plain is not None:
+            primitives.append(builder.add_primitive(*plain, None))
+        primitives.append(builder.add_primitive(*mapped[:3], None, *mapped[3:]))
+        primitives[-1]['material'] = 1
+    if material is not None:
+        primitives[0].setdefault('material', 0)
+
+    materials = []
+    if material is not None:
+        materials.append(gltf_material(material))
+    if detail is not None:
+        detailed = gltf_material(material)
+        detailed['name'] = f"{material}_{detail.name}"
+        detailed['normalTexture'] = {'index': 0}
+        materials.append(detailed)
+        # Relative to the GLB: write_detail_map puts the file next to the models and their hashed copies
+        image = {'uri': detail_filename(detail), 'mimeType': 'image/png', 'name': detail.name}
+
+    binary = builder.binary()
+    gltf = {
+        'asset': {'version': '2.0'},
+        'scene': 0,
+        'scenes': [{'nodes': [0]}],
+        'nodes': [{'mesh': 0, 'name': name}],
+        'meshes': [{'name': name, 'primitives': primitives}],
+        'accessors': builder.accessors,
+        'bufferViews': builder.buffer_views,
+        'buffers': [{'byteLength': len(binary)}],
+    }
+    if materials:
+        gltf['materials'] = materials
+    if detail is not None:
+        gltf['images'] = [image]
+        gltf['samplers'] = [{'magFilter': LINEAR, 'minFilter': LINEAR_MIPMAP_LINEAR, 'wrapS': REPEAT, 'wrapT': REPEAT}]
+        gltf['textures'] = [{'sampler': 0, 'source': 0}]
+    return pack_glb(gltf, binary)
+
+
+def instanced_glb_bytes(base, groups, name: str = 'geometry_0', crease_angle: Optional[float] = CREASE_ANGLE,
+                        material: Optional[str] = None) -> bytes:
+    """
+    Encode a mesh split into a base mesh and instanced sub-features as GLB
+    bytes using EXT_mesh_gpu_instancing.
+    groups is a list of (prototype mesh, translations (N, 3), rotations (N, 4)
+    as x, y, z, w quaternions). base may be None when every face is instanced.
+    The extension is required, so viewers without it reject the file instead
+    of drawing each sub-feature once; serve the merged GLB to those.
+    """
+    builder = _BufferBuilder()
+    materials: list = []
+    meshes = []
+    nodes = []
+
+    if base is not None and len(base.faces):
+        positions, faces, normals, colors, base_material = _primitive_arrays(base, crease_angle, material)
+        primitive = builder.add_primitive(positions, faces, normals, colors)
+        index = _material_index(materials, base_material)
+        if index is not None:
+            primitive['material'] = index
+        meshes.append({'name': name, 'primitives': [primitive]})
+        nodes.append({'mesh': len(meshes) - 1, 'name': name})
+
+    for number, (prototype, translations, rotations) in enumerate(groups):
+        positions, faces, normals, colors, prototype_material = _primitive_arrays(prototype, crease_angle, material)
+        primitive = builder.add_primitive(positions, faces, normals, colors)
+        index = _material_index(materials, prototype_material)
+        if index is not None:
+            primitive['material'] = index
+        feature = f"{name}_feature_{number}"
+        meshes.append({'name': feature, 'primitives': [primitive]})
+        instancing = {'attributes': {
+            'TRANSLATION': builder.add_float_accessor(np.asarray(translations), 'VEC3', target=None),
+            'ROTATION': builder.add_float_accessor(np.asarray(rotations), 'VEC4', target=None),
+        }}
+        nodes.append({'mesh': len(meshes) - 1, 'name': feature,
+                      'extensions': {'EXT_mesh_gpu_instancing': instancing}})
+
+    binary = builder.binary()
+    gltf = {
+        'asset': {'version': '2.0'},
+        'extensionsUsed': ['EXT_mesh_gpu_instancing'],
+        'extensionsRequired': ['EXT_mesh_gpu_instancing'],
+        'scene': 0,
+        'scenes': [{'nodes': list(range(len(nodes)))}],
+        'nodes': nodes,
+        'meshes': meshes,
+        'accessors': builder.accessors,
+        'bufferViews': builder.buffer_views,
+        'buffers': [{'byteLength': len(binary)}],
+    }
+    if materials:
+        gltf['materials'] = [gltf_material(m) for m in materials]
+    return pack_glb(gltf, binary)
+
+
+def export_glb(mesh, output_path, name: str = 'geometry_0', crease_angle: Optional[float] = CREASE_ANGLE) -> bytes:
+    """Write a mesh to a GLB file deterministically and return the bytes written."""
+    data = glb_bytes(mesh, name=name, crease_angle=crease_angle)
+    Path(output_path).write_bytes(data)
+    return data
+
+
+def split_glb(data: bytes) -> Tuple[dict, bytes]:
+    """Split GLB bytes into the glTF JSON dict and the binary chunk."""
+    magic, version, _ = struct.unpack_from('<III', data, 0)
+    if magic != GLB_MAGIC or version != GLB_VERSION:
+        raise ValueError('Not a glTF 2.0 binary')
+    json_length, _ = struct.unpack_from('<II', data, 12)
+    gltf = json.loads(data[20:20 + json_length])
+    bin_start = 20 + json_length + 8
+    return gltf, data[bin_start:]
+
+
+def geometry_hash(data: bytes) -> str:
+    """SHA-256 of a GLB's binary chunk, equal for parts that differ only in material."""
+    return hashlib.sha256(split_glb(data)[1]).hexdigest()
+
+
+def glb_material(data: bytes) -> Optional[str]:
+    """Palette material name of a GLB written by glb_bytes, or None if it uses vertex colors."""
+    materials = split_glb(data)[0].get('materials')
+    return materials[0]['name'] if materials else None
+
+
+def read_glb(data: bytes) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """
+    Decode a GLB written by glb_bytes back into (positions, faces, colors).
+    The primitives of the first mesh are merged, and palette materials are
+    expanded back into per-vertex colors.
+    Only the layout produced by this module is supported.
+    """
+    gltf, binary = split_glb(data)
+
+    dtypes = {FLOAT: '<f4', UNSIGNED_BYTE: 'u1', UNSIGNED_INT: '<u4'}
+    widths = {'SCALAR': 1, 'VEC2': 2, 'VEC3': 3, 'VEC4': 4}
+
+    def accessor(index: int) -> np.ndarray:
+        acc = gltf['accessors'][index]
+        view = gltf['bufferViews'][acc['bufferView']]
+        array = np.frombuffer(binary, dtype=dtypes[acc['componentType']],
+                              count=acc['count'] * widths[acc['type']],
+                              offset=view['byteOffset'] + acc.get('byteOffset', 0))
+        return array.reshape(acc['count'], widths[acc['type']])
+
+    all_positions, all_faces, all_colors = [], [], []
+    offset = 0
+    for primitive in gltf['meshes'][0]['primitives']:
+        positions = accessor(primitive['attributes']['POSITION']).astype(np.float64)
+        faces = accessor(primitive['indices']).reshape(-1, 3).astype(np.int64)
+        colors = None
+        if 'COLOR_0' in primitive['attributes']:
+            colors = accessor(primitive['attributes']['COLOR_0']).copy()
+        elif 'material' in primitive:
+            factor = gltf['materials'][primitive['material']]['pbrMetallicRoughness']['baseColorFactor']
+            colors = np.tile(np.round(np.array(factor) * 255).astype(np.uint8), (len(positions), 1))
+        all_positions.append(positions)
+        all_faces.append(faces + offset)
+        all_colors.append(colors)
+        offset += len(positions)
+
+    colors = None
+    if all(c is not None for c in all_colors):
+        colors = np.concatenate(all_colors)
+    return np.concatenate(all_positions), np.concatenate(all_faces), colors
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Deferred imports for the heavy third-party modules.
+NumPy and trimesh take a quarter of a second to import, which commands that
+only read part lists, manifests or filters should not pay for. Modules bind
+them with lazy_import at the top as usual; the real import runs on the
+first attribute access, i.e. when geometry is actually built or rendered.
+Modules that use them in annotations need `from __future__ import
+annotations` so that defining a function does not count as an access.
+"""
+
+import importlib
+import importlib.util
+import sys
+import types
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """The named module, loaded on first use (or at once if already imported)."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def preload(*names: str) -> None:
+    """Finish importing these modules now, for long-lived processes that want them warm."""
+    for name in names:
+        # Any attribute access runs a pending lazy load
+        getattr(importlib.import_module(name), '__name__')
+
+
+def is_loaded(name: str) -> bool:
+    """True if the module has been imported and actually executed."""
+    module = sys.modules.get(name)
+    return module is not None and type(module) is types.ModuleType
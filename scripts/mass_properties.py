@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Volume, surface area and estimated mass for generated models.
+The material comes from each family's existing classifier (the same one
+that picks the model color) and is looked up in a density table. Area is
+measured on the cleaned mesh. A cleaned mesh that is one closed, outward
+wound shell uses the exact divergence-theorem volume; otherwise the volume
+is estimated on the primitives as built by casting a grid of rays and
+tracking how many shells each ray is inside, which counts overlapping
+regions once and tolerates holes. Model units are inches.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+import generate_all_bolts
+import generate_all_nuts
+import generate_all_pins
+import generate_all_screws
+from generate_catalog_products import get_material
+from glb_export import mesh_vertex_colors
+from lazy_imports import lazy_import
+from materials import material_for_color, uniform_color
+from mesh_cleanup import component_labels, is_closed
+
+np = lazy_import('numpy')
+
+# g/cm^3; plated and black oxide finishes are steel underneath
+DENSITY = {
+    'steel': 7.85,
+    'cadmium': 7.85,
+    'black_oxide': 7.85,
+    'cres': 7.92,
+    'a286': 7.94,
+    'titanium': 4.43,
+    'aluminum': 2.78,
+    'brass': 8.47,
+}
+
+# Family classifiers return display colors, which map onto the material palette
+COLOR_CLASSIFIERS = {
+    'bolts': generate_all_bolts.get_bolt_material_color,
+    'nuts': generate_all_nuts.get_nut_material_color,
+    'pins': generate_all_pins.get_pin_material_color,
+    'screws': generate_all_screws.get_material_color,
+}
+
+# Catalog material names used for fittings
+CATALOG_MATERIALS = {'Stainless Steel': 'cres', 'Aluminum': 'aluminum', 'Brass': 'brass'}
+
+CUBIC_INCH_CM3 = 16.387064
+# Rays cast for the overlapping/open-mesh estimate
+RAY_BUDGET = 4096
+DIGITS = 6
+
+
+def part_material(part, mesh=None) -> str:
+    """
+    Material key for a registry part.
+    Fittings follow the catalog material (their generators paint everything
+    brass); other parts follow the color they were painted with, which is
+    the family classifier's choice unless a showcase model overrides it.
+    """
+    if part.family == 'fittings':
+        return CATALOG_MATERIALS.get(get_material(part.part_number), 'steel')
+    color = uniform_color(mesh_vertex_colors(mesh)) if mesh is not None else None
+    if color is None:
+        color = COLOR_CLASSIFIERS[part.family](part.part_number)
+    return material_for_color(color)
+
+
+def surface_area(vertices: np.ndarray, faces: np.ndarray) -> float:
+    triangles = vertices[faces]
+    cross = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    return float(0.5 * np.linalg.norm(cross, axis=1).sum())
+
+
+def divergence_volume(vertices: np.ndarray, faces: np.ndarray) -> float:
+    """Exact enclosed volume of a closed, consistently wound shell; negative if it is wound inward."""
+    triangles = vertices[faces]
+    return float(np.einsum('ij,ij->i', triangles[:, 0], np.cross(triangles[:, 1], triangles[:, 2])).sum() / 6.0)
+
+
+def ray_volume(vertices: np.ndarray, faces: np.ndarray, rays: int = RAY_BUDGET) -> float:
+    """
+    Volume estimate from a grid of rays cast along z.
+    Along each ray a shell's crossings alternate between entering and
+    leaving it, whichever way its faces are wound; a ray is inside wherever
+    it is inside any shell, so overlapping shells count once and small holes
+    only affect nearby rays.
+    """
+    lower = vertices.min(axis=0)
+    extent = np.maximum(vertices.max(axis=0) - lower, 1e-9)
+    spacing = np.sqrt(extent[0] * extent[1] / rays)
+    counts = np.maximum(np.ceil(extent[:2] / spacing).astype(int), 1)
+    cell = extent[:2] / counts
+    # Rays sit slightly off cell centers so they miss the edges and vertices of symmetric geometry
+    offset = np.array([0.5137, 0.4787])
+    triangles = vertices[faces]
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    normal_z = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+    keep = np.abs(normal_z) > 1e-15
+    a, b, c, normal_z = a[keep], b[keep], c[keep], normal_z[keep]
+    shells = component_labels(faces, len(vertices))[faces[:, 0]][keep]
+    if len(a) == 0:
+        return 0.0
+
+    # Only test the rays inside each triangle's xy bounding box
+    xy = np.stack([a[:, :2], b[:, :2], c[:, :2]], axis=1)
+    first_cell = np.ceil((xy.min(axis=1) - lower[:2]) / cell - offset).astype(int).clip(0, counts - 1)
+    last_cell = np.floor((xy.max(axis=1) - lower[:2]) / cell - offset).astype(int).clip(-1, counts - 1)
+    spans = np.maximum(last_cell - first_cell + 1, 0)
+    per_triangle = spans[:, 0] * spans[:, 1]
+    tri = np.repeat(np.arange(len(a)), per_triangle)
+    local = np.arange(len(tri)) - np.repeat(np.cumsum(per_triangle) - per_triangle, per_triangle)
+    ix = first_cell[tri, 0] + local // np.maximum(spans[tri, 1], 1)
+    iy = first_cell[tri, 1] + local % np.maximum(spans[tri, 1], 1)
+    px = lower[0] + cell[0] * (ix + offset[0])
+    py = lower[1] + cell[1] * (iy + offset[1])
+
+    # Barycentric coordinates of each ray in the triangle's xy projection
+    ta, tb, tc, nz = a[tri], b[tri], c[tri], normal_z[tri]
+    u = ((tb[:, 0] - px) * (tc[:, 1] - py) - (tb[:, 1] - py) * (tc[:, 0] - px)) / nz
+    v = ((tc[:, 0] - px) * (ta[:, 1] - py) - (tc[:, 1] - py) * (ta[:, 0] - px)) / nz
+    w = 1.0 - u - v
+    hit = (u >= 0) & (v >= 0) & (w >= 0)
+    if not hit.any():
+        return 0.0
+    ray_ids = (ix * counts[1] + iy)[hit]
+    depths = (u * ta[:, 2] + v * tb[:, 2] + w * tc[:, 2])[hit]
+    shell = shells[tri][hit]
+
+    # Crossing parity per ray and shell: even crossings enter the shell, odd ones leave it
+    order = np.lexsort((depths, shell, ray_ids))
+    ray_ids, depths, shell = ray_ids[order], depths[order], shell[order]
+    starts = np.r_[True, (ray_ids[1:] != ray_ids[:-1]) | (shell[1:] != shell[:-1])]
+    rank = np.arange(len(ray_ids)) - np.maximum.accumulate(np.where(starts, np.arange(len(ray_ids)), 0))
+    deltas = np.where(rank % 2 == 0, 1, -1)
+
+    order = np.lexsort((depths, ray_ids))
+    ray_ids, depths, deltas = ray_ids[order], depths[order], deltas[order]
+
+    # Running depth per ray: global cumulative sum minus the total before each ray starts
+    running = np.cumsum(deltas)
+    first = np.r_[True, ray_ids[1:] != ray_ids[:-1]]
+    ray_start = np.maximum.accumulate(np.where(first, np.arange(len(running)), 0))
+    running -= (running - deltas)[ray_start]
+    same_ray = ray_ids[1:] == ray_ids[:-1]
+    inside = (running[:-1] > 0) & same_ray
+    length = (depths[1:] - depths[:-1])[inside].sum()
+    return float(length * cell[0] * cell[1])
+
+
+def mesh_properties(mesh, primitives=None) -> Tuple[float, float, str]:
+    """
+    (volume in^3, surface area in^2, method) for a cleaned mesh.
+    primitives is the mesh as built: culling buried faces opens the shells
+    the ray estimate counts, so it runs on the closed primitives instead.
+    """
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    faces = np.asarray(mesh.faces, dtype=np.int64)
+    area = surface_area(vertices, faces)
+    shells = np.unique(component_labels(faces, len(vertices))[faces[:, 0]])
+    # is_closed also requires consistent winding; a positive volume means it faces outward
+    if len(shells) == 1 and is_closed(faces):
+        volume = divergence_volume(vertices, faces)
+        if volume > 0:
+            return volume, area, 'exact'
+    if primitives is not None:
+        vertices = np.asarray(primitives.vertices, dtype=np.float64)
+        faces = np.asarray(primitives.faces, dtype=np.int64)
+    return ray_volume(vertices, faces), area, 'ray'
+
+
+def mass_properties(part, mesh, primitives=None) -> Dict[str, object]:
+    """Manifest record with material, volume, surface area and estimated mass of a cleaned mesh."""
+    volume, area, method = mesh_properties(mesh, primitives)
+    if volume <= 0:
+        raise ValueError(f"{part.part_number}: mesh encloses no volume ({method} estimate {volume:g} in^3)")
+    material = part_material(part, mesh)
+    grams = volume * CUBIC_INCH_CM3 * DENSITY[material]
+    return {
+        'material': material,
+        'volume': round(volume, DIGITS),
+        'area': round(area, DIGITS),
+        'grams': round(grams, 3),
+        'method': method,
+    }
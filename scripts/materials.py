@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Shared palette of glTF PBR materials for generated models.
+Generators still paint meshes with the colors picked by the family
+classifiers (get_bolt_material_color, get_nut_material_color,
+get_material_color, ...); at export each color is resolved to one palette
+entry, so a GLB carries a single material instead of an RGBA value per
+vertex and parts that differ only in finish share identical geometry.
+Base colors, metalness and roughness follow MATERIAL_PRESETS in
+src/lib/parametricModels.ts.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence
+
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
+PALETTE: Dict[str, dict] = {
+    'steel': {'color': (0.50, 0.52, 0.56), 'metallic': 0.92, 'roughness': 0.28},
+    'cres': {'color': (0.78, 0.82, 0.88), 'metallic': 0.96, 'roughness': 0.12},
+    'a286': {'color': (0.45, 0.45, 0.50), 'metallic': 0.92, 'roughness': 0.28},
+    'titanium': {'color': (0.58, 0.62, 0.68), 'metallic': 0.96, 'roughness': 0.18},
+    'cadmium': {'color': (0.72, 0.74, 0.76), 'metallic': 0.92, 'roughness': 0.18},
+    'black_oxide': {'color': (0.20, 0.20, 0.25), 'metallic': 0.70, 'roughness': 0.45},
+    'aluminum': {'color': (0.75, 0.77, 0.80), 'metallic': 0.88, 'roughness': 0.22},
+    'brass': {'color': (0.88, 0.72, 0.36), 'metallic': 0.85, 'roughness': 0.24},
+}
+
+# Colors the generators paint with, as 8-bit RGB, mapped to their finish
+COLOR_MATERIALS = {
+    # Family classifiers
+    (166, 166, 178): 'cres',
+    (153, 153, 166): 'cres',
+    (115, 115, 128): 'a286',
+    (140, 153, 166): 'titanium',
+    (51, 51, 64): 'black_oxide',
+    (191, 191, 199): 'cadmium',
+    (178, 178, 140): 'cadmium',
+    (178, 184, 191): 'aluminum',
+    (89, 89, 102): 'steel',
+    (102, 102, 115): 'steel',
+    # Showcase and fitting generators
+    (148, 158, 173): 'titanium',
+    (199, 209, 224): 'cres',
+    (191, 196, 204): 'aluminum',
+    (110, 110, 110): 'steel',
+    (133, 133, 133): 'steel',
+    (145, 145, 145): 'steel',
+    (160, 160, 160): 'steel',
+}
+
+
+def material_for_color(color: Sequence[float]) -> str:
+    """
+    Palette entry for an RGB(A) color, given as 0-255 or 0-1 components.
+    Unknown colors resolve to the nearest palette base color, which covers
+    the brass shades used across the fitting generators.
+    """
+    rgb = np.asarray(color[:3], dtype=np.float64)
+    if rgb.max() <= 1.0:
+        rgb = rgb * 255
+    rgb = np.round(rgb).astype(int)
+    known = COLOR_MATERIALS.get(tuple(int(c) for c in rgb))
+    if known is not None:
+        return known
+    names = list(PALETTE)
+    bases = np.array([PALETTE[name]['color'] for name in names]) * 255
+    return names[int(np.argmin(np.linalg.norm(bases - rgb, axis=1)))]
+
+
+def uniform_color(colors: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    """The single RGBA color shared by every row, or None if colors vary or are absent."""
+    if colors is None or len(colors) == 0:
+        return None
+    if np.all(colors == colors[0]):
+        return colors[0]
+    return None
+
+
+def gltf_material(name: str) -> dict:
+    """glTF 2.0 metallic-roughness material for a palette entry."""
+    entry = PALETTE[name]
+    return {
+        'name': name,
+        'pbrMetallicRoughness': {
+            'baseColorFactor': [*entry['color'], 1.0],
+            'metallicFactor': entry['metallic'],
+            'roughnessFactor': entry['roughness'],
+        },
+    }
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Cleanup pass run on every model before export.
+Models are assembled with trimesh.util.concatenate (heads on shafts, collars
+on nuts, hex grips on fitting bodies), which leaves duplicate seam vertices,
+zero-area triangles, back-to-back faces where primitives touch and faces
+buried inside another primitive. This pass culls faces that lie entirely
+inside another closed shell, welds vertices within a tolerance and drops
+degenerate and back-to-back faces.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from glb_export import mesh_vertex_colors
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+trimesh = lazy_import('trimesh')
+
+# Vertices closer than this (inches) are welded
+WELD_TOLERANCE = 1e-5
+# Points are pulled this fraction toward the face centroid before the inside test
+INSET = 0.02
+
+
+def component_labels(faces: np.ndarray, vertex_count: int) -> np.ndarray:
+    """Shell label per vertex, by label propagation over shared vertices."""
+    labels = np.arange(vertex_count)
+    while True:
+        face_min = labels[faces].min(axis=1)
+        updated = labels.copy()
+        np.minimum.at(updated, faces.ravel(), np.repeat(face_min, 3))
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def is_closed(faces: np.ndarray) -> bool:
+    """True when every edge is shared by exactly two faces with opposite directions."""
+    edges = np.concatenate([faces[:, [0, 1]], faces[:, [1, 2]], faces[:, [2, 0]]]).astype(np.int64)
+    # One integer key per directed edge; sorting keys is much cheaper than unique rows
+    stride = int(edges.max()) + 1 if len(edges) else 1
+    forward = np.unique(edges[:, 0] * stride + edges[:, 1])
+    backward = np.unique(edges[:, 1] * stride + edges[:, 0])
+    return len(forward) == len(edges) and np.array_equal(forward, backward)
+
+
+def weld_vertices(vertices: np.ndarray, faces: np.ndarray, colors: Optional[np.ndarray],
+                  tolerance: float = WELD_TOLERANCE):
+    """Merge vertices that share a tolerance cell (and color), returning (vertices, faces, colors)."""
+    keys = np.round(vertices / tolerance).astype(np.int64)
+    if colors is not None:
+        keys = np.concatenate([keys, colors.astype(np.int64)], axis=1)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.ravel()
+    return vertices[first], inverse[faces], (colors[first] if colors is not None else None)
+
+
+def degenerate_faces(vertices: np.ndarray, faces: np.ndarray, tolerance: float = WELD_TOLERANCE) -> np.ndarray:
+    """Mask of faces with repeated vertices or (near) zero area."""
+    repeated = (faces[:, 0] == faces[:, 1]) | (faces[:, 1] == faces[:, 2]) | (faces[:, 2] == faces[:, 0])
+    triangles = vertices[faces]
+    doubled_area = np.linalg.norm(np.cross(triangles[:, 1] - triangles[:, 0],
+                                           triangles[:, 2] - triangles[:, 0]), axis=1)
+    return repeated | (doubled_area < tolerance ** 2)
+
+
+def back_to_back_faces(faces: np.ndarray) -> np.ndarray:
+    """Mask of faces that share all three vertices with another face (touching primitives)."""
+    key = np.sort(faces, axis=1)
+    _, inverse, counts = np.unique(key, axis=0, return_inverse=True, return_counts=True)
+    return counts[inverse.ravel()] > 1
+
+
+def points_inside(points: np.ndarray, vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """Parity test of points against a closed shell, casting rays along +z."""
+    triangles = vertices[faces]
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    normal_z = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+    keep = np.abs(normal_z) > 1e-15
+    a, b, c, normal_z = a[keep], b[keep], c[keep], normal_z[keep]
+
+    crossings = np.zeros(len(points), dtype=np.int64)
+    batch = max(1, 2_000_000 // max(len(a), 1))
+    for start in range(0, len(points), batch):
+        p = points[start:start + batch, None, :]
+        u = ((b[:, 0] - p[..., 0]) * (c[:, 1] - p[..., 1]) - (b[:, 1] - p[..., 1]) * (c[:, 0] - p[..., 0])) / normal_z
+        v = ((c[:, 0] - p[..., 0]) * (a[:, 1] - p[..., 1]) - (c[:, 1] - p[..., 1]) * (a[:, 0] - p[..., 0])) / normal_z
+        w = 1.0 - u - v
+        z = u * a[:, 2] + v * b[:, 2] + w * c[:, 2]
+        crossings[start:start + batch] = ((u >= 0) & (v >= 0) & (w >= 0) & (z > p[..., 2])).sum(axis=1)
+    return crossings % 2 == 1
+
+
+def buried_faces(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """Mask of faces whose centroid and (inset) corners all lie inside another closed shell."""
+    labels = component_labels(faces, len(vertices))
+    face_labels = labels[faces[:, 0]]
+    shells = np.unique(face_labels)
+    buried = np.zeros(len(faces), dtype=bool)
+    if len(shells) < 2:
+        return buried
+
+    triangles = vertices[faces]
+    centroids = triangles.mean(axis=1)
+    # Nudge test points off the symmetry axes so rays miss shared edges and vertices
+    jitter = np.array([1.3e-7, 0.7e-7, 0.0]) * max(np.ptp(vertices, axis=0).max(), 1e-9)
+    corners = triangles + INSET * (centroids[:, None, :] - triangles)
+    for shell in shells:
+        shell_faces = faces[face_labels == shell]
+        lower = vertices[shell_faces].reshape(-1, 3).min(axis=0)
+        upper = vertices[shell_faces].reshape(-1, 3).max(axis=0)
+        candidates = np.nonzero((face_labels != shell) & ~buried
+                                & np.all((centroids >= lower) & (centroids <= upper), axis=1))[0]
+        if len(candidates) == 0 or not is_closed(shell_faces):
+            continue
+        inside = points_inside(centroids[candidates] + jitter, vertices, shell_faces)
+        candidates = candidates[inside]
+        if len(candidates) == 0:
+            continue
+        points = corners[candidates].reshape(-1, 3) + jitter
+        inside = points_inside(points, vertices, shell_faces).reshape(-1, 3).all(axis=1)
+        buried[candidates[inside]] = True
+    return buried
+
+
+def clean_mesh(mesh: trimesh.Trimesh, tolerance: float = WELD_TOLERANCE) -> trimesh.Trimesh:
+    """Return a welded copy of mesh without degenerate, back-to-back or buried faces."""
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    faces = np.asarray(mesh.faces, dtype=np.int64)
+    face_colors = None
+    vertex_colors = None
+    if getattr(mesh.visual, 'kind', None) == 'face':
+        face_colors = np.asarray(mesh.visual.face_colors, dtype=np.uint8)
+    else:
+        vertex_colors = mesh_vertex_colors(mesh)
+
+    # Buried faces are found before welding, while each primitive is still its own shell.
+    # Faces coincident with another one (copies stacked end to end, like thread turns)
+    # sit on a shell boundary rather than inside it; they go as back-to-back pairs below.
+    _, welded_faces, _ = weld_vertices(vertices, faces, None, tolerance)
+    keep = ~buried_faces(vertices, faces) | back_to_back_faces(welded_faces)
+    faces = faces[keep]
+    if face_colors is not None:
+        face_colors = face_colors[keep]
+
+    vertices, faces, vertex_colors = weld_vertices(vertices, faces, vertex_colors, tolerance)
+    drop = degenerate_faces(vertices, faces, tolerance)
+    drop[~drop] = back_to_back_faces(faces[~drop])
+    faces = faces[~drop]
+    if face_colors is not None:
+        face_colors = face_colors[~drop]
+
+    # Drop vertices no face references any more
+    used = np.unique(faces)
+    remap = np.full(len(vertices), -1, dtype=np.int64)
+    remap[used] = np.arange(len(used))
+    cleaned = trimesh.Trimesh(vertices=vertices[used], faces=remap[faces], process=False)
+    if vertex_colors is not None:
+        cleaned.visual.vertex_colors = vertex_colors[used]
+    elif face_colors is not None:
+        cleaned.visual.face_colors = face_colors
+    return cleaned
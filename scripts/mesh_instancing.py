@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Detect repeated sub-features for GPU instancing.
+Thread ridges, fitting outlets and similar features are built by copying
+one primitive and transforming it before trimesh.util.concatenate, so each
+copy keeps the prototype's vertex order and face topology. Shells with the
+same topology are compared with a least-squares rigid fit (Kabsch); copies
+that match within tolerance become instances of a single prototype.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+from glb_export import mesh_vertex_colors
+from lazy_imports import lazy_import
+from mesh_cleanup import component_labels
+
+np = lazy_import('numpy')
+trimesh = lazy_import('trimesh')
+
+# Fewer copies than this are not worth a separate instanced mesh
+MIN_INSTANCES = 4
+# Largest vertex deviation (inches) for a copy to count as an instance
+FIT_TOLERANCE = 1e-5
+TRANSFORM_DIGITS = 7
+
+
+def rigid_fit(source: np.ndarray, target: np.ndarray) -> Tuple[np.ndarray, np.ndarray, float]:
+    """Rotation and translation mapping source onto target, with the largest residual."""
+    source_center = source.mean(axis=0)
+    target_center = target.mean(axis=0)
+    covariance = (source - source_center).T @ (target - target_center)
+    u, _, vt = np.linalg.svd(covariance)
+    # Never return a reflection
+    flip = np.diag([1.0, 1.0, np.sign(np.linalg.det(vt.T @ u.T)) or 1.0])
+    rotation = vt.T @ flip @ u.T
+    translation = target_center - rotation @ source_center
+    residual = np.linalg.norm(source @ rotation.T + translation - target, axis=1).max()
+    return rotation, translation, float(residual)
+
+
+def rotation_quaternion(rotation: np.ndarray) -> np.ndarray:
+    """Unit quaternion (x, y, z, w) of a rotation matrix, with w >= 0."""
+    m = rotation
+    trace = np.trace(m)
+    if trace > 0:
+        s = 2 * np.sqrt(trace + 1)
+        q = [(m[2, 1] - m[1, 2]) / s, (m[0, 2] - m[2, 0]) / s, (m[1, 0] - m[0, 1]) / s, s / 4]
+    elif m[0, 0] > m[1, 1] and m[0, 0] > m[2, 2]:
+        s = 2 * np.sqrt(1 + m[0, 0] - m[1, 1] - m[2, 2])
+        q = [s / 4, (m[0, 1] + m[1, 0]) / s, (m[0, 2] + m[2, 0]) / s, (m[2, 1] - m[1, 2]) / s]
+    elif m[1, 1] > m[2, 2]:
+        s = 2 * np.sqrt(1 + m[1, 1] - m[0, 0] - m[2, 2])
+        q = [(m[0, 1] + m[1, 0]) / s, s / 4, (m[1, 2] + m[2, 1]) / s, (m[0, 2] - m[2, 0]) / s]
+    else:
+        s = 2 * np.sqrt(1 + m[2, 2] - m[0, 0] - m[1, 1])
+        q = [(m[0, 2] + m[2, 0]) / s, (m[1, 2] + m[2, 1]) / s, s / 4, (m[1, 0] - m[0, 1]) / s]
+    q = np.array(q) / np.linalg.norm(q)
+    return q if q[3] >= 0 else -q
+
+
+def _submesh(vertices: np.ndarray, faces: np.ndarray, colors: Optional[np.ndarray]) -> trimesh.Trimesh:
+    used = np.unique(faces)
+    remap = np.full(len(vertices), -1, dtype=np.int64)
+    remap[used] = np.arange(len(used))
+    mesh = trimesh.Trimesh(vertices=vertices[used], faces=remap[faces], process=False)
+    if colors is not None:
+        mesh.visual.vertex_colors = colors[used]
+    return mesh
+
+
+def find_instances(mesh, min_count: int = MIN_INSTANCES, tolerance: float = FIT_TOLERANCE):
+    """
+    Split mesh into (base mesh or None, groups), where each group is
+    (prototype mesh, translations (N, 3), rotations (N, 4)) ready for
+    glb_export.instanced_glb_bytes. groups is empty when nothing repeats.
+    """
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    faces = np.asarray(mesh.faces, dtype=np.int64)
+    colors = mesh_vertex_colors(mesh)
+    face_labels = component_labels(faces, len(vertices))[faces[:, 0]]
+
+    # Bucket shells by topology: vertex count plus faces in shell-local indices
+    shells = {}
+    for label in np.unique(face_labels):
+        shell_faces = faces[face_labels == label]
+        shell_vertices = np.unique(shell_faces)
+        local = np.searchsorted(shell_vertices, shell_faces)
+        key = (len(shell_vertices), local.tobytes())
+        shells.setdefault(key, []).append((label, shell_vertices, shell_faces))
+
+    groups: List[Tuple[trimesh.Trimesh, np.ndarray, np.ndarray]] = []
+    instanced = np.zeros(len(faces), dtype=bool)
+    for members in shells.values():
+        if len(members) < min_count:
+            continue
+        _, reference_vertices, reference_faces = members[0]
+        reference = vertices[reference_vertices]
+        matches = []
+        for label, shell_vertices, _ in members:
+            if colors is not None and not np.array_equal(colors[shell_vertices], colors[reference_vertices]):
+                continue
+            rotation, translation, residual = rigid_fit(reference, vertices[shell_vertices])
+            if residual <= tolerance:
+                matches.append((translation, rotation_quaternion(rotation), label))
+        if len(matches) < min_count:
+            continue
+
+        # Instances in a stable order so output bytes do not depend on build order
+        translations = np.round(np.array([m[0] for m in matches]), TRANSFORM_DIGITS) + 0.0
+        rotations = np.round(np.array([m[1] for m in matches]), TRANSFORM_DIGITS) + 0.0
+        order = np.lexsort(np.concatenate([rotations, translations], axis=1).T[::-1])
+        groups.append((_submesh(vertices, reference_faces, colors), translations[order], rotations[order]))
+        instanced |= np.isin(face_labels, [m[2] for m in matches])
+
+    if not groups:
+        return mesh, []
+    base = _submesh(vertices, faces[~instanced], colors) if not instanced.all() else None
+    return base, groups
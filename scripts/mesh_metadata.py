@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Viewer metadata for generated models.
+Bounds and camera placement the site can use before the GLB is parsed, plus canonical z-up orientation.
+"""
+
+from __future__ import annotations
+
+from typing import Dict
+
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
+# Vertical field of view used by the site's PerspectiveCamera (degrees)
+VIEWER_FOV = 35.0
+# Extra room around the bounding sphere when fitting the camera
+CAMERA_MARGIN = 1.15
+DIGITS = 6
+
+
+def _rounded(values) -> list:
+    # Adding 0.0 drops negative zeros so the manifest stays byte-stable
+    return [round(float(v), DIGITS) + 0.0 for v in values]
+
+
+def principal_axis(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """
+    Unit axis of the part, from the area-weighted covariance of the surface.
+    The eigenvector whose eigenvalue stands furthest from the other two is
+    used, which is the shaft of a bolt or pin and the bore of a nut or washer.
+    """
+    triangles = vertices[faces]
+    areas = 0.5 * np.linalg.norm(np.cross(triangles[:, 1] - triangles[:, 0],
+                                          triangles[:, 2] - triangles[:, 0]), axis=1)
+    centroids = triangles.mean(axis=1)
+    weights = areas / max(areas.sum(), 1e-12)
+    mean = weights @ centroids
+    offsets = centroids - mean
+    covariance = (offsets * weights[:, None]).T @ offsets
+    values, vectors = np.linalg.eigh(covariance)
+    axis = vectors[:, 2] if values[2] - values[1] >= values[1] - values[0] else vectors[:, 0]
+    # Make the largest component positive so the sign is deterministic
+    return axis if axis[np.argmax(np.abs(axis))] > 0 else -axis
+
+
+def viewer_metadata(mesh, fov: float = VIEWER_FOV) -> Dict[str, object]:
+    """Camera-fitting metadata for one mesh."""
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    faces = np.asarray(mesh.faces, dtype=np.int64)
+    lower = vertices.min(axis=0)
+    upper = vertices.max(axis=0)
+    center = (lower + upper) / 2
+    radius = float(np.linalg.norm(vertices - center, axis=1).max())
+    distance = radius * CAMERA_MARGIN / np.sin(np.radians(fov) / 2)
+    return {
+        'aabb': {'min': _rounded(lower), 'max': _rounded(upper)},
+        'sphere': {'center': _rounded(center), 'radius': round(radius, DIGITS)},
+        'principalAxis': _rounded(principal_axis(vertices, faces)),
+        'cameraDistance': round(float(distance), DIGITS),
+        'fov': fov,
+    }
+
+
+def canonical_rotation(mesh) -> np.ndarray:
+    """
+    4x4 rotation that turns the coordinate axis nearest the principal axis
+    onto +z. Only quarter turns are used, so positions stay on the export grid.
+    """
+    axis = principal_axis(np.asarray(mesh.vertices, dtype=np.float64), np.asarray(mesh.faces))
+    nearest = int(np.argmax(np.abs(axis)))
+    matrix = np.eye(4)
+    if nearest == 0:
+        # x -> z, z -> -x (quarter turn about y)
+        matrix[:3, :3] = [[0, 0, -1], [0, 1, 0], [1, 0, 0]]
+    elif nearest == 1:
+        # y -> z, z -> -y (quarter turn about x)
+        matrix[:3, :3] = [[1, 0, 0], [0, 0, -1], [0, 1, 0]]
+    return matrix
+
+
+def normalize_orientation(mesh):
+    """Rotate a mesh in place so its principal axis runs along z."""
+    matrix = canonical_rotation(mesh)
+    if not np.array_equal(matrix, np.eye(4)):
+        mesh.apply_transform(matrix)
+    return mesh
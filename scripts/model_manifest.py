@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Build manifest for generated models.
+Maps each part number to its content-hashed filename and build metadata in models-manifest.json.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+MANIFEST_NAME = 'models-manifest.json'
+MANIFEST_VERSION = 1
+
+# Content-hashed copies live here, relative to the models directory
+HASHED_DIR = 'hashed'
+HASH_LENGTH = 12
+# Precompressed siblings written by compress_assets.py
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+
+
+def hashed_filename(filename: str, digest: str) -> str:
+    """Immutable filename for a model, e.g. hashed/an815-6.3f2a9c1b0d4e.glb"""
+    stem, ext = filename.rsplit('.', 1)
+    return f"{HASHED_DIR}/{stem}.{digest[:HASH_LENGTH]}.{ext}"
+
+
+def manifest_entry(part, mesh, data: bytes, canonical: bool = False,
+                   mass: Optional[dict] = None, instanced: Optional[bytes] = None,
+                   fingerprint: Optional[str] = None, detail_map: Optional[str] = None) -> dict:
+    """
+    Manifest record for one built part.
+    'geometry' hashes only the binary chunk, so parts that differ only in
+    finish share it and can be deduplicated. 'instanced' points at the
+    EXT_mesh_gpu_instancing variant; 'file' and 'hashed' stay the merged
+    fallback for viewers without the extension. 'fingerprint' identifies
+    the sources and settings the part was built from (see fingerprints.py).
+    'detailMap' names the shared normal map image the GLB references.
+    """
+    # Imported here so manifest readers (deploy, compression, catalog scripts) stay free of NumPy
+    from glb_export import content_hash, geometry_hash, glb_material
+    from mesh_metadata import viewer_metadata
+    digest = content_hash(data)
+    viewer = viewer_metadata(mesh)
+    viewer['orientation'] = 'canonical' if canonical else 'native'
+    entry = {
+        'family': part.family,
+        'file': part.filename,
+        'hashed': hashed_filename(part.filename, digest),
+        'sha256': digest,
+        'bytes': len(data),
+        'geometry': geometry_hash(data),
+        'material': glb_material(data),
+        'vertices': int(len(mesh.vertices)),
+        'triangles': int(len(mesh.faces)),
+        'viewer': viewer,
+    }
+    if mass is not None:
+        entry['mass'] = mass
+    if fingerprint is not None:
+        entry['fingerprint'] = fingerprint
+    if detail_map is not None:
+        entry['detailMap'] = detail_map
+    if instanced is not None:
+        instanced_digest = content_hash(instanced)
+        entry['instanced'] = {
+            'file': hashed_filename(part.filename.replace('.glb', '.instanced.glb'), instanced_digest),
+            'sha256': instanced_digest,
+            'bytes': len(instanced),
+        }
+    return entry
+
+
+def manifest_json(models: Dict[str, dict], profile: Optional[dict] = None,
+                  fingerprints: Optional[Dict[str, str]] = None) -> str:
+    """Serialize a manifest with stable key order so it hashes reproducibly."""
+    manifest = {'version': MANIFEST_VERSION, 'models': models}
+    if profile is not None:
+        manifest['profile'] = profile
+    if fingerprints is not None:
+        manifest['fingerprints'] = fingerprints
+    return json.dumps(manifest, indent=2, sort_keys=True) + '\n'
+
+
+def write_manifest(models_dir: Path, models: Dict[str, dict], profile: Optional[dict] = None,
+                   fingerprints: Optional[Dict[str, str]] = None) -> Path:
+    """Write models-manifest.json into the models directory, unless it already holds the same manifest."""
+    path = Path(models_dir) / MANIFEST_NAME
+    text = manifest_json(models, profile, fingerprints)
+    if not path.exists() or path.read_text() != text:
+        path.write_text(text)
+        remove_compressed(path)
+    return path
+
+
+def load_manifest(path) -> Optional[dict]:
+    """Load a manifest file or directory, returning None if it does not exist."""
+    path = Path(path)
+    if path.is_dir():
+        path = path / MANIFEST_NAME
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def write_hashed_copies(models_dir: Path, models: Dict[str, dict]) -> int:
+    """
+    Emit a content-hashed copy of every model next to the manifest.
+    Copies that already exist are left alone (same name means same bytes) and
+    hashed files and detail maps no longer referenced by the manifest are
+    removed. Returns the number of copies written.
+    """
+    models_dir = Path(models_dir)
+    hashed_dir = models_dir / HASHED_DIR
+    hashed_dir.mkdir(parents=True, exist_ok=True)
+
+    written = 0
+    for entry in models.values():
+        target = models_dir / entry['hashed']
+        if not target.exists():
+            target.write_bytes((models_dir / entry['file']).read_bytes())
+            written += 1
+
+    referenced = {Path(entry['hashed']).name for entry in models.values()}
+    referenced |= {Path(entry['instanced']['file']).name for entry in models.values() if 'instanced' in entry}
+    remove_unreferenced(hashed_dir, '*.glb', referenced)
+    detail_maps = {entry['detailMap'] for entry in models.values() if 'detailMap' in entry}
+    for directory in (models_dir, hashed_dir):
+        remove_unreferenced(directory, '*.png', detail_maps)
+
+    return written
+
+
+def write_detail_map(models_dir: Path, filename: str, image: bytes) -> None:
+    """
+    Write a shared detail map image next to the models and next to their
+    hashed copies, as GLBs in both places reference it by a relative name.
+    """
+    for target in (Path(models_dir) / filename, Path(models_dir) / HASHED_DIR / filename):
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(image)
+
+
+def remove_compressed(path: Path) -> None:
+    """Delete the .gz/.br siblings of a file that was just rewritten; compress_assets.py makes new ones."""
+    for suffix in COMPRESSED_SUFFIXES:
+        Path(str(path) + suffix).unlink(missing_ok=True)
+
+
+def remove_unreferenced(directory: Path, pattern: str, referenced: Set[str]) -> None:
+    """Delete files matching pattern whose names are not referenced, along with their .gz/.br siblings."""
+    for suffix in ('',) + COMPRESSED_SUFFIXES:
+        for path in directory.glob(pattern + suffix):
+            if path.name[:len(path.name) - len(suffix)] not in referenced:
+                path.unlink()
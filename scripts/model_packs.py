@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Per-category model packs.
+Concatenates every GLB of a family into one content-hashed binary bundle
+and writes a small JSON index with the byte offset and length of each part.
+Each entry is an unmodified GLB, so the site can fetch a whole category in
+one request or a single part with an HTTP range request:
+
+    Range: bytes=<offset>-<offset + length - 1>
+
+Usage:
+    python scripts/model_packs.py [models_dir]
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Dict
+
+from build_config import MODELS_DIR
+from model_manifest import HASH_LENGTH, HASHED_DIR, load_manifest, remove_compressed, remove_unreferenced
+
+PACKS_DIR = 'packs'
+PACK_PREFIX = 'pack-'
+
+
+def build_pack(models_dir: Path, family: str, entries: Dict[str, dict]) -> dict:
+    """Write one family's bundle and return its index."""
+    chunks = []
+    parts = {}
+    offset = 0
+    for part_number in sorted(entries):
+        data = (models_dir / entries[part_number]['file']).read_bytes()
+        parts[part_number] = {'offset': offset, 'length': len(data)}
+        chunks.append(data)
+        offset += len(data)
+
+    bundle = b''.join(chunks)
+    digest = hashlib.sha256(bundle).hexdigest()
+    filename = f"{HASHED_DIR}/{PACK_PREFIX}{family}.{digest[:HASH_LENGTH]}.bin"
+    target = models_dir / filename
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if not target.exists():
+        target.write_bytes(bundle)
+
+    return {'family': family, 'file': filename, 'bytes': len(bundle), 'sha256': digest, 'parts': parts}
+
+
+def build_packs(models_dir: Path) -> Dict[str, dict]:
+    """Write a pack and index for every family in the manifest."""
+    models_dir = Path(models_dir)
+    manifest = load_manifest(models_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No manifest in {models_dir}; run build_models.py build first")
+
+    by_family: Dict[str, Dict[str, dict]] = {}
+    for part_number, entry in manifest['models'].items():
+        by_family.setdefault(entry['family'], {})[part_number] = entry
+
+    index_dir = models_dir / PACKS_DIR
+    index_dir.mkdir(parents=True, exist_ok=True)
+    indexes = {}
+    for family in sorted(by_family):
+        index = build_pack(models_dir, family, by_family[family])
+        index_path = index_dir / f"{family}.json"
+        text = json.dumps(index, indent=2, sort_keys=True) + '\n'
+        if not index_path.exists() or index_path.read_text() != text:
+            index_path.write_text(text)
+            remove_compressed(index_path)
+        indexes[family] = index
+
+    # Drop bundles from earlier builds that no index references any more
+    referenced = {Path(index['file']).name for index in indexes.values()}
+    remove_unreferenced(models_dir / HASHED_DIR, f"{PACK_PREFIX}*.bin", referenced)
+
+    return indexes
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Bundle each family of models into one pack.')
+    parser.add_argument('models_dir', nargs='?', default=str(MODELS_DIR))
+    args = parser.parse_args(argv)
+
+    for family, index in build_packs(Path(args.models_dir)).items():
+        print(f"{family:10s} {len(index['parts']):5d} parts  {index['bytes'] / 1024:8.1f}KB  -> {index['file']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Registry of every generated model across the family scripts.
+Collects the part number lists from generate_all_*.py and the showcase
+models from generate_models.py into one ordered list of parts, and
+resolves build filters (part-number glob or regex, family, shape type,
+generator function) against it without building any geometry.
+"""
+
+import fnmatch
+import re
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import generate_all_bolts
+import generate_all_fittings
+import generate_all_nuts
+import generate_all_pins
+import generate_all_screws
+import generate_models
+
+FAMILIES = ['bolts', 'nuts', 'screws', 'pins', 'fittings']
+
+# Families whose build functions accept threaded=True for helical threads
+THREADED_FAMILIES = ('bolts', 'screws')
+
+# Catalog family for each hand-tuned showcase model generator
+SHOWCASE_FAMILIES = {
+    'create_hex_bolt': 'bolts',
+    'create_self_locking_nut': 'nuts',
+    'create_castle_nut': 'nuts',
+    'create_hydraulic_fitting': 'fittings',
+    'create_tube_coupling': 'fittings',
+    'create_elbow_fitting': 'fittings',
+    'create_straight_union': 'fittings',
+    'create_precision_pin': 'pins',
+    'create_dowel_pin': 'pins',
+    'create_clevis_pin': 'pins',
+    'create_taper_pin': 'pins',
+    'create_socket_head_screw': 'screws',
+}
+
+
+# Shape classifier for each family, as used by its build function
+SHAPE_CLASSIFIERS = {
+    'bolts': generate_all_bolts.classify_bolt_type,
+    'nuts': generate_all_nuts.get_nut_type,
+    'screws': generate_all_screws.classify_screw_type,
+    'pins': generate_all_pins.get_pin_type,
+    'fittings': generate_all_fittings.get_fitting_type,
+}
+# Shape type reported for the hand-tuned showcase models
+SHOWCASE_SHAPE = 'showcase'
+
+# The create_* function each shape type is built with, following the dispatch in
+# build_bolt_model, build_nut_model, generate_screw_model, build_pin_model and
+# generate_fitting_model; None holds each family's fallthrough default
+SHAPE_GENERATORS = {
+    'bolts': {
+        'hex_head': generate_all_bolts.create_hex_head_bolt,
+        'twelve_point': generate_all_bolts.create_twelve_point_bolt,
+        'flush_head': generate_all_bolts.create_flush_head_bolt,
+        'pan_head': generate_all_bolts.create_pan_head_bolt,
+        'carriage': generate_all_bolts.create_carriage_bolt,
+        'flange': generate_all_bolts.create_flange_bolt,
+        'eye': generate_all_bolts.create_eye_bolt,
+        'clevis': generate_all_bolts.create_clevis_bolt,
+        'anchor': generate_all_bolts.create_anchor_bolt,
+        'hanger': generate_all_bolts.create_hanger_bolt,
+        None: generate_all_bolts.create_hex_head_bolt,
+    },
+    'nuts': {
+        'castle': generate_all_nuts.create_castle_nut,
+        'locknut': generate_all_nuts.create_locknut,
+        'wing': generate_all_nuts.create_wing_nut,
+        'flange': generate_all_nuts.create_flange_nut,
+        'square': generate_all_nuts.create_square_nut,
+        'jam': generate_all_nuts.create_jam_nut,
+        'slotted': generate_all_nuts.create_slotted_nut,
+        'acorn': generate_all_nuts.create_acorn_nut,
+        'coupling': generate_all_nuts.create_coupling_nut,
+        None: generate_all_nuts.create_hex_nut,
+    },
+    'screws': {
+        'socket_cap': generate_all_screws.create_socket_cap_screw,
+        'fillister': generate_all_screws.create_fillister_head_screw,
+        'pan_head': generate_all_screws.create_pan_head_screw,
+        'flush_head': generate_all_screws.create_flush_head_screw,
+        'hex_head': generate_all_screws.create_hex_head_screw,
+        'shoulder': generate_all_screws.create_shoulder_screw,
+        'twelve_point': generate_all_screws.create_twelve_point_screw,
+        'captive': generate_all_screws.create_captive_screw,
+        'relieved': generate_all_screws.create_relieved_body_screw,
+        'stud': generate_all_screws.create_stud,
+        None: generate_all_screws.create_socket_cap_screw,
+    },
+    'pins': {
+        'cotter': generate_all_pins.create_cotter_pin,
+        'spring': generate_all_pins.create_spring_pin,
+        'clevis': generate_all_pins.create_clevis_pin,
+        None: generate_all_pins.create_dowel_pin,
+    },
+    'fittings': {
+        'straight': generate_all_fittings.create_straight_fitting,
+        'elbow_90': generate_all_fittings.create_elbow_fitting,
+        'elbow_45': generate_all_fittings.create_elbow_fitting,
+        'tee': generate_all_fittings.create_tee_fitting,
+        'cross': generate_all_fittings.create_cross_fitting,
+        'reducer': generate_all_fittings.create_reducer_fitting,
+        'bulkhead': generate_all_fittings.create_bulkhead_fitting,
+        'cap': generate_all_fittings.create_cap_fitting,
+        None: generate_all_fittings.create_adapter_fitting,
+    },
+}
+
+
+class Part(NamedTuple):
+    """A single buildable model."""
+    part_number: str
+    family: str
+    filename: str
+    build: Callable[..., Tuple[object, Optional[str]]]
+
+
+def _build_screw(part_number: str, threaded: bool = False):
+    return generate_all_screws.generate_screw_model(part_number, threaded), None
+
+
+def _build_fitting(part_number: str):
+    return generate_all_fittings.generate_fitting_model(part_number), None
+
+
+def _showcase_generator(part_number: str) -> Callable:
+    filename = f"{part_number.lower()}.glb"
+    for showcase_filename, create_func, _ in generate_models.SHOWCASE_MODELS:
+        if showcase_filename == filename:
+            return create_func
+    raise KeyError(f"Unknown showcase model: {part_number}")
+
+
+def _build_showcase(part_number: str, threaded: bool = False):
+    # The showcase bolt and screw always carry their helical threads, which thread maps leave alone
+    return _showcase_generator(part_number)(), None
+
+
+def _slug(part_number: str) -> str:
+    return part_number.lower().replace('/', '-')
+
+
+def _add(parts: Dict[str, Part], part: Part) -> None:
+    # Re-insert so an overriding part takes the later build position
+    parts.pop(part.filename, None)
+    parts[part.filename] = part
+
+
+def all_parts() -> List[Part]:
+    """
+    Every part in build order.
+    Showcase models come first; a family script that generates the same
+    filename takes precedence, matching the order the scripts were run in.
+    """
+    parts: Dict[str, Part] = {}
+
+    for filename, create_func, _ in generate_models.SHOWCASE_MODELS:
+        part_number = filename[:-len('.glb')].upper()
+        family = SHOWCASE_FAMILIES[create_func.__name__]
+        _add(parts, Part(part_number, family, filename, _build_showcase))
+
+    for pn in generate_all_bolts.bolt_part_numbers:
+        _add(parts, Part(pn, 'bolts', f"{_slug(pn)}.glb", generate_all_bolts.build_bolt_model))
+    for pn in generate_all_nuts.nut_part_numbers:
+        _add(parts, Part(pn, 'nuts', f"{_slug(pn)}.glb", generate_all_nuts.build_nut_model))
+    for pn in generate_all_screws.SCREW_PART_NUMBERS:
+        _add(parts, Part(pn, 'screws', f"{pn.lower().replace(' ', '-')}.glb", _build_screw))
+    for pn in generate_all_pins.pin_part_numbers:
+        _add(parts, Part(pn, 'pins', f"{_slug(pn)}.glb", generate_all_pins.build_pin_model))
+    for pn in generate_all_fittings.FITTING_PART_NUMBERS:
+        _add(parts, Part(pn, 'fittings', f"{pn.lower()}.glb", _build_fitting))
+
+    return list(parts.values())
+
+
+def part_shape(part: Part) -> str:
+    """Shape type of a part from its family classifier, e.g. 'flush_head' or 'castle'."""
+    if part.build is _build_showcase:
+        return SHOWCASE_SHAPE
+    return SHAPE_CLASSIFIERS[part.family](part.part_number)
+
+
+def part_generator(part: Part) -> Callable:
+    """The create_* function that builds a part's geometry."""
+    if part.build is _build_showcase:
+        return _showcase_generator(part.part_number)
+    generators = SHAPE_GENERATORS[part.family]
+    return generators.get(part_shape(part), generators[None])
+
+
+def _check_names(kind: str, requested: Iterable[str], known: Iterable[str]) -> None:
+    unknown = sorted(set(requested) - set(known))
+    if unknown:
+        raise ValueError(f"Unknown {kind}: {', '.join(unknown)} (choose from {', '.join(sorted(set(known)))})")
+
+
+def select_parts(parts: List[Part], patterns: Optional[List[str]] = None, regex: Optional[str] = None,
+                 families: Optional[List[str]] = None, shapes: Optional[List[str]] = None,
+                 generators: Optional[List[str]] = None) -> List[Part]:
+    """
+    Parts matching every filter given, in registry order. Within a filter
+    any value may match: patterns are case-insensitive part-number globs
+    ('MS21042-*'), regex is searched in the part number, shapes are
+    classifier types ('flush_head') and generators are create_* function
+    names. Unknown family, shape or generator names raise ValueError, so
+    a typo fails before any geometry is built.
+    """
+    if families:
+        _check_names('family', families, FAMILIES)
+    if shapes:
+        known = {SHOWCASE_SHAPE} | {shape for table in SHAPE_GENERATORS.values() for shape in table if shape}
+        known |= {part_shape(part) for part in parts}
+        _check_names('shape type', shapes, known)
+    if generators:
+        known = {create.__name__ for table in SHAPE_GENERATORS.values() for create in table.values()}
+        known |= {create.__name__ for _, create, _ in generate_models.SHOWCASE_MODELS}
+        _check_names('generator', generators, known)
+    pattern = re.compile(regex, re.IGNORECASE) if regex else None
+
+    selected = []
+    for part in parts:
+        if patterns and not any(fnmatch.fnmatchcase(part.part_number.upper(), glob.upper()) for glob in patterns):
+            continue
+        if pattern is not None and not pattern.search(part.part_number):
+            continue
+        if families and part.family not in families:
+            continue
+        if shapes and part_shape(part) not in shapes:
+            continue
+        if generators and part_generator(part).__name__ not in generators:
+            continue
+        selected.append(part)
+    return selected
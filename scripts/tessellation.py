@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tessellation sized to the part.
+A circle drawn with n straight sections sags r * (1 - cos(pi / n)) between
+vertices, so a fixed section count wastes triangles on a 1/16" dowel and
+looks faceted on a 3/4" bolt. Generators ask circle_sections for the count
+that keeps the sag of a circle of the real radius (inches) within
+CHORD_TOLERANCE, divided by the global quality knob: quality 2 halves the
+allowed sag, 0.5 doubles it. Hexagonal prisms keep sections=6; they are the
+shape, not an approximation of one.
+"""
+
+import math
+
+# Largest chord sag (inches) at quality 1.0; keeps the catalog near its old triangle total
+CHORD_TOLERANCE = 0.0025
+MIN_SECTIONS = 8
+MAX_SECTIONS = 64
+# Counts are rounded up to a multiple of this, keeping quarter-turn symmetry
+SECTION_STEP = 4
+MAX_SUBDIVISIONS = 4
+
+_quality = 1.0
+
+
+def set_quality(quality: float) -> None:
+    """Scale every tolerance by 1/quality for the rest of the process."""
+    global _quality
+    if quality <= 0:
+        raise ValueError(f"Tessellation quality must be positive, got {quality}")
+    _quality = float(quality)
+
+
+def get_quality() -> float:
+    return _quality
+
+
+def chord_tolerance() -> float:
+    return CHORD_TOLERANCE / _quality
+
+
+def circle_sections(radius: float) -> int:
+    """Sections around a circle of this radius that keep the chord sag within tolerance."""
+    tolerance = chord_tolerance()
+    radius = abs(radius)
+    if radius <= tolerance / 2:
+        return MIN_SECTIONS
+    sections = math.ceil(math.pi / math.acos(1 - tolerance / radius) - 1e-9)
+    sections = SECTION_STEP * math.ceil(sections / SECTION_STEP)
+    return int(min(max(sections, MIN_SECTIONS), MAX_SECTIONS))
+
+
+def sphere_subdivisions(radius: float) -> int:
+    """
+    Icosphere subdivisions for a sphere of this radius. Each subdivision
+    halves the edge arc, which starts at about 1.107 rad on the icosahedron.
+    """
+    tolerance = chord_tolerance()
+    for subdivisions in range(1, MAX_SUBDIVISIONS + 1):
+        arc = 1.1071487 / 2 ** subdivisions
+        if abs(radius) * (1 - math.cos(arc / 2)) <= tolerance:
+            return subdivisions
+    return MAX_SUBDIVISIONS
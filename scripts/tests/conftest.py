@@ -0,0 +1,6 @@
+"""Tests import the build scripts the way the scripts import each other."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
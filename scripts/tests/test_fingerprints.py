@@ -0,0 +1,68 @@
+import inspect
+import textwrap
+
+import build_models
+import fingerprints
+import glb_export
+import mesh_metadata
+from build_models import BuildOptions, plan_parts
+from build_profiles import DEFAULT_PROFILE, get_profile
+from glb_export import content_hash
+from model_registry import all_parts
+
+
+def forget_hashes(monkeypatch):
+    """Drop cached hashes, as a new build run would start without them."""
+    monkeypatch.setattr(fingerprints, '_function_hashes', {})
+    monkeypatch.setattr(fingerprints, '_closures', {})
+    monkeypatch.setattr(fingerprints, '_listings', {})
+    monkeypatch.setattr(fingerprints, '_part_closures', {})
+
+
+def edited_code(func, old: str, new: str):
+    """func's code as if its source had been edited, compiled in its own module and file."""
+    source = textwrap.dedent(inspect.getsource(func))
+    assert old in source
+    namespace = dict(func.__globals__)
+    exec(compile(source.replace(old, new), func.__code__.co_filename, 'exec'), namespace)
+    return namespace[func.__name__].__code__
+
+
+def rebuild_reason(tmp_path, monkeypatch, edit) -> str:
+    """Reason the AN320-4 nut is rebuilt after edit, given an up-to-date build in tmp_path."""
+    forget_hashes(monkeypatch)
+    part = next(part for part in all_parts() if part.part_number == 'AN320-4')
+    options = BuildOptions(get_profile(DEFAULT_PROFILE))
+    (tmp_path / 'an320-4.glb').write_bytes(b'glb')
+    (_, fingerprint, _), = plan_parts([part], tmp_path, options, {})
+    manifest = {part.part_number: {'file': 'an320-4.glb', 'sha256': content_hash(b'glb'), 'fingerprint': fingerprint}}
+    (_, _, reason), = plan_parts([part], tmp_path, options, manifest)
+    assert reason is None
+    edit()
+    forget_hashes(monkeypatch)
+    (_, _, reason), = plan_parts([part], tmp_path, options, manifest)
+    return reason
+
+
+def test_method_edit_rebuilds(tmp_path, monkeypatch):
+    method = glb_export._BufferBuilder.add_view
+    code = edited_code(method, 'len(self.buffer_views) - 1', 'len(self.buffer_views) - 2')
+    assert rebuild_reason(tmp_path, monkeypatch, lambda: monkeypatch.setattr(method, '__code__', code)) == 'changed'
+
+
+def test_class_data_edit_rebuilds(tmp_path, monkeypatch):
+    fields = glb_export.DetailMap._fields
+    edit = lambda: monkeypatch.setattr(glb_export.DetailMap, '_fields', fields + ('tiling',))
+    assert rebuild_reason(tmp_path, monkeypatch, edit) == 'changed'
+
+
+def test_manifest_edit_rebuilds(tmp_path, monkeypatch):
+    function = mesh_metadata.viewer_metadata
+    code = edited_code(function, "'fov': fov", "'fov': round(fov, 1)")
+    assert rebuild_reason(tmp_path, monkeypatch, lambda: monkeypatch.setattr(function, '__code__', code)) == 'changed'
+
+
+def test_unrelated_edit_keeps_part(tmp_path, monkeypatch):
+    function = build_models.print_plan
+    code = edited_code(function, 'Plan for', 'Build plan for')
+    assert rebuild_reason(tmp_path, monkeypatch, lambda: monkeypatch.setattr(function, '__code__', code)) is None
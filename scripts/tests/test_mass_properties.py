@@ -0,0 +1,52 @@
+import math
+
+import numpy as np
+import pytest
+import trimesh
+
+from mass_properties import mass_properties, mesh_properties, ray_volume
+from model_registry import all_parts
+
+
+def registry_part(part_number):
+    return next(part for part in all_parts() if part.part_number == part_number)
+
+
+def test_ray_volume_box():
+    box = trimesh.creation.box(extents=(1.0, 2.0, 3.0))
+    assert ray_volume(np.asarray(box.vertices), np.asarray(box.faces)) == pytest.approx(6.0, rel=1e-3)
+
+
+def test_ray_volume_ignores_winding():
+    box = trimesh.creation.box(extents=(1.0, 2.0, 3.0))
+    faces = np.asarray(box.faces).copy()
+    faces[::3] = faces[::3, ::-1]
+    assert ray_volume(np.asarray(box.vertices), faces) == pytest.approx(6.0, rel=1e-3)
+
+
+def test_inward_wound_shell_takes_ray_estimate():
+    box = trimesh.creation.box(extents=(1.0, 2.0, 3.0))
+    inverted = trimesh.Trimesh(vertices=box.vertices, faces=np.asarray(box.faces)[:, ::-1], process=False)
+    volume, area, method = mesh_properties(inverted)
+    assert method == 'ray'
+    assert volume == pytest.approx(6.0, rel=1e-3)
+    assert area == pytest.approx(22.0)
+
+
+def test_hex_nut_volume():
+    # The hex prism is closed but not consistently wound, so it takes the ray estimate
+    part = registry_part('AN320-4')
+    mesh, _ = part.build(part.part_number)
+    volume, _, method = mesh_properties(mesh)
+    radius = np.hypot(mesh.vertices[:, 0], mesh.vertices[:, 1]).max()
+    prism = 1.5 * math.sqrt(3) * radius ** 2 * np.ptp(mesh.vertices[:, 2])
+    assert method == 'ray'
+    assert volume == pytest.approx(prism, rel=0.01)
+    assert mass_properties(part, mesh)['grams'] > 0
+
+
+def test_empty_mesh_raises():
+    part = registry_part('AN320-4')
+    empty = trimesh.Trimesh(vertices=np.zeros((3, 3)), faces=[[0, 1, 2]])
+    with pytest.raises(ValueError):
+        mass_properties(part, empty)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Baked thread normal maps for low-poly shafts.
+Real thread geometry costs thousands of triangles per part, so catalog
+models can keep their plain shafts and look threaded through a
+tangent-space normal map instead. The map is baked on the CPU: rays are
+cast inward from a cylinder at the major diameter onto a high-detail
+helical thread (threads.helical_thread) and the normals they hit are
+encoded in the shaft's tangent frame. One tile spans the circumference and
+one pitch of height, so it repeats seamlessly along the shaft and is shared
+by every part with the same thread. Baked tiles are cached per thread
+under CACHE_DIR/thread-maps.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
+from build_config import CACHE_DIR
+from glb_export import DetailMap, mesh_vertex_colors
+from lazy_imports import lazy_import
+from mesh_instancing import find_instances
+from threads import basic_minor_diameter, helical_thread
+from thumbnails import encode_png
+
+np = lazy_import('numpy')
+trimesh = lazy_import('trimesh')
+
+THREAD_MAP_DIR = CACHE_DIR / 'thread-maps'
+# Bump when the baker output changes so cached tiles are invalidated
+BAKE_VERSION = 1
+MAP_SIZE = 64
+# Rays per texel along each axis
+SUPERSAMPLE = 2
+# Segments per turn of the high-detail thread that rays are cast against
+BAKE_SEGMENTS = 240
+# Shaft faces within this distance (inches) of the major radius get the map
+RADIUS_TOLERANCE = 1e-4
+
+
+class ThreadRegion(NamedTuple):
+    """Threaded length of a shaft along z; diameters and pitch in inches."""
+    major: float
+    pitch: float
+    bottom: float
+    top: float
+
+
+def thread_regions(mesh) -> List[ThreadRegion]:
+    """
+    Threads in a mesh built with threaded=True, found as runs of identical
+    shells stacked along the z axis one pitch apart.
+    """
+    _, groups = find_instances(mesh)
+    regions = []
+    for prototype, translations, rotations in groups:
+        if not (np.allclose(rotations, [0, 0, 0, 1]) and np.allclose(translations[:, :2], 0)):
+            continue
+        heights = np.sort(translations[:, 2])
+        steps = np.diff(heights)
+        if not np.allclose(steps, steps[0], atol=1e-6):
+            continue
+        pitch = float(steps[0])
+        vertices = np.asarray(prototype.vertices)
+        major = 2 * float(np.hypot(vertices[:, 0], vertices[:, 1]).max())
+        # Each turn's ridge stops P/8 short of its end of the threaded length
+        bottom = float(vertices[:, 2].min() + heights[0]) - pitch / 8
+        top = float(vertices[:, 2].max() + heights[-1]) + pitch / 8
+        regions.append(ThreadRegion(round(major, 6), round(pitch, 7), bottom, top))
+    return regions
+
+
+def _ray_hits(origins: np.ndarray, direction: np.ndarray, triangles: np.ndarray):
+    """Nearest hit per ray (Moller-Trumbore) as (triangle index or -1, distance)."""
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    edge1, edge2 = b - a, c - a
+    p = np.cross(direction, edge2)
+    det = np.einsum('ij,ij->i', edge1, p)
+    usable = np.abs(det) > 1e-18
+    inv = np.where(usable, 1.0 / np.where(usable, det, 1.0), 0.0)
+    offset = origins[:, None, :] - a[None]
+    u = np.einsum('rtj,tj->rt', offset, p) * inv
+    q = np.cross(offset, edge1[None])
+    v = np.einsum('j,rtj->rt', direction, q) * inv
+    t = np.einsum('rtj,tj->rt', q, edge2) * inv
+    hit = usable & (u >= 0) & (v >= 0) & (u + v <= 1) & (t > 0)
+    t = np.where(hit, t, np.inf)
+    nearest = np.argmin(t, axis=1)
+    distance = t[np.arange(len(t)), nearest]
+    return np.where(np.isfinite(distance), nearest, -1), distance
+
+
+def bake_thread_normals(major: float, pitch: float, size: int = MAP_SIZE,
+                        supersample: int = SUPERSAMPLE) -> np.ndarray:
+    """
+    Tangent-space normal tile (size, size, 4) RGBA uint8 for a thread.
+    Columns run around the shaft (u), rows run down one pitch (v = -z / pitch);
+    red follows the circumference, green points up the shaft.
+    """
+    minor = basic_minor_diameter(major, pitch)
+    ridge = helical_thread(major, minor, pitch, 4 * pitch, segments=BAKE_SEGMENTS)
+    core = trimesh.creation.cylinder(radius=minor / 2, height=4 * pitch, sections=BAKE_SEGMENTS)
+    core.apply_translation([0, 0, 2 * pitch])
+    high = trimesh.util.concatenate([ridge, core])
+    triangles = np.asarray(high.vertices)[np.asarray(high.faces)]
+    cross = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    face_normals = cross / np.maximum(np.linalg.norm(cross, axis=1), 1e-20)[:, None]
+
+    # The tile covers z in [pitch, 2 pitch], well inside the baked turns
+    samples = size * supersample
+    steps = (np.arange(samples) + 0.5) / samples
+    heights = 2 * pitch - steps * pitch
+    low, high_z = triangles[..., 2].min(axis=1), triangles[..., 2].max(axis=1)
+    corner_angles = np.arctan2(triangles[..., 1], triangles[..., 0])
+    start = corner_angles[:, 0]
+    spread = (corner_angles - start[:, None] + np.pi) % (2 * np.pi) - np.pi
+    radial = np.hypot(triangles[..., 0], triangles[..., 1]).min(axis=1)
+    candidates = (high_z >= pitch - 1e-9) & (low <= 2 * pitch + 1e-9) & (radial > minor / 4)
+    origin_radius = major
+
+    normals = np.empty((samples, samples, 3))
+    for column, u in enumerate(steps):
+        theta = 2 * np.pi * u
+        # Triangles whose angular span covers this column
+        offset = (theta - start - spread.min(axis=1)) % (2 * np.pi)
+        near = np.nonzero(candidates & (offset <= spread.max(axis=1) - spread.min(axis=1) + 1e-9))[0]
+        radial_out = np.array([np.cos(theta), np.sin(theta), 0.0])
+        origins = np.stack([np.full(samples, origin_radius * radial_out[0]),
+                            np.full(samples, origin_radius * radial_out[1]), heights], axis=1)
+        index, _ = _ray_hits(origins, -radial_out, triangles[near])
+        world = np.where(index[:, None] >= 0, face_normals[near][np.maximum(index, 0)], radial_out)
+        tangent = np.array([-np.sin(theta), np.cos(theta), 0.0])
+        normals[:, column] = np.stack([world @ tangent, world[:, 2], world @ radial_out], axis=1)
+
+    # Average the supersamples per texel
+    normals = normals.reshape(size, supersample, size, supersample, 3).mean(axis=(1, 3))
+    normals /= np.maximum(np.linalg.norm(normals, axis=2), 1e-20)[..., None]
+    image = np.empty((size, size, 4), dtype=np.uint8)
+    image[..., :3] = np.round((normals * 0.5 + 0.5) * 255).clip(0, 255).astype(np.uint8)
+    image[..., 3] = 255
+    return image
+
+
+def thread_map_name(major: float, pitch: float, size: int = MAP_SIZE) -> str:
+    """Cache and image name for a thread tile."""
+    return f"thread-{major:.6f}-{pitch:.7f}-{size}-v{BAKE_VERSION}"
+
+
+def thread_map(major: float, pitch: float, size: int = MAP_SIZE, cache_dir: Path = THREAD_MAP_DIR) -> bytes:
+    """PNG bytes of a thread tile, baked once per thread and then read from the cache."""
+    path = Path(cache_dir) / f"{thread_map_name(major, pitch, size)}.png"
+    if path.exists():
+        return path.read_bytes()
+    data = encode_png(bake_thread_normals(major, pitch, size))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return data
+
+
+def split_at_height(mesh, height: float) -> trimesh.Trimesh:
+    """
+    Copy of mesh with every face that crosses the plane z = height cut in
+    three, so faces end up wholly above or below it. Cut points are shared
+    along each edge; colors follow the face (or the edge's first vertex).
+    """
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    faces = np.asarray(mesh.faces, dtype=np.int64)
+    face_kind = getattr(mesh.visual, 'kind', None) == 'face'
+    face_colors = np.asarray(mesh.visual.face_colors) if face_kind else None
+    vertex_colors = None if face_kind else mesh_vertex_colors(mesh)
+
+    z = vertices[faces][..., 2]
+    crossing = (z.min(axis=1) < height - 1e-9) & (z.max(axis=1) > height + 1e-9)
+    if not crossing.any():
+        return mesh
+    cut = faces[crossing]
+    above = vertices[cut][..., 2] > height
+    # Rotate each face so its lone vertex (alone on its side of the plane) comes first
+    lone = np.argmax(above != (above.sum(axis=1, keepdims=True) > 1), axis=1)
+    roll = (np.arange(3)[None, :] + lone[:, None]) % 3
+    a, b, c = np.take_along_axis(cut, roll, axis=1).T
+
+    # One new vertex per cut edge, keyed by the undirected edge
+    edges = np.concatenate([np.stack([a, b], axis=1), np.stack([a, c], axis=1)])
+    keys = np.sort(edges, axis=1)
+    unique_edges, edge_index = np.unique(keys, axis=0, return_inverse=True)
+    start, end = vertices[unique_edges[:, 0]], vertices[unique_edges[:, 1]]
+    t = (height - start[:, 2]) / (end[:, 2] - start[:, 2])
+    points = start + (end - start) * t[:, None]
+    points[:, 2] = height
+    p = len(vertices) + edge_index.ravel()[:len(cut)]
+    q = len(vertices) + edge_index.ravel()[len(cut):]
+
+    new_faces = np.concatenate([faces[~crossing],
+                                np.stack([a, p, q], axis=1),
+                                np.stack([p, b, c], axis=1),
+                                np.stack([p, c, q], axis=1)])
+    split = trimesh.Trimesh(vertices=np.concatenate([vertices, points]), faces=new_faces, process=False)
+    if face_colors is not None:
+        parents = np.concatenate([np.nonzero(~crossing)[0], np.tile(np.nonzero(crossing)[0], 3)])
+        split.visual.face_colors = face_colors[parents]
+    elif vertex_colors is not None:
+        split.visual.vertex_colors = np.concatenate([vertex_colors, vertex_colors[unique_edges[:, 0]]])
+    return split
+
+
+def shaft_uvs(vertices: np.ndarray, faces: np.ndarray, pitch: float) -> np.ndarray:
+    """
+    Per-corner cylindrical texture coordinates (faces, 3, 2): u = angle / 2pi
+    around z, v = -z / pitch. u is unwrapped per face so no face spans the seam.
+    """
+    corners = vertices[faces]
+    u = np.arctan2(corners[..., 1], corners[..., 0]) / (2 * np.pi) % 1.0
+    u = u[:, :1] + (u - u[:, :1] + 0.5) % 1.0 - 0.5
+    return np.stack([u, -corners[..., 2] / pitch], axis=-1)
+
+
+def thread_detail(mesh, threaded_mesh, size: int = MAP_SIZE) -> Tuple[trimesh.Trimesh, Optional[DetailMap]]:
+    """
+    Lay the baked thread tile over the plain shaft of a cleaned mesh.
+    threaded_mesh is the same part built with threaded=True, which tells
+    where the thread runs. The shaft is cut at the ends of the threaded
+    length, so the map stops where the real thread would. Returns the
+    (possibly cut) mesh and the detail map, or None when the part has no
+    thread or its shaft is already threaded.
+    """
+    regions = thread_regions(threaded_mesh)
+    if not regions:
+        return mesh, None
+    # One map per model: keep the longest thread
+    region = max(regions, key=lambda r: r.top - r.bottom)
+    mesh = split_at_height(split_at_height(mesh, region.bottom), region.top)
+
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    faces = np.asarray(mesh.faces, dtype=np.int64)
+    corners = vertices[faces]
+    on_shaft = np.all(np.abs(np.hypot(corners[..., 0], corners[..., 1]) - region.major / 2) < RADIUS_TOLERANCE, axis=1)
+    centers = corners[..., 2].mean(axis=1)
+    mask = on_shaft & (centers > region.bottom) & (centers < region.top)
+    if not mask.any():
+        return mesh, None
+    uvs = shaft_uvs(vertices, faces[mask], region.pitch)
+    name = thread_map_name(region.major, region.pitch, size)
+    return mesh, DetailMap(mask, uvs, thread_map(region.major, region.pitch, size), name)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Helical thread geometry with pitch from the standard thread tables.
+The thread is the 60° basic profile (P/8 crest flat, P/4 root flat) swept
+along a true helix around a core at the minor diameter. Each turn is built
+once and copied up the shaft by one pitch, so a thread is a stack of
+identical shells: touching turn ends weld together in mesh_cleanup, and
+mesh_instancing picks the turns up as instances.
+Model units are inches; metric tables are in millimetres.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import NamedTuple, Optional
+
+from lazy_imports import lazy_import
+from tessellation import SECTION_STEP, circle_sections
+
+np = lazy_import('numpy')
+trimesh = lazy_import('trimesh')
+
+# Threads per inch by nominal diameter (inches), ASME B1.1
+UNC_TPI = {
+    0.073: 64, 0.086: 56, 0.099: 48, 0.112: 40, 0.125: 40, 0.138: 32, 0.164: 32, 0.190: 24,
+    0.216: 24, 0.250: 20, 0.3125: 18, 0.375: 16, 0.4375: 14, 0.500: 13, 0.5625: 12, 0.625: 11,
+    0.750: 10, 0.875: 9, 1.000: 8,
+}
+UNF_TPI = {
+    0.060: 80, 0.073: 72, 0.086: 64, 0.099: 56, 0.112: 48, 0.125: 44, 0.138: 40, 0.164: 36,
+    0.190: 32, 0.216: 28, 0.250: 28, 0.3125: 24, 0.375: 24, 0.4375: 20, 0.500: 20, 0.5625: 18,
+    0.625: 18, 0.750: 16, 0.875: 14, 1.000: 12,
+}
+# Pitch (mm) by nominal diameter (mm), ISO 261
+METRIC_COARSE = {
+    1.6: 0.35, 2.0: 0.4, 2.5: 0.45, 3.0: 0.5, 4.0: 0.7, 5.0: 0.8, 6.0: 1.0, 8.0: 1.25,
+    10.0: 1.5, 12.0: 1.75, 14.0: 2.0, 16.0: 2.0, 20.0: 2.5, 24.0: 3.0,
+}
+METRIC_FINE = {
+    8.0: 1.0, 10.0: 1.25, 12.0: 1.25, 14.0: 1.5, 16.0: 1.5, 20.0: 1.5, 24.0: 2.0,
+}
+
+MM_PER_INCH = 25.4
+# Basic thread depth as a fraction of pitch (5H/8 for a 60° thread)
+DEPTH_RATIO = 0.541266
+# Thread triangles per part unless a caller asks for more or fewer
+THREAD_TRIANGLES = 2000
+MIN_SEGMENTS = 8
+MAX_SEGMENTS = 48
+# The ridge root sinks this fraction of the thread depth into the core
+ROOT_EMBED = 0.25
+
+
+class ThreadSpec(NamedTuple):
+    """A thread resolved against a table; diameters and pitch in inches."""
+    series: str
+    nominal: float
+    major: float
+    minor: float
+    pitch: float
+
+
+def _nearest(table: dict, size: float) -> float:
+    sizes = np.array(sorted(table))
+    return float(sizes[int(np.argmin(np.abs(sizes - size)))])
+
+
+def basic_minor_diameter(major: float, pitch: float) -> float:
+    """Minor diameter of the basic profile for a major diameter and pitch."""
+    return major - 2 * DEPTH_RATIO * pitch
+
+
+def thread_spec(diameter: float, series: str = 'UNF') -> ThreadSpec:
+    """
+    Thread for a shaft of the given major diameter (inches).
+    series is 'UNC', 'UNF', 'M' (metric coarse) or 'MF' (metric fine); the
+    pitch comes from the nearest nominal size in that table.
+    """
+    if series in ('UNC', 'UNF'):
+        table = UNC_TPI if series == 'UNC' else UNF_TPI
+        nominal = _nearest(table, diameter)
+        pitch = 1.0 / table[nominal]
+    elif series in ('M', 'MF'):
+        table = METRIC_COARSE if series == 'M' else METRIC_FINE
+        nominal = _nearest(table, diameter * MM_PER_INCH)
+        pitch = table[nominal] / MM_PER_INCH
+        nominal /= MM_PER_INCH
+    else:
+        raise ValueError(f"Unknown thread series: {series}")
+    return ThreadSpec(series, nominal, diameter, basic_minor_diameter(diameter, pitch), pitch)
+
+
+def standard_thread_length(diameter: float, length: float) -> float:
+    """Threaded length of a bolt shank: 2D + 1/4 inch, at most the whole shank."""
+    return min(length, 2 * diameter + 0.25)
+
+
+def thread_segments(turns: int, triangle_budget: int) -> int:
+    """Segments per turn that keep a thread of this many turns within the budget."""
+    per_turn = max(triangle_budget, 1) / max(turns, 1)
+    return int(np.clip((per_turn - 4) // 8, MIN_SEGMENTS, MAX_SEGMENTS))
+
+
+def helical_thread(major_diameter: float, minor_diameter: float, pitch: float, length: float,
+                   triangle_budget: int = THREAD_TRIANGLES, segments: Optional[int] = None) -> Optional[trimesh.Trimesh]:
+    """
+    Thread ridge running from z=0 up to length, as whole turns.
+    The triangle budget sets the segments per turn, within
+    MIN_SEGMENTS..MAX_SEGMENTS, so a long fine thread may exceed it;
+    segments overrides the budget (bakes use far more than a model would).
+    Returns None when the length is too short for a full turn.
+    """
+    # A turn sweeps from P/8 to 2P - P/8 above its start
+    turns = int((length + pitch / 8) / pitch + 1e-9) - 1
+    if turns < 1:
+        return None
+    if segments is None:
+        segments = thread_segments(turns, triangle_budget)
+
+    depth = (major_diameter - minor_diameter) / 2
+    root = minor_diameter / 2 - ROOT_EMBED * depth
+    crest = major_diameter / 2
+    # (radius, axial offset) around the section: root, flank, crest flat, flank
+    profile = np.array([
+        [root, pitch / 8],
+        [crest, pitch * 7 / 16],
+        [crest, pitch * 9 / 16],
+        [root, pitch * 7 / 8],
+    ])
+
+    # One turn: rings of the profile along the helix
+    angles = np.linspace(0.0, 2 * np.pi, segments + 1)
+    rings = np.empty((segments + 1, len(profile), 3))
+    rings[..., 0] = np.cos(angles)[:, None] * profile[:, 0]
+    rings[..., 1] = np.sin(angles)[:, None] * profile[:, 0]
+    rings[..., 2] = profile[:, 1] + (pitch * angles / (2 * np.pi))[:, None]
+    vertices = rings.reshape(-1, 3)
+
+    corners = len(profile)
+    ring = np.arange(segments)[:, None] * corners
+    edge = np.arange(corners)
+    a = ring + edge
+    b = ring + (edge + 1) % corners
+    c = a + corners
+    d = b + corners
+    sides = np.concatenate([np.stack([a, d, b], axis=-1), np.stack([a, c, d], axis=-1)], axis=1).reshape(-1, 3)
+    end = segments * corners
+    caps = np.array([[0, 1, 2], [0, 2, 3], [end, end + 2, end + 1], [end, end + 3, end + 2]])
+    faces = np.concatenate([sides, caps])
+
+    # Copy the turn up the shaft
+    offsets = np.arange(turns) * pitch
+    stacked = np.repeat(vertices[None], turns, axis=0)
+    stacked[..., 2] += offsets[:, None]
+    stacked_faces = faces[None] + (np.arange(turns) * len(vertices))[:, None, None]
+    return trimesh.Trimesh(vertices=stacked.reshape(-1, 3), faces=stacked_faces.reshape(-1, 3), process=False)
+
+
+def core_sections(thread: ThreadSpec) -> int:
+    """
+    Sections for the core at the minor diameter: the usual chord tolerance,
+    raised if needed so the core's flats stay outside the embedded ridge root
+    at any quality.
+    """
+    radius = thread.minor / 2
+    embed = ROOT_EMBED * (thread.major - thread.minor) / 2
+    embedded = math.ceil(math.pi / math.acos(1 - embed / radius) / SECTION_STEP) * SECTION_STEP
+    return max(circle_sections(radius), embedded)
+
+
+def threaded_shaft(thread: ThreadSpec, length: float, thread_length: Optional[float] = None,
+                   sections: int = 16, triangle_budget: int = THREAD_TRIANGLES) -> trimesh.Trimesh:
+    """
+    Shaft from z=0 (the tip) to z=length: a core at the minor diameter with
+    the helical thread over thread_length, then a plain shank at the major
+    diameter. thread_length defaults to standard_thread_length. sections
+    only applies to the shank; the core uses core_sections.
+    """
+    if thread_length is None:
+        thread_length = standard_thread_length(thread.major, length)
+    thread_length = min(thread_length, length)
+
+    core = trimesh.creation.cylinder(radius=thread.minor / 2, height=thread_length, sections=core_sections(thread))
+    core.apply_translation([0, 0, thread_length / 2])
+    meshes = [core]
+    if length - thread_length > 1e-9:
+        shank = trimesh.creation.cylinder(radius=thread.major / 2, height=length - thread_length, sections=sections)
+        shank.apply_translation([0, 0, (length + thread_length) / 2])
+        meshes.append(shank)
+    ridge = helical_thread(thread.major, thread.minor, thread.pitch, thread_length, triangle_budget)
+    if ridge is not None:
+        meshes.append(ridge)
+    return trimesh.util.concatenate(meshes)
+
+
+def shaft_cylinder(radius: float, height: float, sections: int, thread_series: Optional[str] = None,
+                   thread_length: Optional[float] = None, tip_down: bool = True) -> trimesh.Trimesh:
+    """
+    Drop-in for trimesh.creation.cylinder in the bolt and screw generators.
+    Without a thread series it is exactly that cylinder; with one, the shaft
+    is threaded from its tip, which is the -z end unless tip_down is False.
+    Like the plain cylinder, the result is centered on the origin.
+    """
+    if thread_series is None:
+        return trimesh.creation.cylinder(radius=radius, height=height, sections=sections)
+    shaft = threaded_shaft(thread_spec(2 * radius, thread_series), height, thread_length, sections)
+    shaft.apply_translation([0, 0, -height / 2])
+    if not tip_down:
+        shaft.apply_transform(trimesh.transformations.rotation_matrix(np.pi, [1, 0, 0]))
+    return shaft
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Offline thumbnail renderer for generated models.
+A small NumPy z-buffer rasterizer with flat Lambert shading and a fixed
+camera renders every GLB to a PNG (or WebP, when Pillow is installed)
+without a GPU or display. Thumbnails are named by a hash of the model
+content and render settings, so unchanged parts are never re-rendered.
+
+Thumbnails can also be packed into per-category sprite-sheet atlases, one
+per catalog page, with a JSON map from part number to sprite rectangle.
+For low-end devices the same renderer produces turntable strips: N views
+around the vertical axis packed side by side into one image, so the site
+can fake rotation by scrubbing through frames.
+
+Usage:
+    python scripts/thumbnails.py [models_dir] [--size 128] [--format png] [--jobs N]
+    python scripts/thumbnails.py [models_dir] --atlases [--page-size 12]
+    python scripts/thumbnails.py [models_dir] --turntables [--frames bolts=24,nuts=0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import re
+import struct
+import sys
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from build_config import MODELS_DIR
+from glb_export import read_glb
+from lazy_imports import lazy_import
+from model_manifest import HASH_LENGTH, HASHED_DIR, load_manifest, write_manifest
+
+np = lazy_import('numpy')
+
+THUMBNAIL_DIR = f"{HASHED_DIR}/thumbnails"
+ATLAS_DIR = f"{HASHED_DIR}/atlases"
+ATLAS_INDEX_DIR = 'atlases'
+TURNTABLE_DIR = f"{HASHED_DIR}/turntables"
+# Bump when the renderer output changes so cached thumbnails are invalidated
+RENDERER_VERSION = 1
+
+DEFAULT_SIZE = 128
+SUPERSAMPLE = 2
+# Fixed three-quarter camera around the model's z (up) axis
+DEFAULT_YAW = math.radians(-35.0)
+DEFAULT_PITCH = math.radians(25.0)
+FRAME_MARGIN = 1.08
+AMBIENT = 0.35
+# Unnormalized direction towards the light, in view space
+LIGHT_DIRECTION = (-0.4, 0.6, 0.7)
+# Catalog.tsx reveals products twelve at a time
+CATALOG_PAGE_SIZE = 12
+ATLAS_COLUMNS = 6
+# Turntable frames per family; 0 disables turntables for that family
+TURNTABLE_FRAMES = {'bolts': 24, 'screws': 24, 'fittings': 24, 'nuts': 12, 'pins': 16}
+TURNTABLE_SIZE = 96
+# Upper bound on candidate (triangle, pixel) pairs rasterized at once
+MAX_BATCH_SAMPLES = 2_000_000
+
+
+def view_matrix(yaw: float, pitch: float) -> np.ndarray:
+    """Rotation from model space (z up) to view space (x right, y up, z toward camera)."""
+    cz, sz = np.cos(yaw), np.sin(yaw)
+    spin = np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]])
+    # Camera on the -y side looking along +y, with model z as screen up
+    base = np.array([[1, 0, 0], [0, 0, 1], [0, -1, 0]])
+    cp, sp = np.cos(pitch), np.sin(pitch)
+    tilt = np.array([[1, 0, 0], [0, cp, -sp], [0, sp, cp]])
+    return tilt @ base @ spin
+
+
+def render_mesh(positions: np.ndarray, faces: np.ndarray, colors: Optional[np.ndarray],
+                size: int = DEFAULT_SIZE, yaw: float = DEFAULT_YAW, pitch: float = DEFAULT_PITCH,
+                supersample: int = SUPERSAMPLE) -> np.ndarray:
+    """Render a triangle mesh to an RGBA uint8 image of shape (size, size, 4)."""
+    n = size * supersample
+    center = (positions.min(axis=0) + positions.max(axis=0)) / 2
+    radius = max(np.linalg.norm(positions - center, axis=1).max(), 1e-9) * FRAME_MARGIN
+
+    view = (positions - center) @ view_matrix(yaw, pitch).T
+    screen = np.empty_like(view)
+    screen[:, 0] = (view[:, 0] / radius * 0.5 + 0.5) * n
+    screen[:, 1] = (0.5 - view[:, 1] / radius * 0.5) * n
+    screen[:, 2] = view[:, 2]
+
+    # Flat shading from view-space face normals, two-sided
+    tri_view = view[faces]
+    normals = np.cross(tri_view[:, 1] - tri_view[:, 0], tri_view[:, 2] - tri_view[:, 0])
+    lengths = np.linalg.norm(normals, axis=1)
+    normals = normals / np.maximum(lengths, 1e-12)[:, None]
+    light = np.array(LIGHT_DIRECTION) / np.linalg.norm(LIGHT_DIRECTION)
+    shade = AMBIENT + (1 - AMBIENT) * np.abs(normals @ light)
+    if colors is None:
+        base_rgb = np.full((len(faces), 3), 180.0)
+    else:
+        base_rgb = colors[faces][:, :, :3].astype(np.float64).mean(axis=1)
+    face_rgb = np.clip(base_rgb * shade[:, None], 0, 255)
+
+    depth = np.full(n * n, -np.inf)
+    rgb = np.zeros((n * n, 3))
+
+    tri = screen[faces]
+    x0 = np.clip(np.floor(tri[:, :, 0].min(axis=1)), 0, n - 1).astype(np.int64)
+    x1 = np.clip(np.ceil(tri[:, :, 0].max(axis=1)), 0, n - 1).astype(np.int64)
+    y0 = np.clip(np.floor(tri[:, :, 1].min(axis=1)), 0, n - 1).astype(np.int64)
+    y1 = np.clip(np.ceil(tri[:, :, 1].max(axis=1)), 0, n - 1).astype(np.int64)
+    widths = x1 - x0 + 1
+    areas = widths * (y1 - y0 + 1)
+
+    # Signed doubled area; degenerate triangles are skipped
+    ax, ay = tri[:, 0, 0], tri[:, 0, 1]
+    bx, by = tri[:, 1, 0], tri[:, 1, 1]
+    cx, cy = tri[:, 2, 0], tri[:, 2, 1]
+    denom = (by - cy) * (ax - cx) + (cx - bx) * (ay - cy)
+    valid = np.flatnonzero(np.abs(denom) > 1e-12)
+
+    start = 0
+    while start < len(valid):
+        # Grow the batch until it reaches the sample budget
+        cumulative = np.cumsum(areas[valid[start:]])
+        stop = start + max(1, int(np.searchsorted(cumulative, MAX_BATCH_SAMPLES)))
+        batch = valid[start:stop]
+        start = stop
+
+        counts = areas[batch]
+        owner = np.repeat(batch, counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        px = x0[owner] + local % widths[owner]
+        py = y0[owner] + local // widths[owner]
+        sx, sy = px + 0.5, py + 0.5
+
+        d = denom[owner]
+        l0 = ((by[owner] - cy[owner]) * (sx - cx[owner]) + (cx[owner] - bx[owner]) * (sy - cy[owner])) / d
+        l1 = ((cy[owner] - ay[owner]) * (sx - cx[owner]) + (ax[owner] - cx[owner]) * (sy - cy[owner])) / d
+        l2 = 1 - l0 - l1
+        inside = (l0 >= 0) & (l1 >= 0) & (l2 >= 0)
+
+        owner, px, py = owner[inside], px[inside], py[inside]
+        z = (l0[inside] * tri[owner, 0, 2] + l1[inside] * tri[owner, 1, 2] + l2[inside] * tri[owner, 2, 2])
+        pixel = py * n + px
+
+        # Nearest sample per pixel within the batch, then merge into the z-buffer
+        order = np.lexsort((-z, pixel))
+        pixel, z, owner = pixel[order], z[order], owner[order]
+        first = np.ones(len(pixel), dtype=bool)
+        first[1:] = pixel[1:] != pixel[:-1]
+        pixel, z, owner = pixel[first], z[first], owner[first]
+        closer = z > depth[pixel]
+        depth[pixel[closer]] = z[closer]
+        rgb[pixel[closer]] = face_rgb[owner[closer]]
+
+    # Box-filter the supersampled buffers down to the output size
+    coverage = np.isfinite(depth).astype(np.float64).reshape(size, supersample, size, supersample)
+    rgb = rgb.reshape(size, supersample, size, supersample, 3)
+    alpha = coverage.sum(axis=(1, 3))
+    color = (rgb * coverage[..., None]).sum(axis=(1, 3)) / np.maximum(alpha, 1)[..., None]
+    image = np.empty((size, size, 4), dtype=np.uint8)
+    image[..., :3] = np.round(color).astype(np.uint8)
+    image[..., 3] = np.round(alpha / supersample ** 2 * 255).astype(np.uint8)
+    return image
+
+
+def encode_png(image: np.ndarray) -> bytes:
+    """Encode an RGBA uint8 image as PNG using only zlib."""
+    height, width = image.shape[:2]
+    rows = np.concatenate([np.zeros((height, 1), dtype=np.uint8), image.reshape(height, -1)], axis=1)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header)
+            + chunk(b'IDAT', zlib.compress(rows.tobytes(), 9)) + chunk(b'IEND', b''))
+
+
+def decode_png(data: bytes) -> np.ndarray:
+    """Decode an 8-bit RGBA, unfiltered PNG as written by encode_png."""
+    width, height, depth, color_type = struct.unpack('>IIBB', data[16:26])
+    if depth != 8 or color_type != 6:
+        raise ValueError('Only 8-bit RGBA PNGs are supported')
+    idat = b''
+    offset = 8
+    while offset < len(data):
+        length = struct.unpack('>I', data[offset:offset + 4])[0]
+        tag = data[offset + 4:offset + 8]
+        if tag == b'IDAT':
+            idat += data[offset + 8:offset + 8 + length]
+        offset += 12 + length
+    rows = np.frombuffer(zlib.decompress(idat), dtype=np.uint8).reshape(height, 1 + width * 4)
+    if rows[:, 0].any():
+        raise ValueError('Filtered PNG rows are not supported')
+    return rows[:, 1:].reshape(height, width, 4).copy()
+
+
+def encode_image(image: np.ndarray, fmt: str) -> bytes:
+    """Encode an RGBA image as PNG, or WebP through the optional Pillow package."""
+    if fmt == 'png':
+        return encode_png(image)
+    if fmt == 'webp':
+        try:
+            from PIL import Image
+        except ImportError:
+            raise RuntimeError("WebP thumbnails need Pillow (pip install pillow)")
+        import io
+        out = io.BytesIO()
+        Image.fromarray(image, 'RGBA').save(out, format='WEBP', lossless=True, method=6)
+        return out.getvalue()
+    raise ValueError(f"Unknown image format: {fmt}")
+
+
+def thumbnail_filename(entry: dict, size: int, fmt: str) -> str:
+    """Content-addressed thumbnail path for a manifest entry and render settings."""
+    key = hashlib.sha256(f"{entry['sha256']}:{size}:{fmt}:{RENDERER_VERSION}".encode()).hexdigest()
+    stem = entry['file'].rsplit('.', 1)[0]
+    return f"{THUMBNAIL_DIR}/{stem}.{key[:HASH_LENGTH]}.{fmt}"
+
+
+def _render_job(job: Tuple[str, str, int, str]) -> str:
+    glb_path, out_path, size, fmt = job
+    positions, faces, colors = read_glb(Path(glb_path).read_bytes())
+    Path(out_path).write_bytes(encode_image(render_mesh(positions, faces, colors, size=size), fmt))
+    return out_path
+
+
+def render_thumbnails(models_dir: Path, models: Dict[str, dict], size: int = DEFAULT_SIZE,
+                      fmt: str = 'png', jobs: Optional[int] = None) -> int:
+    """
+    Render a thumbnail for every manifest entry that lacks an up-to-date one
+    and record its path under the entry's 'thumbnail' key.
+    Returns the number of thumbnails rendered.
+    """
+    models_dir = Path(models_dir)
+    (models_dir / THUMBNAIL_DIR).mkdir(parents=True, exist_ok=True)
+
+    pending = []
+    for entry in models.values():
+        entry['thumbnail'] = thumbnail_filename(entry, size, fmt)
+        target = models_dir / entry['thumbnail']
+        if not target.exists():
+            pending.append((str(models_dir / entry['file']), str(target), size, fmt))
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        list(pool.map(_render_job, pending, chunksize=8))
+
+    referenced = {Path(entry['thumbnail']).name for entry in models.values()}
+    for stale in (models_dir / THUMBNAIL_DIR).iterdir():
+        if stale.name not in referenced:
+            stale.unlink()
+
+    return len(pending)
+
+
+def turntable_filename(entry: dict, frames: int, size: int, fmt: str) -> str:
+    """Content-addressed turntable strip path for a manifest entry and render settings."""
+    key = hashlib.sha256(
+        f"{entry['sha256']}:turntable:{frames}:{size}:{fmt}:{RENDERER_VERSION}".encode()).hexdigest()
+    stem = entry['file'].rsplit('.', 1)[0]
+    return f"{TURNTABLE_DIR}/{stem}.{key[:HASH_LENGTH]}.{fmt}"
+
+
+def render_turntable(positions: np.ndarray, faces: np.ndarray, colors: Optional[np.ndarray],
+                     frames: int, size: int = TURNTABLE_SIZE) -> np.ndarray:
+    """Render frames evenly spaced views around the z axis into one horizontal strip."""
+    views = [render_mesh(positions, faces, colors, size=size, yaw=DEFAULT_YAW + 2 * np.pi * i / frames)
+             for i in range(frames)]
+    return np.concatenate(views, axis=1)
+
+
+def _turntable_job(job: Tuple[str, str, int, int, str]) -> str:
+    glb_path, out_path, frames, size, fmt = job
+    positions, faces, colors = read_glb(Path(glb_path).read_bytes())
+    strip = render_turntable(positions, faces, colors, frames, size)
+    Path(out_path).write_bytes(encode_image(strip, fmt))
+    return out_path
+
+
+def parse_frames(spec: Optional[str]) -> Dict[str, int]:
+    """Per-family frame counts from 'bolts=24,nuts=0' on top of TURNTABLE_FRAMES."""
+    frames = dict(TURNTABLE_FRAMES)
+    for item in filter(None, (spec or '').split(',')):
+        family, count = item.split('=')
+        frames[family.strip()] = int(count)
+    return frames
+
+
+def render_turntables(models_dir: Path, models: Dict[str, dict], frames: Optional[Dict[str, int]] = None,
+                      size: int = TURNTABLE_SIZE, fmt: str = 'png', jobs: Optional[int] = None) -> int:
+    """
+    Render a turntable strip for every entry whose family has frames enabled,
+    recording {file, frames, size} under the entry's 'turntable' key.
+    Strips are content-addressed, so unchanged parts are served from cache.
+    Returns the number of strips rendered.
+    """
+    models_dir = Path(models_dir)
+    (models_dir / TURNTABLE_DIR).mkdir(parents=True, exist_ok=True)
+    frames = frames if frames is not None else TURNTABLE_FRAMES
+
+    pending = []
+    for entry in models.values():
+        count = frames.get(entry['family'], 0)
+        if count <= 0:
+            entry.pop('turntable', None)
+            continue
+        entry['turntable'] = {'file': turntable_filename(entry, count, size, fmt), 'frames': count, 'size': size}
+        target = models_dir / entry['turntable']['file']
+        if not target.exists():
+            pending.append((str(models_dir / entry['file']), str(target), count, size, fmt))
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        list(pool.map(_turntable_job, pending, chunksize=4))
+
+    referenced = {Path(entry['turntable']['file']).name for entry in models.values() if 'turntable' in entry}
+    for stale in (models_dir / TURNTABLE_DIR).iterdir():
+        if stale.name not in referenced:
+            stale.unlink()
+
+    return len(pending)
+
+
+def _natural_key(part_number: str) -> List:
+    return [int(t) if t.isdigit() else t for t in re.split(r'(\d+)', part_number)]
+
+
+def build_atlases(models_dir: Path, models: Dict[str, dict], page_size: int = CATALOG_PAGE_SIZE,
+                  columns: int = ATLAS_COLUMNS) -> Dict[str, dict]:
+    """
+    Pack each family's PNG thumbnails into atlases of page_size sprites.
+    Writes atlases/<family>.json mapping part numbers to {page, x, y, w, h}
+    and returns the maps by family. Thumbnails must already be rendered.
+    """
+    models_dir = Path(models_dir)
+    (models_dir / ATLAS_DIR).mkdir(parents=True, exist_ok=True)
+    (models_dir / ATLAS_INDEX_DIR).mkdir(parents=True, exist_ok=True)
+
+    by_family: Dict[str, List[str]] = {}
+    for part_number, entry in models.items():
+        if not entry.get('thumbnail', '').endswith('.png'):
+            raise ValueError(f"{part_number} has no PNG thumbnail; render thumbnails as PNG first")
+        by_family.setdefault(entry['family'], []).append(part_number)
+
+    maps = {}
+    referenced = set()
+    for family in sorted(by_family):
+        part_numbers = sorted(by_family[family], key=_natural_key)
+        pages = []
+        sprites = {}
+        for page, start in enumerate(range(0, len(part_numbers), page_size)):
+            chunk = part_numbers[start:start + page_size]
+            tiles = [decode_png((models_dir / models[pn]['thumbnail']).read_bytes()) for pn in chunk]
+            tile = tiles[0].shape[0]
+            cols = min(columns, len(chunk))
+            rows = -(-len(chunk) // cols)
+            atlas = np.zeros((rows * tile, cols * tile, 4), dtype=np.uint8)
+            for i, (pn, image) in enumerate(zip(chunk, tiles)):
+                x, y = (i % cols) * tile, (i // cols) * tile
+                atlas[y:y + tile, x:x + tile] = image
+                sprites[pn] = {'page': page, 'x': x, 'y': y, 'w': tile, 'h': tile}
+
+            data = encode_png(atlas)
+            digest = hashlib.sha256(data).hexdigest()
+            filename = f"{ATLAS_DIR}/{family}-{page}.{digest[:HASH_LENGTH]}.png"
+            if not (models_dir / filename).exists():
+                (models_dir / filename).write_bytes(data)
+            referenced.add(Path(filename).name)
+            pages.append({'file': filename, 'width': atlas.shape[1], 'height': atlas.shape[0]})
+
+        atlas_map = {'family': family, 'page_size': page_size, 'pages': pages, 'sprites': sprites}
+        (models_dir / ATLAS_INDEX_DIR / f"{family}.json").write_text(
+            json.dumps(atlas_map, indent=2, sort_keys=True) + '\n')
+        maps[family] = atlas_map
+
+    for stale in (models_dir / ATLAS_DIR).iterdir():
+        if stale.name not in referenced:
+            stale.unlink()
+
+    return maps
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Render thumbnails for generated models.')
+    parser.add_argument('models_dir', nargs='?', default=str(MODELS_DIR))
+    parser.add_argument('--size', type=int, default=DEFAULT_SIZE, help='thumbnail edge in pixels')
+    parser.add_argument('--format', choices=['png', 'webp'], default='png')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--atlases', action='store_true', help='also pack per-category sprite-sheet atlases')
+    parser.add_argument('--page-size', type=int, default=CATALOG_PAGE_SIZE, help='sprites per atlas')
+    parser.add_argument('--turntables', action='store_true', help='also render turntable frame strips')
+    parser.add_argument('--frames', help='per-family frame counts, e.g. bolts=24,nuts=0')
+    parser.add_argument('--turntable-size', type=int, default=TURNTABLE_SIZE, help='turntable frame edge in pixels')
+    args = parser.parse_args(argv)
+
+    models_dir = Path(args.models_dir)
+    manifest = load_manifest(models_dir)
+    if manifest is None:
+        print(f"No manifest in {models_dir}; run build_models.py build first")
+        return 1
+
+    rendered = render_thumbnails(models_dir, manifest['models'], args.size, args.format, args.jobs)
+    write_manifest(models_dir, manifest['models'], manifest.get('profile'), manifest.get('fingerprints'))
+    print(f"Rendered {rendered} thumbnails ({len(manifest['models']) - rendered} cached)")
+
+    if args.atlases:
+        for family, atlas_map in build_atlases(models_dir, manifest['models'], args.page_size).items():
+            print(f"  {family:10s} {len(atlas_map['sprites']):5d} sprites in {len(atlas_map['pages'])} atlases")
+
+    if args.turntables:
+        strips = render_turntables(models_dir, manifest['models'], parse_frames(args.frames),
+                                   args.turntable_size, args.format, args.jobs)
+        write_manifest(models_dir, manifest['models'], manifest.get('profile'), manifest.get('fingerprints'))
+        print(f"Rendered {strips} turntable strips")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,6 +8,7 @@ export interface Product {
   modelFile: string; // Unique GLTF model file for this specific part
   slug: string;
   material: string;
+  massGrams?: number; // Estimated from the generated model by the build
   threadType?: string;
   specification: string;
   description: string;